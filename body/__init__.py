@@ -8,6 +8,8 @@ from .geometry import (
     Vector5D,
     Plane5D,
     origin_5d,
+    flatten_points,
+    unflatten_points,
 )
 from .torso import Torso
 from .hips import Hips
@@ -15,6 +17,9 @@ from .neck import Neck
 from .head import Head
 from .face import Face
 from .limbs import (
+    radial_frame,
+    frame_5d,
+    frames_5d,
     LimbSegment,
     CylindricalLimb,
     Leg,
@@ -23,18 +28,73 @@ from .limbs import (
 from .arms import Arms
 from .hands import Hand, Hands
 from .feet import Foot, Feet
-from .sscha import Sscha, UP, FORWARD, RIGHT
+from .sscha import Sscha, UP, FORWARD, RIGHT, PROPORTIONS
+from .primitives import Box5D, Capsule5D, Patch5D, part_primitive, figure_primitives
+from .bvh import BVH
+from .raycast import RayCaster, RayHit
+from .voxelize import VoxelGrid, voxelize
+from .slicing import BoxSlice, TubeSlice, PatchSlice, CrossSection, SliceEngine
+from .serialize import (
+    pack_sscha,
+    unpack_sscha,
+    sscha_to_json,
+    sscha_from_json,
+    pack_part,
+    unpack_part,
+    part_to_dict,
+    part_from_dict,
+    pack_population,
+    unpack_population,
+)
+from .instancing import CanonicalMesh, InstancedPopulation, canonical_mesh, clear_canonical_cache
+from .weld import weld_array, weld_points
+from .uncertainty import (
+    Fixed,
+    Normal,
+    Uniform,
+    FigureDistribution,
+    PropagationResult,
+    propagate,
+    iter_vertex_chunks,
+)
+from .part_arrays import TubeArray, BoxArray
+from .chain import LimbChain
+from .curves import BezierCurve5D, CatmullRomCurve5D
+from .morph import Morph
+from .distance import (
+    primitive_distance,
+    distance_matrix,
+    nearest_vertices,
+    vertex_distance_matrix,
+    clearance,
+)
+from .framestream import FrameEncoder, FrameDecoder
+from .quantize import QuantizedBuffer, quantize, quantize_figure
+from .snapshot import PartSnapshot, SschaSnapshot, snapshot, generate, iter_generate
+from .footprint import Footprint, memory_footprint, check_footprint
+from .allocations import AllocationCounter, count_allocations
+from .ik import reach, solve_reach
+from .collision import self_collisions, collision_mask
+from .occupancy import OccupancyGrid
+from .morton import morton_order, morton_sort
+from .geometry_cache import GeometryCache
+from .streamstats import RunningStats, Histogram, PopulationStats, population_stats
 
 __all__ = [
     "Point5D",
     "Vector5D",
     "Plane5D",
     "origin_5d",
+    "flatten_points",
+    "unflatten_points",
     "Torso",
     "Hips",
     "Neck",
     "Head",
     "Face",
+    "radial_frame",
+    "frame_5d",
+    "frames_5d",
     "LimbSegment",
     "CylindricalLimb",
     "Leg",
@@ -48,4 +108,81 @@ __all__ = [
     "UP",
     "FORWARD",
     "RIGHT",
+    "PROPORTIONS",
+    "Box5D",
+    "Capsule5D",
+    "Patch5D",
+    "part_primitive",
+    "figure_primitives",
+    "BVH",
+    "RayCaster",
+    "RayHit",
+    "VoxelGrid",
+    "voxelize",
+    "BoxSlice",
+    "TubeSlice",
+    "PatchSlice",
+    "CrossSection",
+    "SliceEngine",
+    "pack_sscha",
+    "unpack_sscha",
+    "sscha_to_json",
+    "sscha_from_json",
+    "pack_part",
+    "unpack_part",
+    "part_to_dict",
+    "part_from_dict",
+    "pack_population",
+    "unpack_population",
+    "CanonicalMesh",
+    "InstancedPopulation",
+    "canonical_mesh",
+    "clear_canonical_cache",
+    "weld_array",
+    "weld_points",
+    "Fixed",
+    "Normal",
+    "Uniform",
+    "FigureDistribution",
+    "PropagationResult",
+    "propagate",
+    "iter_vertex_chunks",
+    "TubeArray",
+    "BoxArray",
+    "LimbChain",
+    "BezierCurve5D",
+    "CatmullRomCurve5D",
+    "Morph",
+    "primitive_distance",
+    "distance_matrix",
+    "nearest_vertices",
+    "vertex_distance_matrix",
+    "clearance",
+    "FrameEncoder",
+    "FrameDecoder",
+    "QuantizedBuffer",
+    "quantize",
+    "quantize_figure",
+    "PartSnapshot",
+    "SschaSnapshot",
+    "snapshot",
+    "generate",
+    "iter_generate",
+    "Footprint",
+    "memory_footprint",
+    "check_footprint",
+    "AllocationCounter",
+    "count_allocations",
+    "reach",
+    "solve_reach",
+    "self_collisions",
+    "collision_mask",
+    "OccupancyGrid",
+    "morton_order",
+    "morton_sort",
+    "GeometryCache",
+    "RunningStats",
+    "Histogram",
+    "PopulationStats",
+    "population_stats",
 ]
@@ -0,0 +1,88 @@
+"""
+Allocations: count object constructions inside a block of code.
+Used by the allocation-budget tests to catch extra temporary Point5D/Vector5D
+objects in hot paths. Counting wraps `__init__` of the watched classes for the
+duration of the block, so it is meant for tests and profiling, not for code
+running concurrently in other threads.
+"""
+
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Sequence, Tuple
+
+from .geometry import Point5D, Vector5D, Plane5D
+
+WATCHED: Tuple[type, ...] = (Point5D, Vector5D, Plane5D)
+
+
+@dataclass
+class AllocationCount:
+    """Constructions per class name, plus peak traced bytes of the block."""
+
+    counts: Dict[str, int] = field(default_factory=dict)
+    peak_bytes: int = 0
+
+    def __getitem__(self, name: str) -> int:
+        return self.counts.get(name, 0)
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+
+class AllocationCounter:
+    """
+    Context manager counting constructions of `types` (default WATCHED) and the
+    tracemalloc peak while active:
+
+        with AllocationCounter() as c:
+            limb.vertices_5d()
+        c.result["Vector5D"]
+    """
+
+    def __init__(self, types: Sequence[type] = WATCHED):
+        self.types = tuple(types)
+        self.result = AllocationCount({t.__name__: 0 for t in self.types})
+        self._saved: Dict[type, Callable] = {}
+        self._was_tracing = False
+
+    def _wrap(self, cls: type) -> None:
+        original = cls.__dict__["__init__"]
+        counts = self.result.counts
+        name = cls.__name__
+
+        def __init__(obj, *args, **kwargs):
+            if type(obj) is cls:
+                counts[name] += 1
+            original(obj, *args, **kwargs)
+
+        self._saved[cls] = original
+        cls.__init__ = __init__
+
+    def __enter__(self) -> "AllocationCounter":
+        for cls in self.types:
+            self._wrap(cls)
+        self._was_tracing = tracemalloc.is_tracing()
+        if not self._was_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        self._base, _ = tracemalloc.get_traced_memory()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        _, peak = tracemalloc.get_traced_memory()
+        self.result.peak_bytes = max(0, peak - self._base)
+        if not self._was_tracing:
+            tracemalloc.stop()
+        for cls, original in self._saved.items():
+            cls.__init__ = original
+        self._saved.clear()
+
+
+def count_allocations(
+    fn: Callable[[], object], types: Sequence[type] = WATCHED
+) -> AllocationCount:
+    """Constructions and peak bytes of one fn() call."""
+    with AllocationCounter(types) as counter:
+        fn()
+    return counter.result
@@ -6,6 +6,7 @@ from typing import List, Tuple
 
 from .geometry import Point5D, Vector5D
 from .limbs import CylindricalLimb
+from .footprint import Footprint, memory_footprint
 
 
 class Arms:
@@ -40,3 +41,7 @@ class Arms:
 
     def segments(self) -> Tuple[CylindricalLimb, CylindricalLimb]:
         return (self.left, self.right)
+
+    def memory_footprint(self) -> Footprint:
+        """Object overhead and vertex payload in bytes (see body.footprint)."""
+        return memory_footprint(self)
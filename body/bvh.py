@@ -0,0 +1,172 @@
+"""
+BVH: bounding volume hierarchy over 5D axis-aligned bounds.
+Used as the spatial acceleration structure for ray and overlap queries on
+large scenes of Sscha primitives.
+"""
+
+import math
+from typing import Callable, List, Optional, Sequence, Tuple
+
+Tuple5 = Tuple[float, float, float, float, float]
+Bounds = Tuple[Tuple5, Tuple5]
+
+
+class BVH:
+    """
+    Binary BVH built by median split along the widest centroid axis.
+    Nodes are stored in flat parallel lists; leaves reference a contiguous
+    range of `order` (item indices into the bounds passed at build time).
+    """
+
+    def __init__(self, bounds: Sequence[Bounds], leaf_size: int = 4):
+        self.leaf_size = max(1, leaf_size)
+        self.order: List[int] = list(range(len(bounds)))
+        self._bounds = list(bounds)
+        self._lo: List[Tuple5] = []
+        self._hi: List[Tuple5] = []
+        self._left: List[int] = []
+        self._right: List[int] = []
+        self._start: List[int] = []
+        self._count: List[int] = []
+        if self._bounds:
+            self._build()
+
+    def __len__(self) -> int:
+        return len(self._bounds)
+
+    def _new_node(self, start: int, count: int) -> int:
+        lo = [math.inf] * 5
+        hi = [-math.inf] * 5
+        for k in self.order[start : start + count]:
+            blo, bhi = self._bounds[k]
+            for i in range(5):
+                if blo[i] < lo[i]:
+                    lo[i] = blo[i]
+                if bhi[i] > hi[i]:
+                    hi[i] = bhi[i]
+        self._lo.append(tuple(lo))
+        self._hi.append(tuple(hi))
+        self._left.append(-1)
+        self._right.append(-1)
+        self._start.append(start)
+        self._count.append(count)
+        return len(self._lo) - 1
+
+    def _build(self) -> None:
+        centers = [
+            tuple(0.5 * (lo[i] + hi[i]) for i in range(5)) for lo, hi in self._bounds
+        ]
+        stack = [self._new_node(0, len(self.order))]
+        while stack:
+            node = stack.pop()
+            start, count = self._start[node], self._count[node]
+            if count <= self.leaf_size:
+                continue
+            items = self.order[start : start + count]
+            spans = [
+                max(centers[k][i] for k in items) - min(centers[k][i] for k in items)
+                for i in range(5)
+            ]
+            axis = spans.index(max(spans))
+            items.sort(key=lambda k: centers[k][axis])
+            self.order[start : start + count] = items
+            half = count // 2
+            left = self._new_node(start, half)
+            right = self._new_node(start + half, count - half)
+            self._left[node] = left
+            self._right[node] = right
+            self._count[node] = 0
+            stack.append(left)
+            stack.append(right)
+
+    def _ray_enter(
+        self, node: int, origin: Sequence[float], inv: Sequence[float], t_max: float
+    ) -> float:
+        """Entry parameter of the ray into the node bounds, or inf on a miss."""
+        lo, hi = self._lo[node], self._hi[node]
+        t0, t1 = 0.0, t_max
+        for i in range(5):
+            o = origin[i]
+            if inv[i] is None:
+                if o < lo[i] or o > hi[i]:
+                    return math.inf
+                continue
+            ta = (lo[i] - o) * inv[i]
+            tb = (hi[i] - o) * inv[i]
+            if ta > tb:
+                ta, tb = tb, ta
+            if ta > t0:
+                t0 = ta
+            if tb < t1:
+                t1 = tb
+            if t0 > t1:
+                return math.inf
+        return t0
+
+    def nearest_ray_hit(
+        self,
+        origin: Sequence[float],
+        direction: Sequence[float],
+        test: Callable[[int], Optional[Tuple[float, object]]],
+        t_max: float = math.inf,
+    ) -> Optional[Tuple[float, object]]:
+        """
+        Closest (t, payload) over all items whose bounds the ray reaches, where
+        `test(item)` returns the exact hit for one item or None. Children are
+        visited near-first and pruned against the best hit so far.
+        """
+        if not self._lo:
+            return None
+        inv = [None if abs(d) < 1e-12 else 1.0 / d for d in direction]
+        best: Optional[Tuple[float, object]] = None
+        best_t = t_max
+        stack = [(self._ray_enter(0, origin, inv, best_t), 0)]
+        while stack:
+            t_enter, node = stack.pop()
+            if t_enter > best_t:
+                continue
+            left = self._left[node]
+            if left < 0:
+                start = self._start[node]
+                for k in self.order[start : start + self._count[node]]:
+                    hit = test(k)
+                    if hit is not None and hit[0] <= best_t:
+                        best, best_t = hit, hit[0]
+                continue
+            right = self._right[node]
+            tl = self._ray_enter(left, origin, inv, best_t)
+            tr = self._ray_enter(right, origin, inv, best_t)
+            if tl <= tr:
+                if tr <= best_t:
+                    stack.append((tr, right))
+                if tl <= best_t:
+                    stack.append((tl, left))
+            else:
+                if tl <= best_t:
+                    stack.append((tl, left))
+                if tr <= best_t:
+                    stack.append((tr, right))
+        return best
+
+    def query_box(self, lower: Sequence[float], upper: Sequence[float]) -> List[int]:
+        """Item indices whose bounds overlap the box [lower, upper]."""
+        out: List[int] = []
+        if not self._lo:
+            return out
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            lo, hi = self._lo[node], self._hi[node]
+            if any(lo[i] > upper[i] or hi[i] < lower[i] for i in range(5)):
+                continue
+            left = self._left[node]
+            if left < 0:
+                start = self._start[node]
+                for k in self.order[start : start + self._count[node]]:
+                    blo, bhi = self._bounds[k]
+                    if all(blo[i] <= upper[i] and bhi[i] >= lower[i] for i in range(5)):
+                        out.append(k)
+                continue
+            stack.append(self._right[node])
+            stack.append(left)
+        return out
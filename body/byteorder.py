@@ -0,0 +1,27 @@
+"""
+Byte order: little-endian array I/O for the binary formats (frame streams,
+cached geometry, streamed statistics). Arrays are swapped only on big-endian
+hosts, so the common case is a plain tobytes / frombytes.
+"""
+
+import sys
+from array import array
+
+SWAP = sys.byteorder == "big"
+
+
+def to_le(values: array) -> bytes:
+    """Little-endian bytes of an array (the array itself is left untouched)."""
+    if SWAP:
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def from_le(typecode: str, data) -> array:
+    """New array of `typecode` from little-endian bytes."""
+    values = array(typecode)
+    values.frombytes(data)
+    if SWAP:
+        values.byteswap()
+    return values
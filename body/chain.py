@@ -0,0 +1,220 @@
+"""
+Chain: segmented tube along a 5D polyline (spines, tails).
+Ring frames are parallel-transported from node to node with the double
+reflection method, so consecutive rings do not twist, and each node owns a
+single ring shared by the segments on either side of it.
+"""
+
+import math
+from array import array
+from typing import List, Optional, Sequence, Tuple
+
+from .geometry import Point5D, unflatten_points
+from .limbs import LimbSegment, radial_frame
+from .primitives import Capsule5D
+from .quantize import QuantizedBuffer, with_precision
+
+Frame = Tuple[Tuple[float, float, float], Tuple[float, float, float], Tuple[float, float, float]]
+
+
+def _unit(x: float, y: float, z: float) -> Optional[Tuple[float, float, float]]:
+    n = math.sqrt(x * x + y * y + z * z)
+    if n < 1e-10:
+        return None
+    return x / n, y / n, z / n
+
+
+def _cross(a: Sequence[float], b: Sequence[float]) -> Tuple[float, float, float]:
+    return (
+        a[1] * b[2] - a[2] * b[1],
+        a[2] * b[0] - a[0] * b[2],
+        a[0] * b[1] - a[1] * b[0],
+    )
+
+
+def transport_frames(nodes: Sequence[float], tangents: Sequence[Tuple[float, float, float]]) -> List[Frame]:
+    """
+    Rotation-minimizing (tangent, u, v) frames along a flat 5-per-node buffer with
+    unit x/y/z tangents per node, seeded from radial_frame at the first node.
+    """
+    p = nodes
+    t = tangents[0]
+    u, _ = radial_frame(*t)
+    frames: List[Frame] = [(t, u, _cross(t, u))]
+    for i in range(1, len(tangents)):
+        j = 5 * i
+        v1 = (p[j] - p[j - 5], p[j + 1] - p[j - 4], p[j + 2] - p[j - 3])
+        c1 = v1[0] * v1[0] + v1[1] * v1[1] + v1[2] * v1[2]
+        t_next = tangents[i]
+        if c1 < 1e-20:
+            frames.append((t_next, u, _cross(t_next, u)))
+            t = t_next
+            continue
+        # Reflect the frame across the bisector plane of the segment ...
+        k = 2.0 / c1
+        du = k * (v1[0] * u[0] + v1[1] * u[1] + v1[2] * u[2])
+        dt = k * (v1[0] * t[0] + v1[1] * t[1] + v1[2] * t[2])
+        r_l = (u[0] - du * v1[0], u[1] - du * v1[1], u[2] - du * v1[2])
+        t_l = (t[0] - dt * v1[0], t[1] - dt * v1[1], t[2] - dt * v1[2])
+        # ... then across the plane that maps the reflected tangent onto the next one.
+        v2 = (t_next[0] - t_l[0], t_next[1] - t_l[1], t_next[2] - t_l[2])
+        c2 = v2[0] * v2[0] + v2[1] * v2[1] + v2[2] * v2[2]
+        if c2 > 1e-20:
+            k = 2.0 / c2 * (v2[0] * r_l[0] + v2[1] * r_l[1] + v2[2] * r_l[2])
+            r_l = (r_l[0] - k * v2[0], r_l[1] - k * v2[1], r_l[2] - k * v2[2])
+        # Re-orthogonalize against the new tangent to stop drift over long chains.
+        d = r_l[0] * t_next[0] + r_l[1] * t_next[1] + r_l[2] * t_next[2]
+        u = _unit(r_l[0] - d * t_next[0], r_l[1] - d * t_next[1], r_l[2] - d * t_next[2]) or u
+        t = t_next
+        frames.append((t, u, _cross(t, u)))
+    return frames
+
+
+class LimbChain(LimbSegment):
+    """
+    Tube through nodes p_0 … p_{N-1} with per-node radius. Like CylindricalLimb,
+    rings lie in the x/y/z subspace and keep the node's w/v. Vertex layout: the N
+    nodes, then num_radial ring vertices per node (node-major), so segment i is
+    bounded by rings i and i + 1. Degenerate nodes (no x/y/z motion) reuse the
+    neighbouring tangent and frame.
+    """
+
+    def __init__(
+        self,
+        nodes: Sequence[Point5D],
+        radii: float | Sequence[float] = 0.1,
+        num_radial: int = 6,
+    ):
+        if len(nodes) < 2:
+            raise ValueError("a chain needs at least two nodes")
+        super().__init__(nodes[0], nodes[-1])
+        self.nodes = array("d")
+        for p in nodes:
+            self.nodes.extend(p)
+        if isinstance(radii, (int, float)):
+            self.radii = array("d", [float(radii)]) * len(nodes)
+        else:
+            if len(radii) != len(nodes):
+                raise ValueError("need one radius per node")
+            self.radii = array("d", radii)
+        self.num_radial = max(2, num_radial)
+        self._frames: Optional[List[Frame]] = None
+
+    @classmethod
+    def from_frames(
+        cls,
+        nodes: Sequence[Point5D],
+        frames: Sequence[Frame],
+        radii: float | Sequence[float] = 0.1,
+        num_radial: int = 6,
+    ) -> "LimbChain":
+        """Chain with precomputed (tangent, u, v) node frames, e.g. from a cached curve."""
+        if len(frames) != len(nodes):
+            raise ValueError("need one frame per node")
+        chain = cls(nodes, radii, num_radial)
+        chain._frames = list(frames)
+        return chain
+
+    def __len__(self) -> int:
+        return len(self.radii)
+
+    def node(self, i: int) -> Point5D:
+        return Point5D(*self.nodes[5 * i : 5 * i + 5])
+
+    def set_node(self, i: int, point: Point5D) -> None:
+        self.nodes[5 * i : 5 * i + 5] = array("d", point)
+        if i == 0:
+            self.origin = point
+        if i == len(self) - 1:
+            self.end = point
+        self._frames = None
+
+    def length(self) -> float:
+        """Arc length along the polyline."""
+        p = self.nodes
+        return sum(
+            math.sqrt(sum((p[j + 5 + a] - p[j + a]) ** 2 for a in range(5)))
+            for j in range(0, len(p) - 5, 5)
+        )
+
+    def _tangents(self) -> List[Tuple[float, float, float]]:
+        p, n = self.nodes, len(self)
+        tangents: List[Optional[Tuple[float, float, float]]] = []
+        for i in range(n):
+            a = 5 * max(i - 1, 0)
+            b = 5 * min(i + 1, n - 1)
+            tangents.append(_unit(p[b] - p[a], p[b + 1] - p[a + 1], p[b + 2] - p[a + 2]))
+        last = next((t for t in tangents if t is not None), (0.0, 0.0, 1.0))
+        out = []
+        for t in tangents:
+            if t is not None:
+                last = t
+            out.append(last)
+        return out
+
+    def frames(self) -> List[Frame]:
+        """(tangent, u, v) per node; u and v span the ring plane. Cached until a node moves."""
+        if self._frames is None:
+            self._frames = transport_frames(self.nodes, self._tangents())
+        return self._frames
+
+    @property
+    def vertex_count(self) -> int:
+        return len(self) * (1 + self.num_radial)
+
+    def ring_start(self, i: int) -> int:
+        """Vertex index of the first ring vertex of node i."""
+        return len(self) + i * self.num_radial
+
+    def vertex_array(self, precision: str = "float64") -> array | QuantizedBuffer:
+        """
+        Flat buffer: nodes, then node rings (x-fastest). An array('d') for
+        float64, otherwise a QuantizedBuffer (int16: the chain's bounding box).
+        """
+        n, m = len(self), self.num_radial
+        out = array("d", bytes(8 * 5 * self.vertex_count))
+        out[: 5 * n] = self.nodes
+        frames = self.frames()
+        cols = [self.nodes[a::5] for a in range(5)]
+        stride = 5 * m
+        for j in range(m):
+            angle = 2 * math.pi * j / m
+            cs, sn = math.cos(angle), math.sin(angle)
+            slot = 5 * n + 5 * j
+            for a in range(3):
+                out[slot + a :: stride] = array(
+                    "d",
+                    [
+                        c + r * cs * f[1][a] + r * sn * f[2][a]
+                        for c, r, f in zip(cols[a], self.radii, frames)
+                    ],
+                )
+            for a in (3, 4):
+                out[slot + a :: stride] = cols[a]
+        return with_precision(out, precision)
+
+    def vertices_5d(self) -> List[Point5D]:
+        return unflatten_points(self.vertex_array())
+
+    def quads(self) -> List[Tuple[int, int, int, int]]:
+        """Side faces as vertex-index quads; neighbouring segments share their ring."""
+        m = self.num_radial
+        out = []
+        for i in range(len(self) - 1):
+            a, b = self.ring_start(i), self.ring_start(i + 1)
+            for j in range(m):
+                k = (j + 1) % m
+                out.append((a + j, a + k, b + k, b + j))
+        return out
+
+    def primitives(self) -> List[Capsule5D]:
+        """One capsule per segment, using the larger of its two node radii."""
+        p, r = self.nodes, self.radii
+        return [
+            Capsule5D(
+                tuple(p[5 * i : 5 * i + 5]),
+                tuple(p[5 * i + 5 : 5 * i + 10]),
+                max(r[i], r[i + 1]),
+            )
+            for i in range(len(self) - 1)
+        ]
@@ -0,0 +1,162 @@
+"""
+Collision: exact self-intersection checks between the parts of a Sscha.
+Every pair of leaf parts is tested with the exact box–box, capsule–capsule
+and box–capsule distances from body.distance. Parts attached by construction
+(arm and torso, leg and hips, hand and arm, ...) always touch at the joint:
+for those, only the part of the limb beyond a joint zone (a fraction of its
+length next to the joint) is tested, so an arm swung through the torso is
+still caught; attached box pairs and the face patch, which lies on the head,
+are skipped. A bounding-box gap test rejects most pairs before the exact
+distance is run.
+"""
+
+from array import array
+from typing import FrozenSet, Iterable, Iterator, List, Sequence, Tuple
+
+from .distance import primitive_distance
+from .primitives import Box5D, Capsule5D, Primitive, Patch5D, figure_primitives
+
+# Leaf part pairs that are attached (or nearly so) in every pose.
+ADJACENT: FrozenSet[FrozenSet[str]] = frozenset(
+    frozenset(pair)
+    for pair in (
+        ("torso", "hips"),
+        ("torso", "neck"),
+        ("neck", "head"),
+        ("torso", "arms.left"),
+        ("torso", "arms.right"),
+        ("arms.left", "hands.left"),
+        ("arms.right", "hands.right"),
+        ("hips", "legs.left"),
+        ("hips", "legs.right"),
+        ("legs.left", "feet.left"),
+        ("legs.right", "feet.right"),
+    )
+)
+
+# Fraction of an attached limb, measured from its joint, exempt from testing.
+JOINT_ZONE = 0.5
+
+Collision = Tuple[str, str, float]
+
+
+def collision_pairs(
+    names: Sequence[str], attached: Iterable[FrozenSet[str]] = ADJACENT
+) -> List[Tuple[int, int, bool]]:
+    """Index pairs (i, j, attached) with i < j over `names`."""
+    attached = set(attached)
+    return [
+        (i, j, frozenset((names[i], names[j])) in attached)
+        for i in range(len(names))
+        for j in range(i + 1, len(names))
+    ]
+
+
+def _sq(p: Sequence[float], q: Sequence[float]) -> float:
+    return sum((p[i] - q[i]) ** 2 for i in range(5))
+
+
+def _box_point_sq(box: Box5D, p: Sequence[float]) -> float:
+    d2 = 0.0
+    for i in range(5):
+        gap = max(box.lower[i] - p[i], p[i] - box.upper[i])
+        if gap > 0.0:
+            d2 += gap * gap
+    return d2
+
+
+def _beyond_joint(limb: Capsule5D, parent: Primitive, zone: float) -> Capsule5D:
+    """The limb minus the `zone` fraction next to the end closest to `parent`."""
+    if isinstance(parent, Capsule5D):
+        near_a = min(_sq(limb.a, parent.a), _sq(limb.a, parent.b)) <= min(
+            _sq(limb.b, parent.a), _sq(limb.b, parent.b)
+        )
+    else:
+        near_a = _box_point_sq(parent, limb.a) <= _box_point_sq(parent, limb.b)
+    if near_a:
+        return Capsule5D(limb.axis_point(zone), limb.b, limb.radius)
+    return Capsule5D(limb.a, limb.axis_point(1.0 - zone), limb.radius)
+
+
+def _gap_sq(a_bounds, b_bounds) -> float:
+    (alo, ahi), (blo, bhi) = a_bounds, b_bounds
+    d2 = 0.0
+    for i in range(5):
+        gap = max(blo[i] - ahi[i], alo[i] - bhi[i])
+        if gap > 0.0:
+            d2 += gap * gap
+    return d2
+
+
+def _check(
+    prims: List[Tuple[str, Primitive]],
+    pairs: Sequence[Tuple[int, int, bool]],
+    margin: float,
+    zone: float | None,
+    first: bool = False,
+) -> List[Collision]:
+    out: List[Collision] = []
+    limit = margin * margin
+    bounds = [p.bounds() for _, p in prims]
+    for i, j, attached in pairs:
+        (na, a), (nb, b) = prims[i], prims[j]
+        if isinstance(a, Patch5D) or isinstance(b, Patch5D):
+            continue
+        ba, bb = bounds[i], bounds[j]
+        if attached:
+            if zone is None or not (isinstance(a, Capsule5D) or isinstance(b, Capsule5D)):
+                continue
+            if isinstance(a, Capsule5D):
+                a = _beyond_joint(a, b, zone)
+                ba = a.bounds()
+            else:
+                b = _beyond_joint(b, a, zone)
+                bb = b.bounds()
+        if _gap_sq(ba, bb) > limit:
+            continue
+        d = primitive_distance(a, b)
+        if d <= margin:
+            out.append((na, nb, d))
+            if first:
+                break
+    return out
+
+
+def self_collisions(
+    figure, margin: float = 0.0, joint_zone: float | None = JOINT_ZONE
+) -> List[Collision]:
+    """
+    (part, part, distance) for every pair of leaf parts closer than `margin`
+    (0: touching or overlapping), in `Sscha.leaf_parts` order. Attached limbs
+    are tested beyond `joint_zone`; None skips attached pairs entirely.
+    """
+    prims = figure_primitives(figure)
+    return _check(prims, collision_pairs([name for name, _ in prims]), margin, joint_zone)
+
+
+def iter_self_collisions(
+    figures: Sequence, margin: float = 0.0, joint_zone: float | None = JOINT_ZONE
+) -> Iterator[Tuple[int, str, str, float]]:
+    """(figure index, part, part, distance) over a batch of figures."""
+    pairs = None
+    for k, fig in enumerate(figures):
+        prims = figure_primitives(fig)
+        if pairs is None:
+            pairs = collision_pairs([name for name, _ in prims])
+        for na, nb, d in _check(prims, pairs, margin, joint_zone):
+            yield k, na, nb, d
+
+
+def collision_mask(
+    figures: Sequence, margin: float = 0.0, joint_zone: float | None = JOINT_ZONE
+) -> array:
+    """array('B') with 1 for every figure that has a self-collision."""
+    out = array("B", bytes(len(figures)))
+    pairs = None
+    for k, fig in enumerate(figures):
+        prims = figure_primitives(fig)
+        if pairs is None:
+            pairs = collision_pairs([name for name, _ in prims])
+        if _check(prims, pairs, margin, joint_zone, first=True):
+            out[k] = 1
+    return out
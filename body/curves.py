@@ -0,0 +1,231 @@
+"""
+Curves: 5D Bézier and Catmull-Rom splines swept into tubes.
+Each curve is evaluated once on a dense parameter table (positions, unit
+tangents, transported ring frames, cumulative turning angle and arc length).
+Tessellating at any level of detail only selects rows of that table, so a
+new LOD never re-evaluates the spline.
+"""
+
+import bisect
+import math
+from abc import ABC, abstractmethod
+from array import array
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from .geometry import Point5D
+from .chain import Frame, LimbChain, transport_frames
+
+Radius = float | Tuple[float, float] | Callable[[float], float]
+
+
+@dataclass(frozen=True)
+class CurveTable:
+    """Dense evaluation of a curve at `len(params)` parameters in [0, 1]."""
+
+    params: array
+    points: array  # flat, 5 per sample
+    tangents: array  # flat 5D unit tangents, 5 per sample
+    frames: List[Frame]
+    turning: array  # cumulative 5D turning angle (radians)
+    arc: array  # cumulative arc length (chord sum)
+
+    def __len__(self) -> int:
+        return len(self.params)
+
+    def point(self, i: int) -> Point5D:
+        return Point5D(*self.points[5 * i : 5 * i + 5])
+
+
+class Curve5D(ABC):
+    """
+    Base class: subclasses provide `_evaluate(params)` returning flat position and
+    derivative buffers for a batch of parameters.
+    """
+
+    samples: int = 256
+
+    def __init__(self):
+        self._tables: Dict[int, CurveTable] = {}
+
+    @abstractmethod
+    def _evaluate(self, params: Sequence[float]) -> Tuple[array, array]:
+        """Flat positions and derivatives, 5 per parameter."""
+        ...
+
+    def point(self, s: float) -> Point5D:
+        pos, _ = self._evaluate([s])
+        return Point5D(*pos)
+
+    def table(self, samples: int | None = None) -> CurveTable:
+        """Dense evaluation table (cached per sample count)."""
+        n = max(2, samples or self.samples)
+        cached = self._tables.get(n)
+        if cached is not None:
+            return cached
+        params = array("d", [i / (n - 1) for i in range(n)])
+        pos, der = self._evaluate(params)
+        tangents = array("d", bytes(8 * 5 * n))
+        xyz: List[Tuple[float, float, float] | None] = []
+        last5 = (0.0, 0.0, 1.0, 0.0, 0.0)
+        for i in range(n):
+            d = der[5 * i : 5 * i + 5]
+            m = math.sqrt(sum(c * c for c in d))
+            if m > 1e-12:
+                last5 = tuple(c / m for c in d)
+            tangents[5 * i : 5 * i + 5] = array("d", last5)
+            m3 = math.sqrt(d[0] * d[0] + d[1] * d[1] + d[2] * d[2])
+            xyz.append((d[0] / m3, d[1] / m3, d[2] / m3) if m3 > 1e-12 else None)
+        # Samples with no x/y/z motion borrow the nearest earlier (or first valid) tangent.
+        fill = next((t for t in xyz if t is not None), (0.0, 0.0, 1.0))
+        for i, t in enumerate(xyz):
+            if t is None:
+                xyz[i] = fill
+            else:
+                fill = t
+        turning = array("d", [0.0]) * n
+        arc = array("d", [0.0]) * n
+        for i in range(1, n):
+            a, b = 5 * (i - 1), 5 * i
+            dot = sum(tangents[a + k] * tangents[b + k] for k in range(5))
+            turning[i] = turning[i - 1] + math.acos(max(-1.0, min(1.0, dot)))
+            arc[i] = arc[i - 1] + math.sqrt(sum((pos[b + k] - pos[a + k]) ** 2 for k in range(5)))
+        table = CurveTable(params, pos, tangents, transport_frames(pos, xyz), turning, arc)
+        self._tables[n] = table
+        return table
+
+    def length(self) -> float:
+        return self.table().arc[-1]
+
+    def sample(
+        self,
+        max_angle: float = math.radians(10.0),
+        max_length: float | None = None,
+        samples: int | None = None,
+    ) -> List[int]:
+        """
+        Table rows for an adaptive tessellation: a new row is emitted whenever the
+        tangent has turned by `max_angle` or `max_length` of arc has passed since
+        the previous one, so curved stretches get denser sampling. Rows 0 and -1
+        are always included.
+        """
+        if max_angle <= 0 and not max_length:
+            raise ValueError("need a positive max_angle or max_length")
+        table = self.table(samples)
+        n = len(table)
+        turning, arc = table.turning, table.arc
+        rows = [0]
+        while rows[-1] < n - 1:
+            i = rows[-1]
+            nxt = n - 1
+            if max_angle > 0:
+                nxt = min(nxt, bisect.bisect_left(turning, turning[i] + max_angle, i + 1))
+            if max_length:
+                nxt = min(nxt, bisect.bisect_left(arc, arc[i] + max_length, i + 1))
+            rows.append(max(nxt, i + 1))
+        return rows
+
+    def sweep(
+        self,
+        radius: Radius = 0.1,
+        num_radial: int = 6,
+        max_angle: float = math.radians(10.0),
+        max_length: float | None = None,
+        samples: int | None = None,
+    ) -> LimbChain:
+        """
+        Tube along the curve. `radius` is a constant, a (start, end) linear taper or
+        a function of the curve parameter. Rings are built in one batched pass by
+        LimbChain using the cached frames.
+        """
+        table = self.table(samples)
+        rows = self.sample(max_angle, max_length, samples)
+        params = [table.params[i] for i in rows]
+        if callable(radius):
+            radii = [radius(s) for s in params]
+        elif isinstance(radius, tuple):
+            r0, r1 = radius
+            radii = [r0 + (r1 - r0) * s for s in params]
+        else:
+            radii = float(radius)
+        return LimbChain.from_frames(
+            [table.point(i) for i in rows], [table.frames[i] for i in rows], radii, num_radial
+        )
+
+
+def _control_array(points: Sequence[Point5D], minimum: int) -> array:
+    if len(points) < minimum:
+        raise ValueError(f"need at least {minimum} control points")
+    flat = array("d")
+    for p in points:
+        flat.extend(p)
+    return flat
+
+
+class BezierCurve5D(Curve5D):
+    """Bézier curve of degree len(controls) - 1 through 5D control points."""
+
+    def __init__(self, controls: Sequence[Point5D], samples: int = 256):
+        super().__init__()
+        self.controls = _control_array(controls, 2)
+        self.samples = samples
+
+    @property
+    def degree(self) -> int:
+        return len(self.controls) // 5 - 1
+
+    def _evaluate(self, params: Sequence[float]) -> Tuple[array, array]:
+        d = self.degree
+        c = self.controls
+        binom = [math.comb(d, k) for k in range(d + 1)]
+        binom_d = [math.comb(d - 1, k) for k in range(d)]
+        m = len(params)
+        pos = array("d", bytes(8 * 5 * m))
+        der = array("d", bytes(8 * 5 * m))
+        for i, s in enumerate(params):
+            t = 1.0 - s
+            w = [binom[k] * s**k * t ** (d - k) for k in range(d + 1)]
+            # Hodograph: degree d - 1 curve through d * (c[k+1] - c[k]).
+            wd = [d * binom_d[k] * s**k * t ** (d - 1 - k) for k in range(d)]
+            for a in range(5):
+                col = c[a::5]
+                pos[5 * i + a] = sum(wk * ck for wk, ck in zip(w, col))
+                der[5 * i + a] = sum(wk * (col[k + 1] - col[k]) for k, wk in enumerate(wd))
+        return pos, der
+
+
+class CatmullRomCurve5D(Curve5D):
+    """
+    Uniform Catmull-Rom spline through 5D points (end tangents are one-sided).
+    The parameter range [0, 1] is split evenly between the len(points) - 1 spans.
+    """
+
+    def __init__(self, points: Sequence[Point5D], samples_per_span: int = 32):
+        super().__init__()
+        self.knots = _control_array(points, 2)
+        self.samples = samples_per_span * (len(points) - 1) + 1
+
+    def _evaluate(self, params: Sequence[float]) -> Tuple[array, array]:
+        p = self.knots
+        n = len(p) // 5
+        spans = n - 1
+        m = len(params)
+        pos = array("d", bytes(8 * 5 * m))
+        der = array("d", bytes(8 * 5 * m))
+        for i, s in enumerate(params):
+            x = min(max(s, 0.0), 1.0) * spans
+            k = min(int(x), spans - 1)
+            u = x - k
+            u2, u3 = u * u, u * u * u
+            h00, h10, h01, h11 = 2 * u3 - 3 * u2 + 1, u3 - 2 * u2 + u, -2 * u3 + 3 * u2, u3 - u2
+            g00, g10, g01, g11 = 6 * u2 - 6 * u, 3 * u2 - 4 * u + 1, -6 * u2 + 6 * u, 3 * u2 - 2 * u
+            a0, a1 = 5 * k, 5 * (k + 1)
+            am, a2 = 5 * max(k - 1, 0), 5 * min(k + 2, n - 1)
+            # Tangents per unit span; the factor `spans` converts to d/ds.
+            for a in range(5):
+                p0, p1 = p[a0 + a], p[a1 + a]
+                m0 = 0.5 * (p1 - p[am + a]) if k > 0 else p1 - p0
+                m1 = 0.5 * (p[a2 + a] - p0) if k + 2 < n else p1 - p0
+                pos[5 * i + a] = h00 * p0 + h10 * m0 + h01 * p1 + h11 * m1
+                der[5 * i + a] = spans * (g00 * p0 + g10 * m0 + g01 * p1 + g11 * m1)
+        return pos, der
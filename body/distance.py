@@ -0,0 +1,266 @@
+"""
+Distance: clearance between parts and figures.
+Exact separation distances between primitives (box–box, capsule–capsule,
+box–capsule; 0 when they overlap) and blocked nearest-vertex kernels over flat
+vertex buffers. Matrix builders stream rows and refuse results larger than a
+configurable memory ceiling; vertex kernels size their working blocks from it.
+"""
+
+import math
+import struct
+import sys
+from array import array
+from typing import Iterator, List, Sequence, Tuple
+
+from .primitives import Box5D, Capsule5D, Primitive, Tuple5, part_primitive
+
+# Default ceiling for matrices and kernel working sets, in bytes.
+DEFAULT_MAX_BYTES = 1 << 22
+
+_EPS = 1e-12
+_FLOAT = 8
+# Working set per block vertex of the vertex kernels: five coordinates (array
+# items, or list slots of existing floats), a float object for its squared distance
+# in the current row and in the row being built, and up to three list slots for
+# them (the current row, plus the new row's old and grown storage while it is
+# reallocated), each over-allocated by up to 1/8.
+_BLOCK_ITEM = 5 * _FLOAT + 2 * sys.getsizeof(0.0) + 3 * struct.calcsize("P") * 9 // 8
+
+
+def _clamp01(x: float) -> float:
+    return 0.0 if x < 0.0 else 1.0 if x > 1.0 else x
+
+
+def _dot(a: Sequence[float], b: Sequence[float]) -> float:
+    return a[0] * b[0] + a[1] * b[1] + a[2] * b[2] + a[3] * b[3] + a[4] * b[4]
+
+
+def _sub(a: Sequence[float], b: Sequence[float]) -> Tuple5:
+    return (a[0] - b[0], a[1] - b[1], a[2] - b[2], a[3] - b[3], a[4] - b[4])
+
+
+# --- Exact primitive distances ------------------------------------------------
+
+
+def box_box_distance(a: Box5D, b: Box5D) -> float:
+    """Separation between two axis-aligned boxes (0 if they touch or overlap)."""
+    d2 = 0.0
+    for i in range(5):
+        gap = max(b.lower[i] - a.upper[i], a.lower[i] - b.upper[i], 0.0)
+        d2 += gap * gap
+    return math.sqrt(d2)
+
+
+def segment_segment_params(
+    p1: Sequence[float], q1: Sequence[float], p2: Sequence[float], q2: Sequence[float]
+) -> Tuple[float, float, float]:
+    """(s, t, squared distance) of the closest points p1 + s(q1 - p1), p2 + t(q2 - p2)."""
+    d1, d2, r = _sub(q1, p1), _sub(q2, p2), _sub(p1, p2)
+    a, e, f = _dot(d1, d1), _dot(d2, d2), _dot(d2, r)
+    if a <= _EPS and e <= _EPS:
+        s = t = 0.0
+    elif a <= _EPS:
+        s, t = 0.0, _clamp01(f / e)
+    else:
+        c = _dot(d1, r)
+        if e <= _EPS:
+            s, t = _clamp01(-c / a), 0.0
+        else:
+            b = _dot(d1, d2)
+            denom = a * e - b * b
+            s = _clamp01((b * f - c * e) / denom) if denom > _EPS * a * e else 0.0
+            t = (b * s + f) / e
+            if t < 0.0:
+                s, t = _clamp01(-c / a), 0.0
+            elif t > 1.0:
+                s, t = _clamp01((b - c) / a), 1.0
+    diff = [r[i] + s * d1[i] - t * d2[i] for i in range(5)]
+    return s, t, _dot(diff, diff)
+
+
+def capsule_capsule_distance(a: Capsule5D, b: Capsule5D) -> float:
+    _, _, d2 = segment_segment_params(a.a, a.b, b.a, b.b)
+    return max(0.0, math.sqrt(d2) - a.radius - b.radius)
+
+
+def segment_box_params(a: Sequence[float], b: Sequence[float], box: Box5D) -> Tuple[float, float]:
+    """
+    (s, squared distance) of the point of segment a→b closest to the box.
+    The squared distance is a convex piecewise quadratic in s whose pieces change
+    where a coordinate crosses a slab face; each piece is minimized in closed form.
+    """
+    d = _sub(b, a)
+    lo, hi = box.lower, box.upper
+    cuts = {0.0, 1.0}
+    for i in range(5):
+        if abs(d[i]) > _EPS:
+            for bound in (lo[i], hi[i]):
+                s = (bound - a[i]) / d[i]
+                if 0.0 < s < 1.0:
+                    cuts.add(s)
+    cuts = sorted(cuts)
+    best_s, best = 0.0, math.inf
+    for s0, s1 in zip(cuts, cuts[1:]):
+        mid = 0.5 * (s0 + s1)
+        qa = qb = qc = 0.0
+        for i in range(5):
+            p = a[i] + mid * d[i]
+            if p < lo[i]:
+                bound = lo[i]
+            elif p > hi[i]:
+                bound = hi[i]
+            else:
+                continue
+            # (a_i - bound + s d_i)^2
+            o = a[i] - bound
+            qa += d[i] * d[i]
+            qb += 2.0 * o * d[i]
+            qc += o * o
+        # qa = 0 means no active axis moves along the segment: the piece is constant.
+        s = min(max(-qb / (2.0 * qa), s0), s1) if qa > _EPS else s0
+        f = max(0.0, (qa * s + qb) * s + qc)
+        if f < best:
+            best_s, best = s, f
+    return best_s, best
+
+
+def box_capsule_distance(box: Box5D, capsule: Capsule5D) -> float:
+    _, d2 = segment_box_params(capsule.a, capsule.b, box)
+    return max(0.0, math.sqrt(d2) - capsule.radius)
+
+
+def primitive_distance(a: Primitive, b: Primitive) -> float:
+    """Exact separation of two box/capsule primitives; TypeError for patches."""
+    if isinstance(a, Box5D):
+        if isinstance(b, Box5D):
+            return box_box_distance(a, b)
+        if isinstance(b, Capsule5D):
+            return box_capsule_distance(a, b)
+    elif isinstance(a, Capsule5D):
+        if isinstance(b, Capsule5D):
+            return capsule_capsule_distance(a, b)
+        if isinstance(b, Box5D):
+            return box_capsule_distance(b, a)
+    raise TypeError(f"no exact distance between {type(a).__name__} and {type(b).__name__}")
+
+
+def _check_ceiling(rows: int, cols: int, max_bytes: int) -> None:
+    if rows * cols * _FLOAT > max_bytes:
+        raise ValueError(
+            f"{rows}x{cols} matrix exceeds max_bytes={max_bytes}; stream rows instead"
+        )
+
+
+def iter_distance_rows(
+    prims_a: Sequence[Primitive], prims_b: Sequence[Primitive]
+) -> Iterator[array]:
+    """One row of exact distances (to every primitive of prims_b) per primitive of prims_a."""
+    for a in prims_a:
+        yield array("d", (primitive_distance(a, b) for b in prims_b))
+
+
+def distance_matrix(
+    prims_a: Sequence[Primitive],
+    prims_b: Sequence[Primitive],
+    max_bytes: int = DEFAULT_MAX_BYTES,
+) -> List[array]:
+    """Exact distance matrix; ValueError if it would exceed `max_bytes`."""
+    _check_ceiling(len(prims_a), len(prims_b), max_bytes)
+    return list(iter_distance_rows(prims_a, prims_b))
+
+
+# --- Vertex kernels -------------------------------------------------------------
+
+
+def _block_size(max_bytes: int) -> int:
+    return max(1, max_bytes // _BLOCK_ITEM)
+
+
+def _columns(buf: Sequence[float], start: int, stop: int) -> List[Sequence[float]]:
+    return [buf[5 * start + a : 5 * stop : 5] for a in range(5)]
+
+
+def nearest_vertices(
+    a: Sequence[float], b: Sequence[float], max_bytes: int = DEFAULT_MAX_BYTES
+) -> Tuple[array, array]:
+    """
+    For every vertex of flat buffer `a`, the distance to and index of the nearest
+    vertex of flat buffer `b`. `b` is processed in column blocks sized so the
+    working set stays within `max_bytes`.
+    """
+    if len(a) % 5 or len(b) % 5:
+        raise ValueError("buffer length must be a multiple of 5")
+    na, nb = len(a) // 5, len(b) // 5
+    if nb == 0:
+        raise ValueError("b has no vertices")
+    best = array("d", [math.inf]) * na
+    index = array("I", [0]) * na
+    block = _block_size(max_bytes)
+    for start in range(0, nb, block):
+        stop = min(nb, start + block)
+        bx, by, bz, bw, bv = _columns(b, start, stop)
+        for i in range(na):
+            x, y, z, w, v = a[5 * i : 5 * i + 5]
+            d2 = [
+                (x - p) ** 2 + (y - q) ** 2 + (z - r) ** 2 + (w - s) ** 2 + (v - t) ** 2
+                for p, q, r, s, t in zip(bx, by, bz, bw, bv)
+            ]
+            m = min(d2)
+            if m < best[i]:
+                best[i] = m
+                index[i] = start + d2.index(m)
+    return array("d", map(math.sqrt, best)), index
+
+
+def min_vertex_distance(
+    a: Sequence[float], b: Sequence[float], max_bytes: int = DEFAULT_MAX_BYTES
+) -> float:
+    """Smallest vertex-to-vertex distance between two flat buffers."""
+    dist, _ = nearest_vertices(a, b, max_bytes)
+    return min(dist) if dist else math.inf
+
+
+def iter_vertex_distance_rows(
+    groups_a: Sequence[Sequence[float]],
+    groups_b: Sequence[Sequence[float]],
+    max_bytes: int = DEFAULT_MAX_BYTES,
+) -> Iterator[array]:
+    """Rows of min vertex distances between vertex groups (e.g. parts of many figures)."""
+    for ga in groups_a:
+        yield array("d", (min_vertex_distance(ga, gb, max_bytes) for gb in groups_b))
+
+
+def vertex_distance_matrix(
+    groups_a: Sequence[Sequence[float]],
+    groups_b: Sequence[Sequence[float]],
+    max_bytes: int = DEFAULT_MAX_BYTES,
+) -> List[array]:
+    """Min vertex distance matrix between groups; ValueError if above `max_bytes`."""
+    _check_ceiling(len(groups_a), len(groups_b), max_bytes)
+    return list(iter_vertex_distance_rows(groups_a, groups_b, max_bytes))
+
+
+# --- Figures ------------------------------------------------------------------
+
+
+def _leaf(figure, name: str):
+    for part_name, part in figure.leaf_parts():
+        if part_name == name:
+            return part
+    raise KeyError(name)
+
+
+def population_primitives(figures: Sequence, name: str) -> List[Primitive]:
+    """Primitive of leaf part `name` (e.g. "hands.left") for every figure."""
+    return [part_primitive(_leaf(fig, name)) for fig in figures]
+
+
+def clearance(figures: Sequence, part_a: str, part_b: str) -> array:
+    """Exact distance between two named leaf parts within each figure."""
+    return array(
+        "d",
+        (
+            primitive_distance(part_primitive(_leaf(fig, part_a)), part_primitive(_leaf(fig, part_b)))
+            for fig in figures
+        ),
+    )
@@ -5,6 +5,7 @@ Face: 5D frontal surface of the head. A 2D plane embedded in 5D.
 from typing import List
 
 from .geometry import Point5D, Vector5D, Plane5D
+from .footprint import Footprint, memory_footprint
 
 
 class Face:
@@ -29,39 +30,38 @@ class Face:
         if n < 1e-10:
             self._plane = Plane5D(center, Vector5D(1, 0, 0, 0, 0), Vector5D(0, 1, 0, 0, 0))
             return
+        # Plane vectors are computed on scalars and wrapped in Vector5D once at the end.
         norm_u = 1.0 / n
-        nvec = Vector5D(
-            normal.dx * norm_u,
-            normal.dy * norm_u,
-            normal.dz * norm_u,
-            normal.dw * norm_u,
-            normal.dv * norm_u,
-        )
+        nx, ny, nz = normal.dx * norm_u, normal.dy * norm_u, normal.dz * norm_u
+        nw, nv = normal.dw * norm_u, normal.dv * norm_u
         if up is not None and up.norm() >= 1e-10:
-            u_dir = up.scale(1.0 / up.norm())
+            k = 1.0 / up.norm()
+            ux, uy, uz, uw, uv = up.dx * k, up.dy * k, up.dz * k, up.dw * k, up.dv * k
         else:
-            u_dir = Vector5D(0, 1, 0, 0, 0)
+            ux, uy, uz, uw, uv = 0.0, 1.0, 0.0, 0.0, 0.0
         # u = tangent along "up" on face
-        u = u_dir.scale(1.0) - nvec.scale(nvec.dot(u_dir))
-        un = u.norm()
+        d = nx * ux + ny * uy + nz * uz + nw * uw + nv * uv
+        ux, uy, uz, uw, uv = ux - nx * d, uy - ny * d, uz - nz * d, uw - nw * d, uv - nv * d
+        un = (ux * ux + uy * uy + uz * uz + uw * uw + uv * uv) ** 0.5
         if un < 1e-10:
-            u = Vector5D(1, 0, 0, 0, 0) - nvec.scale(nvec.dx)
-            un = u.norm()
+            ux, uy, uz, uw, uv = 1 - nx * nx, 0 - ny * nx, 0 - nz * nx, 0 - nw * nx, 0 - nv * nx
+            un = (ux * ux + uy * uy + uz * uz + uw * uw + uv * uv) ** 0.5
         if un >= 1e-10:
-            u = u.scale(1.0 / un)
+            k = 1.0 / un
+            ux, uy, uz, uw, uv = ux * k, uy * k, uz * k, uw * k, uv * k
         # t = second tangent (right on face)
-        t = Vector5D(
-            nvec.dy * u.dz - nvec.dz * u.dy,
-            nvec.dz * u.dx - nvec.dx * u.dz,
-            nvec.dx * u.dy - nvec.dy * u.dx,
-            nvec.dw * u.dz - nvec.dz * u.dw,
-            nvec.dv * u.dx - nvec.dx * u.dv,
-        )
-        tn = t.norm()
+        tx = ny * uz - nz * uy
+        ty = nz * ux - nx * uz
+        tz = nx * uy - ny * ux
+        tw = nw * uz - nz * uw
+        tv = nv * ux - nx * uv
+        tn = (tx * tx + ty * ty + tz * tz + tw * tw + tv * tv) ** 0.5
         if tn >= 1e-10:
-            t = t.scale(1.0 / tn)
+            k = 1.0 / tn
+            t = Vector5D(tx * k, ty * k, tz * k, tw * k, tv * k)
         else:
             t = Vector5D(1, 0, 0, 0, 0)
+        u = Vector5D(ux, uy, uz, uw, uv)
         self._plane = Plane5D(center, u, t)
 
     def plane_5d(self) -> Plane5D:
@@ -80,3 +80,7 @@ class Face:
 
     def center_point(self) -> Point5D:
         return self.center
+
+    def memory_footprint(self) -> Footprint:
+        """Object overhead and vertex payload in bytes (see body.footprint)."""
+        return memory_footprint(self)
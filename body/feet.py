@@ -5,6 +5,7 @@ Feet: left and right foot volumes in 5D.
 from typing import List
 
 from .geometry import Point5D
+from .footprint import Footprint, memory_footprint
 
 
 class Foot:
@@ -30,6 +31,10 @@ class Foot:
             half_extent_v,
         )
 
+    @property
+    def half_extents(self) -> tuple:
+        return self._h
+
     def vertices_5d(self) -> List[Point5D]:
         hx, hy, hz, hw, hv = self._h
         cx, cy, cz, cw, cv = self.center.as_tuple()
@@ -50,6 +55,10 @@ class Foot:
                             )
         return out
 
+    def memory_footprint(self) -> Footprint:
+        """Object overhead and vertex payload in bytes (see body.footprint)."""
+        return memory_footprint(self)
+
 
 class Feet:
     """
@@ -68,3 +77,7 @@ class Feet:
 
     def right_vertices_5d(self) -> List[Point5D]:
         return self.right.vertices_5d()
+
+    def memory_footprint(self) -> Footprint:
+        """Object overhead and vertex payload in bytes (see body.footprint)."""
+        return memory_footprint(self)
@@ -0,0 +1,236 @@
+"""
+Footprint: memory accounting for figures, parts and population containers.
+Object overhead is everything reachable from the object (instances, their
+attribute storage, Point5D/Vector5D values, floats, tuples, arrays); vertex
+payload is what one `vertices_5d()` call allocates on top of that, or the
+float64 buffer a container would materialize. Sizes come from sys.getsizeof
+plus CPython's inline attribute storage; `check_footprint` compares the
+estimate with allocations seen by tracemalloc.
+"""
+
+import gc
+import sys
+import tracemalloc
+import types
+from dataclasses import dataclass
+from typing import Callable, Iterable, List, Set, Tuple
+
+# Inline attribute values of an instance (CPython 3.11+): header plus one pointer each.
+_VALUES_HEADER = 16
+_POINTER = 8
+_FLOAT64 = 8
+_SKIP = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+
+
+@dataclass(frozen=True)
+class Footprint:
+    """Byte counts for one object; `children` break the totals down by part."""
+
+    name: str
+    objects: int
+    object_bytes: int
+    payload_bytes: int
+    vertices: int
+    children: Tuple["Footprint", ...] = ()
+    shared_bytes: int = 0
+
+    @property
+    def total(self) -> int:
+        """Object overhead plus vertex payload (shared data excluded)."""
+        return self.object_bytes + self.payload_bytes
+
+    def rows(self, depth: int = 0) -> List[Tuple[int, "Footprint"]]:
+        out = [(depth, self)]
+        for child in self.children:
+            out.extend(child.rows(depth + 1))
+        return out
+
+    def report(self) -> str:
+        """Indented table: name, objects, object bytes, payload bytes, vertices."""
+        lines = [f"{'part':<24}{'objects':>9}{'object B':>11}{'payload B':>11}{'vertices':>10}"]
+        for depth, fp in self.rows():
+            lines.append(
+                f"{'  ' * depth + fp.name:<24}{fp.objects:>9}{fp.object_bytes:>11}"
+                f"{fp.payload_bytes:>11}{fp.vertices:>10}"
+            )
+        if self.shared_bytes:
+            lines.append(f"(shared, not in totals: {self.shared_bytes} B)")
+        return "\n".join(lines)
+
+
+def _shared_ids() -> Set[int]:
+    # Module-level data every figure references but does not own.
+    from .sscha import PROPORTIONS, _SHARABLE
+
+    shared = {id(PROPORTIONS), id(_SHARABLE)}
+    shared.update(map(id, PROPORTIONS.keys()))
+    shared.update(map(id, PROPORTIONS.values()))
+    shared.update(map(id, _SHARABLE))
+    return shared
+
+
+def object_size(obj: object, seen: Set[int] | None = None) -> Tuple[int, int]:
+    """(bytes, object count) reachable from obj, skipping ids already in `seen`."""
+    seen = _shared_ids() if seen is None else seen
+    total = count = 0
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if o is None or isinstance(o, (bool, _SKIP)) or id(o) in seen:
+            continue
+        if type(o) is int and -5 <= o <= 256:
+            continue
+        seen.add(id(o))
+        count += 1
+        total += sys.getsizeof(o)
+        d = getattr(o, "__dict__", None)
+        if isinstance(d, dict):
+            total += _VALUES_HEADER + _POINTER * len(d)
+            stack.extend(d.values())
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            stack.extend(o)
+        elif isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, memoryview):
+            stack.append(o.obj)
+    return total, count
+
+
+def _figure(obj, name: str, seen: Set[int]) -> Footprint:
+    children = tuple(_part(part, part_name, seen) for part_name, part in obj.leaf_parts())
+    own, own_count = object_size(obj, seen)
+    verts = obj.vertices_5d()
+    payload, _ = object_size(verts, set(seen))
+    return Footprint(
+        name,
+        own_count + sum(c.objects for c in children),
+        own + sum(c.object_bytes for c in children),
+        payload,
+        len(verts),
+        children,
+    )
+
+
+def _pair(obj, name: str, seen: Set[int]) -> Footprint:
+    children = (_part(obj.left, "left", seen), _part(obj.right, "right", seen))
+    own, own_count = object_size(obj, seen)
+    return Footprint(
+        name,
+        own_count + sum(c.objects for c in children),
+        own + sum(c.object_bytes for c in children),
+        sum(c.payload_bytes for c in children),
+        sum(c.vertices for c in children),
+        children,
+    )
+
+
+def _part(obj, name: str, seen: Set[int]) -> Footprint:
+    if hasattr(obj, "left") and hasattr(obj, "right"):
+        return _pair(obj, name, seen)
+    size, count = object_size(obj, seen)
+    verts = obj.vertices_5d()
+    payload, _ = object_size(verts, set(seen))
+    return Footprint(name, count, size, payload, len(verts))
+
+
+def _population(obj, name: str) -> Footprint:
+    shared, _ = object_size(obj.mesh)
+    size, count = object_size(obj, _shared_ids() | {id(obj.mesh)})
+    floats = len(obj) * len(obj.mesh.vertices)
+    return Footprint(name, count, size, floats * _FLOAT64, floats // 5, shared_bytes=shared)
+
+
+def memory_footprint(obj: object, name: str | None = None) -> Footprint:
+    """
+    Footprint of a Sscha (per leaf part), a body part or left/right pair, an
+    InstancedPopulation (payload = materializing every figure as float64; the
+    shared canonical mesh is reported separately), a flat-array container
+    (TubeArray, BoxArray, LimbChain) or a list of figures. Anything else is
+    reported as object bytes only.
+    """
+    name = name or type(obj).__name__
+    seen = _shared_ids()
+    if hasattr(obj, "leaf_parts"):
+        return _figure(obj, name, seen)
+    if hasattr(obj, "records") and hasattr(obj, "mesh"):
+        return _population(obj, name)
+    if hasattr(obj, "vertex_array"):
+        size, count = object_size(obj, seen)
+        floats = len(obj.vertex_array())
+        return Footprint(name, count, size, floats * _FLOAT64, floats // 5)
+    if hasattr(obj, "vertices_5d"):
+        return _part(obj, name, seen)
+    if isinstance(obj, (list, tuple)):
+        children = tuple(memory_footprint(item, f"{name}[{i}]") for i, item in enumerate(obj))
+        return Footprint(
+            name,
+            1 + sum(c.objects for c in children),
+            sys.getsizeof(obj) + sum(c.object_bytes for c in children),
+            sum(c.payload_bytes for c in children),
+            sum(c.vertices for c in children),
+            children,
+        )
+    size, count = object_size(obj, seen)
+    return Footprint(name, count, size, 0, 0)
+
+
+def measure_allocations(factory: Callable[[], object], repeat: int = 1) -> Tuple[object, int]:
+    """
+    (last result, bytes still allocated per factory() call while the results are
+    alive), via tracemalloc. Averaging over `repeat` calls smooths out free-list
+    and allocator noise that dominates a single small object.
+    """
+    repeat = max(1, repeat)
+    results: List[object] = [None] * repeat
+    gc.collect()
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        for i in range(repeat):
+            results[i] = factory()
+        gc.collect()
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    return results[-1], round((after - before) / repeat)
+
+
+@dataclass(frozen=True)
+class FootprintCheck:
+    estimated: int
+    measured: int
+
+    @property
+    def ratio(self) -> float:
+        return self.estimated / self.measured if self.measured else float("inf")
+
+    def within(self, rel_tol: float) -> bool:
+        return abs(self.ratio - 1.0) <= rel_tol
+
+
+def check_footprint(
+    factory: Callable[[], object], repeat: int = 50
+) -> Tuple[FootprintCheck, FootprintCheck]:
+    """
+    Compare estimates with tracemalloc on objects from `factory`: (object
+    overhead check, vertex payload check). Payload is measured on
+    `vertices_5d()` (or `vertex_array()` for array containers). Both are
+    averaged over `repeat` calls.
+    """
+    obj, measured_obj = measure_allocations(factory, repeat)
+    fp = memory_footprint(obj)
+    make = getattr(obj, "vertex_array", None) or obj.vertices_5d
+    _, measured_payload = measure_allocations(make, repeat)
+    return (
+        FootprintCheck(fp.object_bytes, measured_obj),
+        FootprintCheck(fp.payload_bytes, measured_payload),
+    )
+
+
+def total_footprint(objects: Iterable[object]) -> int:
+    """Summed total bytes of many objects (no per-object breakdown kept)."""
+    return sum(memory_footprint(o).total for o in objects)
@@ -0,0 +1,154 @@
+"""
+Frame streams: keyframes plus quantized deltas for animated vertex buffers.
+The encoder mirrors the decoder's reconstruction (error feedback), so the
+quantization error never accumulates: every decoded value stays within
+step / 2 of the source frame. Delta frames can be zero-run encoded so that
+unmoved vertices cost nothing to send and nothing to decode.
+
+Packet layout (little-endian): FRAME_HEADER (magic, version, kind, frame
+index, float count, step), then
+  KEY        float64 values
+  DELTA      int32 quantized deltas, one per float
+  DELTA_RLE  uint32 run count R, R (skip, length) uint32 pairs, then the int32
+             deltas of all runs back to back
+"""
+
+import struct
+from array import array
+from typing import Iterable, Iterator, List, Sequence
+
+from .byteorder import from_le, to_le
+
+FRAME_HEADER = struct.Struct("<4sBBIId")
+FRAME_MAGIC = b"SFRM"
+FRAME_VERSION = 1
+
+KEY = 0
+DELTA = 1
+DELTA_RLE = 2
+
+_COUNT = struct.Struct("<I")
+_INT32_MAX = 2**31 - 1
+
+
+class FrameEncoder:
+    """
+    Encode successive flat vertex buffers of one fixed size. A keyframe is sent
+    first, every `keyframe_interval` frames, and whenever a delta would overflow
+    int32 steps; otherwise deltas are quantized to multiples of `step`.
+    With `compress`, delta frames use zero-run encoding when it is smaller.
+    """
+
+    def __init__(self, step: float = 1e-4, keyframe_interval: int = 60, compress: bool = True):
+        if step <= 0:
+            raise ValueError("step must be positive")
+        self.step = step
+        self.keyframe_interval = max(1, keyframe_interval)
+        self.compress = compress
+        self.frame_index = 0
+        self._recon: array | None = None
+
+    def _header(self, kind: int, count: int) -> bytes:
+        return FRAME_HEADER.pack(FRAME_MAGIC, FRAME_VERSION, kind, self.frame_index, count, self.step)
+
+    def encode(self, frame: Sequence[float]) -> bytes:
+        count = len(frame)
+        recon = self._recon
+        if recon is not None and len(recon) != count:
+            raise ValueError(f"frame has {count} floats, stream has {len(recon)}")
+        packet = None
+        if recon is not None and self.frame_index % self.keyframe_interval:
+            packet = self._encode_delta(frame, recon)
+        if packet is None:
+            self._recon = array("d", frame)
+            packet = self._header(KEY, count) + to_le(self._recon)
+        self.frame_index += 1
+        return packet
+
+    def _encode_delta(self, frame: Sequence[float], recon: array) -> bytes | None:
+        inv = 1.0 / self.step
+        q = [round((x - r) * inv) for x, r in zip(frame, recon)]
+        if q and max(max(q), -min(q)) > _INT32_MAX:
+            return None
+        step = self.step
+        runs = array("I")
+        literals = array("i")
+        n = len(q)
+        i = prev_end = 0
+        while i < n:
+            if q[i]:
+                j = i + 1
+                while j < n and q[j]:
+                    j += 1
+                runs.append(i - prev_end)
+                runs.append(j - i)
+                literals.extend(q[i:j])
+                # Error feedback: apply exactly what the decoder will apply.
+                recon[i:j] = array("d", [r + k * step for r, k in zip(recon[i:j], q[i:j])])
+                prev_end = i = j
+            else:
+                i += 1
+        if self.compress and 4 + 4 * len(runs) + 4 * len(literals) < 4 * n:
+            return (
+                self._header(DELTA_RLE, n)
+                + _COUNT.pack(len(runs) // 2)
+                + to_le(runs)
+                + to_le(literals)
+            )
+        return self._header(DELTA, n) + to_le(array("i", q))
+
+    def encode_all(self, frames: Iterable[Sequence[float]]) -> List[bytes]:
+        return [self.encode(f) for f in frames]
+
+
+class FrameDecoder:
+    """
+    Decode packets from a FrameEncoder in order. `decode` returns the decoder's
+    reconstruction buffer, which the next packet updates in place; copy it if it
+    must outlive the step. Delta packets only touch the values they change.
+    """
+
+    def __init__(self):
+        self.frame_index = -1
+        self._recon: array | None = None
+
+    def decode(self, packet: bytes) -> array:
+        magic, version, kind, index, count, step = FRAME_HEADER.unpack_from(packet, 0)
+        if magic != FRAME_MAGIC or version != FRAME_VERSION:
+            raise ValueError("not a frame stream packet")
+        body = memoryview(packet)[FRAME_HEADER.size :]
+        if kind == KEY:
+            self._recon = from_le("d", body[: 8 * count])
+            if len(self._recon) != count:
+                raise ValueError("truncated keyframe")
+        else:
+            recon = self._recon
+            if recon is None or len(recon) != count:
+                raise ValueError("delta frame without a matching keyframe")
+            if index != self.frame_index + 1:
+                raise ValueError(f"expected frame {self.frame_index + 1}, got {index}")
+            if kind == DELTA:
+                q = from_le("i", body[: 4 * count])
+                recon[:] = array("d", [r + k * step for r, k in zip(recon, q)])
+            elif kind == DELTA_RLE:
+                (nruns,) = _COUNT.unpack_from(body, 0)
+                runs = from_le("I", body[4 : 4 + 8 * nruns])
+                literals = from_le("i", body[4 + 8 * nruns :])
+                pos = lit = 0
+                for r in range(0, 2 * nruns, 2):
+                    pos += runs[r]
+                    end = pos + runs[r + 1]
+                    recon[pos:end] = array(
+                        "d", [x + k * step for x, k in zip(recon[pos:end], literals[lit : lit + end - pos])]
+                    )
+                    lit += end - pos
+                    pos = end
+            else:
+                raise ValueError(f"unknown frame kind {kind}")
+        self.frame_index = index
+        return self._recon
+
+    def decode_all(self, packets: Iterable[bytes]) -> Iterator[array]:
+        """Yield a copy of every decoded frame."""
+        for packet in packets:
+            yield array("d", self.decode(packet))
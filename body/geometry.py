@@ -3,8 +3,9 @@
 Coordinates: (x, y, z, w, v) where x,y,z are spatial; w,v are extended dimensions.
 """
 
+from array import array
 from dataclasses import dataclass
-from typing import Tuple, Iterator
+from typing import Iterable, List, Sequence, Tuple, Iterator
 
 
 @dataclass(frozen=True)
@@ -124,7 +125,14 @@ class Plane5D:
 
     def point_at(self, s: float, r: float) -> Point5D:
         """Point at parameters (s, r): origin + s*u + r*t."""
-        return self.origin + self.u.scale(s) + self.t.scale(r)
+        o, u, t = self.origin, self.u, self.t
+        return Point5D(
+            o.x + u.dx * s + t.dx * r,
+            o.y + u.dy * s + t.dy * r,
+            o.z + u.dz * s + t.dz * r,
+            o.w + u.dw * s + t.dw * r,
+            o.v + u.dv * s + t.dv * r,
+        )
 
     def normal_3d_slice(self) -> Vector5D:
         """Approximate normal in the (x,y,z) slice (for visualization)."""
@@ -141,3 +149,16 @@ class Plane5D:
 def origin_5d() -> Point5D:
     """Canonical origin in 5D."""
     return Point5D(0.0, 0.0, 0.0, 0.0, 0.0)
+
+
+def flatten_points(points: Iterable[Point5D]) -> array:
+    """Flat float64 buffer [x0, y0, z0, w0, v0, x1, ...] of the given points."""
+    out = array("d")
+    for p in points:
+        out.extend((p.x, p.y, p.z, p.w, p.v))
+    return out
+
+
+def unflatten_points(buf: Sequence[float]) -> List[Point5D]:
+    """Inverse of flatten_points: Point5D list from a flat 5-per-vertex buffer."""
+    return [Point5D(*buf[i : i + 5]) for i in range(0, len(buf), 5)]
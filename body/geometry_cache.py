@@ -0,0 +1,229 @@
+"""
+Geometry cache: content-addressed vertex buffers for repeated figure builds.
+Every Sscha vertex is its origin's (x, y, z) plus a part offset that depends
+only on scale, plane_w, plane_v, tube resolutions and proportions, so figures
+sharing those parameters share one cached buffer built at origin zero and are
+translated on the way out. Keys are SHA-256 digests of the packed parameters,
+stable across processes and machines.
+
+Entries are evicted least-recently-used once the cache exceeds `max_bytes`.
+With a `directory`, every built buffer is also written to
+`<directory>/<key>.geom` (GEOMETRY_HEADER, then little-endian float64
+coordinates) and misses are served from there before rebuilding; files are
+never evicted.
+"""
+
+import hashlib
+import os
+import struct
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Mapping, Tuple
+
+from .byteorder import from_le, to_le
+from .geometry import Point5D, flatten_points, origin_5d
+from .sscha import Sscha, PROPORTIONS
+
+GEOMETRY_HEADER = struct.Struct("<4sBI")
+GEOMETRY_MAGIC = b"SGEO"
+GEOMETRY_VERSION = 1
+
+DEFAULT_MAX_BYTES = 64 << 20
+
+_PARAMS = struct.Struct("<3d3H")
+
+
+def geometry_key(
+    scale: float = 1.0,
+    plane_w: float = 0.0,
+    plane_v: float = 0.0,
+    neck_radial: int = 8,
+    arm_radial: int = 6,
+    leg_radial: int = 6,
+    proportions: Mapping[str, float] | None = None,
+) -> str:
+    """Hex digest identifying the origin-free geometry of a figure."""
+    # + 0.0 folds -0.0 into 0.0, which builds the same geometry.
+    h = hashlib.sha256(
+        _PARAMS.pack(scale + 0.0, plane_w + 0.0, plane_v + 0.0, neck_radial, arm_radial, leg_radial)
+    )
+    for name, value in sorted((proportions or {}).items()):
+        if PROPORTIONS.get(name) != value:
+            h.update(name.encode() + b"=" + struct.pack("<d", value + 0.0))
+    return h.hexdigest()
+
+
+def figure_key(figure: Sscha) -> str:
+    return geometry_key(
+        figure.scale,
+        figure.plane_w,
+        figure.plane_v,
+        figure.neck_radial,
+        figure.arm_radial,
+        figure.leg_radial,
+        None if figure.proportions is PROPORTIONS else figure.proportions,
+    )
+
+
+def _translate(local: array, origin: Point5D) -> array:
+    out = array("d", local)
+    for axis, d in enumerate((origin.x, origin.y, origin.z)):
+        if d:
+            out[axis::5] = array("d", [c + d for c in local[axis::5]])
+    return out
+
+
+class GeometryCache:
+    """
+    LRU cache of origin-free figure vertex buffers (array('d'), 5 floats per
+    vertex, Sscha.vertices_5d order). Thread-safe; `hits`, `disk_hits` and
+    `misses` count lookups.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, directory: str | None = None):
+        if max_bytes < 0:
+            raise ValueError("max_bytes must be non-negative")
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.nbytes = 0
+        self.hits = self.disk_hits = self.misses = 0
+        self._entries: "OrderedDict[str, array]" = OrderedDict()
+        self._lock = threading.Lock()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def clear(self) -> None:
+        """Drop in-memory entries (files on disk are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    # --- Storage -------------------------------------------------------------
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".geom")
+
+    def _load(self, key: str) -> array | None:
+        if self.directory is None:
+            return None
+        try:
+            with open(self._path(key), "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        magic, version, count = GEOMETRY_HEADER.unpack_from(data, 0)
+        if magic != GEOMETRY_MAGIC or version != GEOMETRY_VERSION:
+            raise ValueError(f"{self._path(key)} is not a cached geometry file")
+        buf = from_le("d", data[GEOMETRY_HEADER.size : GEOMETRY_HEADER.size + 8 * count])
+        if len(buf) != count:
+            raise ValueError(f"{self._path(key)} is truncated")
+        return buf
+
+    def _save(self, key: str, buf: array) -> None:
+        if self.directory is None:
+            return
+        # Write then rename, so readers never see a partial file.
+        tmp = f"{self._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(GEOMETRY_HEADER.pack(GEOMETRY_MAGIC, GEOMETRY_VERSION, len(buf)))
+            f.write(to_le(buf))
+        os.replace(tmp, self._path(key))
+
+    def _store(self, key: str, buf: array) -> None:
+        # Caller holds the lock.
+        size = 8 * len(buf)
+        if size > self.max_bytes:
+            return
+        self._entries[key] = buf
+        self.nbytes += size
+        while self.nbytes > self.max_bytes:
+            _, old = self._entries.popitem(last=False)
+            self.nbytes -= 8 * len(old)
+
+    # --- Lookups -------------------------------------------------------------
+
+    def local_vertices(
+        self,
+        scale: float = 1.0,
+        plane_w: float = 0.0,
+        plane_v: float = 0.0,
+        neck_radial: int = 8,
+        arm_radial: int = 6,
+        leg_radial: int = 6,
+        proportions: Mapping[str, float] | None = None,
+    ) -> Tuple[str, array]:
+        """
+        (key, shared origin-free buffer) for the given parameters, building the
+        figure only on a miss. The buffer belongs to the cache: do not modify it.
+        """
+        key = geometry_key(scale, plane_w, plane_v, neck_radial, arm_radial, leg_radial, proportions)
+        with self._lock:
+            buf = self._entries.get(key)
+            if buf is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return key, buf
+        buf = self._load(key)
+        if buf is not None:
+            self.disk_hits += 1
+        else:
+            self.misses += 1
+            fig = Sscha(
+                origin_5d(), scale, plane_w, plane_v, neck_radial, arm_radial, leg_radial, proportions
+            )
+            buf = flatten_points(fig.vertices_5d())
+            self._save(key, buf)
+        with self._lock:
+            # Another thread may have stored the same key meanwhile; keep one copy.
+            if key in self._entries:
+                buf = self._entries[key]
+                self._entries.move_to_end(key)
+            else:
+                self._store(key, buf)
+        return key, buf
+
+    def vertices(
+        self,
+        origin: Point5D | None = None,
+        scale: float = 1.0,
+        plane_w: float = 0.0,
+        plane_v: float = 0.0,
+        neck_radial: int = 8,
+        arm_radial: int = 6,
+        leg_radial: int = 6,
+        proportions: Mapping[str, float] | None = None,
+    ) -> array:
+        """
+        New flat buffer of the figure Sscha(...) would build with these
+        arguments (equal up to rounding of the origin translation).
+        """
+        _, local = self.local_vertices(
+            scale, plane_w, plane_v, neck_radial, arm_radial, leg_radial, proportions
+        )
+        return _translate(local, origin if origin is not None else origin_5d())
+
+    def figure_vertices(self, figure: Sscha) -> array:
+        """
+        Cached equivalent of flatten_points(figure.vertices_5d()). Figures with
+        edited parts (posed via own_part) no longer match their parameters and
+        bypass the cache.
+        """
+        if figure.edited_parts():
+            return flatten_points(figure.vertices_5d())
+        return self.vertices(
+            figure.origin,
+            figure.scale,
+            figure.plane_w,
+            figure.plane_v,
+            figure.neck_radial,
+            figure.arm_radial,
+            figure.leg_radial,
+            None if figure.proportions is PROPORTIONS else figure.proportions,
+        )
@@ -5,6 +5,7 @@ Head: upper 5D volume of Sscha. A 5D box or ellipsoid-like region.
 from typing import List
 
 from .geometry import Point5D, Vector5D
+from .footprint import Footprint, memory_footprint
 
 
 class Head:
@@ -30,6 +31,10 @@ class Head:
             half_extent_v,
         )
 
+    @property
+    def half_extents(self) -> tuple:
+        return self._h
+
     def vertices_5d(self) -> List[Point5D]:
         """All 32 vertices of the 5D head box."""
         hx, hy, hz, hw, hv = self._h
@@ -61,3 +66,7 @@ class Head:
     def bottom_center(self, down: Vector5D) -> Point5D:
         """Center of bottom (neck attachment)."""
         return self.center + down.scale(self._h[0])
+
+    def memory_footprint(self) -> Footprint:
+        """Object overhead and vertex payload in bytes (see body.footprint)."""
+        return memory_footprint(self)
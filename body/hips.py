@@ -5,6 +5,7 @@ Hips: base anchor of Sscha in 5D. A compact 5D region (box) below the torso.
 from typing import List
 
 from .geometry import Point5D, Vector5D
+from .footprint import Footprint, memory_footprint
 
 
 class Hips:
@@ -31,6 +32,10 @@ class Hips:
             half_extent_v,
         )
 
+    @property
+    def half_extents(self) -> tuple:
+        return self._h
+
     def vertices_5d(self) -> List[Point5D]:
         """All 32 vertices of the 5D hip box."""
         hx, hy, hz, hw, hv = self._h
@@ -62,3 +67,7 @@ class Hips:
     def right_anchor(self, right_dir: Vector5D) -> Point5D:
         """Attachment point for right leg."""
         return self.center + right_dir.scale(self._h[0])
+
+    def memory_footprint(self) -> Footprint:
+        """Object overhead and vertex payload in bytes (see body.footprint)."""
+        return memory_footprint(self)
@@ -0,0 +1,117 @@
+"""
+IK: place hands and feet on targets by re-aiming the arm and leg limbs.
+Each arm and leg is a single rigid segment (shoulder -> hand, hip -> foot), so
+the solve is analytic: aim the segment at the target and clamp to its length.
+The end effector (Hand / Foot box) is translated with the segment end, and
+parts are updated in place through `Sscha.own_part`, so a clone's shared parts
+are copied first; the figure is never rebuilt.
+
+Targets for many figures are given as one flat 5-per-figure buffer (or a
+sequence of Point5D); residuals come back as one flat array('d').
+"""
+
+import math
+from array import array
+from typing import Sequence, Tuple
+
+from .geometry import Point5D
+from .limbs import LimbSegment
+
+# Limb pair attribute -> end-effector pair attribute on Sscha.
+EFFECTORS = {"arms": "hands", "legs": "feet"}
+SIDES = ("left", "right")
+
+
+def _targets(targets: Sequence, count: int) -> Sequence[float]:
+    """Flat 5-per-target coordinates from Point5D values or a flat float buffer."""
+    if count and isinstance(targets[0], Point5D):
+        if len(targets) != count:
+            raise ValueError(f"expected {count} targets, got {len(targets)}")
+        return [c for t in targets for c in t.as_tuple()]
+    if len(targets) != 5 * count:
+        raise ValueError(f"expected {5 * count} target coordinates, got {len(targets)}")
+    return targets
+
+
+def _chain(figure, limb: str, side: str) -> Tuple[LimbSegment, object]:
+    if limb not in EFFECTORS:
+        raise KeyError(f"unknown limb {limb!r}; expected one of {sorted(EFFECTORS)}")
+    if side not in SIDES:
+        raise KeyError(f"unknown side {side!r}; expected one of {SIDES}")
+    # Copy-on-write: a clone's shared limb and effector are copied before they move.
+    return figure.own_part(f"{limb}.{side}"), figure.own_part(f"{EFFECTORS[limb]}.{side}")
+
+
+def aim_limb(
+    segment: LimbSegment,
+    target: Sequence[float],
+    effector=None,
+    length: float | None = None,
+    stretch: bool = False,
+) -> float:
+    """
+    Point `segment` from its origin towards `target` (5 coordinates), keeping
+    its length (or `length`) unless `stretch`, in which case the end lands on
+    the target. A target on the origin keeps the current direction. The
+    `effector` (anything with a `center`) moves with the segment end.
+    Returns the remaining distance from the new end to the target.
+    """
+    o = segment.origin
+    e = segment.end
+    ox, oy, oz, ow, ov = o.x, o.y, o.z, o.w, o.v
+    tx, ty, tz, tw, tv = target
+    dx, dy, dz, dw, dv = tx - ox, ty - oy, tz - oz, tw - ow, tv - ov
+    dist = math.sqrt(dx * dx + dy * dy + dz * dz + dw * dw + dv * dv)
+    if length is None:
+        ex, ey, ez, ew, ev = e.x - ox, e.y - oy, e.z - oz, e.w - ow, e.v - ov
+        length = math.sqrt(ex * ex + ey * ey + ez * ez + ew * ew + ev * ev)
+    if dist < 1e-12 and not stretch:
+        # Target on the origin: keep the direction, only fix the length.
+        dx, dy, dz, dw, dv = e.x - ox, e.y - oy, e.z - oz, e.w - ow, e.v - ov
+        dist = math.sqrt(dx * dx + dy * dy + dz * dz + dw * dw + dv * dv)
+        if dist < 1e-12:
+            return length
+    k = (dist if stretch else length) / dist if dist >= 1e-12 else 0.0
+    end = Point5D(ox + k * dx, oy + k * dy, oz + k * dz, ow + k * dw, ov + k * dv)
+    if effector is not None:
+        c = effector.center
+        effector.center = Point5D(
+            c.x + end.x - e.x, c.y + end.y - e.y, c.z + end.z - e.z, c.w + end.w - e.w, c.v + end.v - e.v
+        )
+    segment.end = end
+    return math.sqrt(
+        (tx - end.x) ** 2 + (ty - end.y) ** 2 + (tz - end.z) ** 2 + (tw - end.w) ** 2 + (tv - end.v) ** 2
+    )
+
+
+def reach(
+    figure,
+    target: Point5D | Sequence[float],
+    limb: str = "arms",
+    side: str = "left",
+    stretch: bool = False,
+) -> float:
+    """Aim one figure's arm or leg (and move its hand or foot) at target; returns the residual."""
+    segment, effector = _chain(figure, limb, side)
+    return aim_limb(segment, tuple(target), effector, stretch=stretch)
+
+
+def solve_reach(
+    figures: Sequence,
+    targets: Sequence,
+    limb: str = "arms",
+    side: str = "left",
+    stretch: bool = False,
+) -> array:
+    """
+    Batched reach: aim `limb` ("arms" or "legs") on `side` of every figure at its
+    target (figures[i] -> targets[i], Point5D values or a flat 5-per-figure
+    buffer). Returns array('d') of residual distances: |limb length - target
+    distance| for rigid limbs, 0 with stretch=True.
+    """
+    coords = _targets(targets, len(figures))
+    out = array("d", bytes(8 * len(figures)))
+    for i, fig in enumerate(figures):
+        segment, effector = _chain(fig, limb, side)
+        out[i] = aim_limb(segment, coords[5 * i : 5 * i + 5], effector, stretch=stretch)
+    return out
@@ -0,0 +1,237 @@
+"""
+Instancing: one shared canonical mesh plus compact per-figure records.
+Every Sscha vertex is affine in `scale`: vertex = shift + scale * scaled + fixed,
+with shift = (origin.x, origin.y, origin.z, plane_w, plane_v). `fixed` is zero
+except for hands and feet, whose box extents do not follow the figure scale.
+A population therefore only needs to store those parameters per figure.
+"""
+
+import threading
+from array import array
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+from .geometry import Point5D, flatten_points, unflatten_points
+from .sscha import Sscha, PROPORTIONS
+from .quantize import QuantizedBuffer, with_precision
+from .morton import DEFAULT_BITS, morton_order, permute, permute_in_place
+from .footprint import Footprint, memory_footprint
+
+# origin (5), scale, plane_w, plane_v
+RECORD_SIZE = 8
+
+Resolution = Tuple[int, int, int]
+
+
+class CanonicalMesh:
+    """
+    Vertices of Sscha(scale=1.0) at the origin for one set of tube resolutions,
+    plus the topology: (part name, first vertex, vertex count) per leaf part,
+    in `Sscha.vertices_5d` order. Shared read-only between all instances.
+    The scaled/fixed split comes from the figures at scale 1 and 2: scaled = V2 - V1,
+    fixed = 2 * V1 - V2 (exact, since doubling is exact in floating point).
+    """
+
+    def __init__(self, neck_radial: int = 8, arm_radial: int = 6, leg_radial: int = 6):
+        self.resolution: Resolution = (neck_radial, arm_radial, leg_radial)
+        res = dict(neck_radial=neck_radial, arm_radial=arm_radial, leg_radial=leg_radial)
+        figure = Sscha(**res)
+        buf = flatten_points(figure.vertices_5d())
+        doubled = flatten_points(Sscha(scale=2.0, **res).vertices_5d())
+        self.vertices = memoryview(buf).toreadonly()
+        self.topology: List[Tuple[str, int, int]] = []
+        start = 0
+        for name, part in figure.leaf_parts():
+            count = len(part.vertices_5d())
+            self.topology.append((name, start, count))
+            start += count
+        # Per-axis components, used to transform all vertices with one pass per axis.
+        scaled = array("d", (b - a for a, b in zip(buf, doubled)))
+        fixed = array("d", (2.0 * a - b for a, b in zip(buf, doubled)))
+        self._scaled = tuple(scaled[i::5] for i in range(5))
+        self._fixed = tuple(fixed[i::5] if any(fixed[i::5]) else None for i in range(5))
+
+    def __len__(self) -> int:
+        return len(self.vertices) // 5
+
+    def part_range(self, name: str) -> Tuple[int, int]:
+        """(first vertex, vertex count) of a leaf part."""
+        for part, start, count in self.topology:
+            if part == name:
+                return start, count
+        raise KeyError(name)
+
+    def transform_into(
+        self,
+        out: array,
+        offset: int,
+        origin: Sequence[float],
+        scale: float,
+        plane_w: float,
+        plane_v: float,
+    ) -> None:
+        """Write the vertices of one instance into out[offset : offset + 5 * len(self)]."""
+        n5 = 5 * len(self)
+        shift = (origin[0], origin[1], origin[2], plane_w, plane_v)
+        for i in range(5):
+            o, fixed = shift[i], self._fixed[i]
+            if fixed is None:
+                col = array("d", [o + scale * c for c in self._scaled[i]])
+            else:
+                col = array("d", [o + scale * c + f for c, f in zip(self._scaled[i], fixed)])
+            out[offset + i : offset + n5 : 5] = col
+
+
+_MESHES: Dict[Resolution, CanonicalMesh] = {}
+_MESHES_LOCK = threading.Lock()
+
+
+def canonical_mesh(neck_radial: int = 8, arm_radial: int = 6, leg_radial: int = 6) -> CanonicalMesh:
+    """Shared CanonicalMesh for the given resolutions (built once per process)."""
+    key = (neck_radial, arm_radial, leg_radial)
+    mesh = _MESHES.get(key)
+    if mesh is None:
+        # Lock so concurrent first calls share one mesh instead of racing to build it.
+        with _MESHES_LOCK:
+            mesh = _MESHES.get(key)
+            if mesh is None:
+                mesh = _MESHES[key] = CanonicalMesh(*key)
+    return mesh
+
+
+def clear_canonical_cache() -> None:
+    """Drop every shared CanonicalMesh; the next canonical_mesh call rebuilds it."""
+    with _MESHES_LOCK:
+        _MESHES.clear()
+
+
+class InstancedPopulation:
+    """
+    Population of figures sharing one CanonicalMesh. Each figure costs one
+    RECORD_SIZE-double record; vertices are materialized on demand.
+    """
+
+    def __init__(self, neck_radial: int = 8, arm_radial: int = 6, leg_radial: int = 6):
+        self.mesh = canonical_mesh(neck_radial, arm_radial, leg_radial)
+        self.records = array("d")
+        # Insertion index of every record once the population has been reordered.
+        self.order: array | None = None
+
+    def __len__(self) -> int:
+        return len(self.records) // RECORD_SIZE
+
+    def add(
+        self,
+        origin: Point5D | None = None,
+        scale: float = 1.0,
+        plane_w: float = 0.0,
+        plane_v: float = 0.0,
+    ) -> int:
+        """Append a figure record; returns its index."""
+        o = origin.as_tuple() if origin is not None else (0.0, 0.0, 0.0, 0.0, 0.0)
+        self.records.extend((*o, scale, plane_w, plane_v))
+        if self.order is not None:
+            self.order.append(len(self.order))
+        return len(self) - 1
+
+    def add_figure(self, figure: Sscha) -> int:
+        res = (figure.neck_radial, figure.arm_radial, figure.leg_radial)
+        if res != self.mesh.resolution:
+            raise ValueError(f"figure resolution {res} differs from mesh {self.mesh.resolution}")
+        if figure.proportions != PROPORTIONS:
+            raise ValueError("instanced figures must use the default proportions")
+        if figure.edited_parts():
+            raise ValueError("instanced figures cannot have edited parts")
+        return self.add(figure.origin, figure.scale, figure.plane_w, figure.plane_v)
+
+    def extend(self, figures: Sequence[Sscha]) -> None:
+        for figure in figures:
+            self.add_figure(figure)
+
+    def record(self, i: int) -> Tuple[Point5D, float, float, float]:
+        """(origin, scale, plane_w, plane_v) of figure i."""
+        r = self.records[i * RECORD_SIZE : (i + 1) * RECORD_SIZE]
+        return Point5D(*r[:5]), r[5], r[6], r[7]
+
+    def positions(self) -> array:
+        """Flat (x, y, z, plane_w, plane_v) per figure: where each figure sits in 5D."""
+        r = self.records
+        out = array("d", bytes(8 * 5 * len(self)))
+        for axis, field in enumerate((0, 1, 2, 6, 7)):
+            out[axis::5] = r[field::RECORD_SIZE]
+        return out
+
+    def sort_morton(self, bits: int = DEFAULT_BITS) -> array:
+        """
+        Reorder the records in place by Morton key of the figure positions, so
+        figures close in space are close in memory. Returns the permutation
+        (perm[i] = previous index of the figure now at i); `order` accumulates
+        the insertion index of every record across sorts.
+        """
+        perm = morton_order(self.positions(), bits)
+        permute_in_place(self.records, perm, RECORD_SIZE)
+        self.order = array("I", perm) if self.order is None else permute(self.order, perm, 1)
+        return perm
+
+    def insertion_index(self, i: int) -> int:
+        """Index figure i had when it was added (i itself if never reordered)."""
+        return i if self.order is None else self.order[i]
+
+    def vertices(self, i: int, precision: str = "float64") -> array | QuantizedBuffer:
+        """
+        Flat vertex buffer of figure i: an array('d') for float64, otherwise a
+        QuantizedBuffer ("float32", or "int16" on the figure's bounding box).
+        """
+        out = array("d", bytes(8 * len(self.mesh.vertices)))
+        self.write_vertices(i, out, 0)
+        return with_precision(out, precision)
+
+    def write_vertices(self, i: int, out: array, offset: int = 0) -> None:
+        """Materialize figure i into a caller-owned buffer starting at `offset`."""
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        r = self.records
+        base = i * RECORD_SIZE
+        self.mesh.transform_into(
+            out, offset, r[base : base + 3], r[base + 5], r[base + 6], r[base + 7]
+        )
+
+    def points(self, i: int) -> List[Point5D]:
+        """Vertices of figure i as Point5D, matching Sscha.vertices_5d()."""
+        return unflatten_points(self.vertices(i))
+
+    def iter_vertices(self, chunk: int = 1, precision: str = "float64") -> Iterator[array | QuantizedBuffer]:
+        """
+        Stream vertex buffers of `chunk` consecutive figures at a time (the last
+        chunk may be shorter). A fresh buffer is yielded per chunk; for reduced
+        precisions it is a QuantizedBuffer with one bounding box per figure.
+        """
+        n5 = len(self.mesh.vertices)
+        chunk = max(1, chunk)
+        for start in range(0, len(self), chunk):
+            stop = min(len(self), start + chunk)
+            out = array("d", bytes(8 * n5 * (stop - start)))
+            for k, i in enumerate(range(start, stop)):
+                self.write_vertices(i, out, k * n5)
+            yield with_precision(out, precision, [n5 // 5] * (stop - start))
+
+    def quantized(self, precision: str = "int16", chunk: int = 256) -> QuantizedBuffer:
+        """
+        Vertices of every figure in one reduced-precision buffer (int16: one
+        bounding box per figure), built chunk by chunk so peak float64 memory
+        stays at `chunk` figures.
+        """
+        out = QuantizedBuffer(precision)
+        per_figure = len(self.mesh)
+        for buf in self.iter_vertices(chunk):
+            out.extend(buf, [per_figure] * (len(buf) // (5 * per_figure)))
+        return out
+
+    def figure(self, i: int) -> Sscha:
+        """Full Sscha object for figure i."""
+        origin, scale, plane_w, plane_v = self.record(i)
+        neck, arm, leg = self.mesh.resolution
+        return Sscha(origin, scale, plane_w, plane_v, neck, arm, leg)
+
+    def memory_footprint(self) -> Footprint:
+        """Object overhead and vertex payload in bytes (see body.footprint)."""
+        return memory_footprint(self)
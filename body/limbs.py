@@ -4,9 +4,222 @@ Limbs: abstract 5D limb segment. Base for arms and legs.
 
 import math
 from abc import ABC, abstractmethod
-from typing import List, Tuple
+from array import array
+from typing import List, Sequence, Tuple
 
 from .geometry import Point5D, Vector5D
+from .footprint import Footprint, memory_footprint
+
+Vector5 = Tuple[float, float, float, float, float]
+Frame5D = Tuple[Vector5, Vector5, Vector5, Vector5, Vector5]
+
+# "ring": num_radial points on a circle in the (u, v) plane of the frame;
+# "sphere": num_radial points spread over the whole 4D cross-section (a 3-sphere).
+CROSS_SECTIONS = ("ring", "sphere")
+
+_BASIS: Tuple[Vector5, ...] = tuple(
+    tuple(1.0 if i == j else 0.0 for j in range(5)) for i in range(5)
+)
+
+
+def radial_frame(ax: float, ay: float, az: float) -> Tuple[Tuple[float, ...], Tuple[float, ...]]:
+    """
+    Unit radial directions (u, v) of a tube ring for an axis with x/y/z components:
+    u is perpendicular to the axis in the x/y plane (or y/z if the axis is along z),
+    v = axis x u.
+    """
+    ux, uy, uz = -ay, ax, 0.0
+    un = (ux * ux + uy * uy + uz * uz) ** 0.5
+    if un < 1e-10:
+        ux, uy, uz = 0.0, -az, ay
+        un = (ux * ux + uy * uy + uz * uz) ** 0.5
+    if un >= 1e-10:
+        inv = 1.0 / un
+        ux, uy, uz = ux * inv, uy * inv, uz * inv
+    vx, vy, vz = -az * uy, az * ux, ax * uy - ay * ux
+    vn = (vx * vx + vy * vy + vz * vz) ** 0.5
+    if vn >= 1e-10:
+        inv = 1.0 / vn
+        vx, vy, vz = vx * inv, vy * inv, vz * inv
+    else:
+        vx, vy, vz = 1.0, 0.0, 0.0
+    return (ux, uy, uz), (vx, vy, vz)
+
+
+def _complete(basis: List[Vector5], count: int) -> None:
+    """
+    Append `count` unit vectors orthogonal to the orthonormal `basis` (Gram–Schmidt
+    over the coordinate axes, taking the axis with the largest residual each time).
+    """
+    for _ in range(count):
+        best, best_n = None, 0.0
+        for e in _BASIS:
+            r = list(e)
+            for b in basis:
+                d = sum(r[i] * b[i] for i in range(5))
+                for i in range(5):
+                    r[i] -= d * b[i]
+            n = math.sqrt(sum(c * c for c in r))
+            if n > best_n:
+                best, best_n = r, n
+        basis.append(tuple(c / best_n for c in best))
+
+
+def frame_5d(axis: Sequence[float]) -> Frame5D:
+    """
+    Orthonormal 5D frame (t, u, v, p, q) of an axis: t is the unit axis, (u, v)
+    the ring plane of a tube and (p, q) complete its 4D cross-section. When the
+    axis has an x/y/z component, (u, v) are radial_frame's directions, so rings
+    of ordinary limbs are unchanged; an axis in w/v only takes its ring plane
+    from the x/y/z axes. ValueError for a zero axis.
+    """
+    ax, ay, az, aw, av = axis
+    n = math.sqrt(ax * ax + ay * ay + az * az + aw * aw + av * av)
+    if n < 1e-10:
+        raise ValueError("zero-length axis has no frame")
+    t = (ax / n, ay / n, az / n, aw / n, av / n)
+    u, v = radial_frame(ax, ay, az)
+    # radial_frame falls back to unnormalized or fixed vectors when x/y/z is (near) zero.
+    if abs(u[0] * u[0] + u[1] * u[1] + u[2] * u[2] - 1.0) < 1e-9 and abs(
+        v[0] * u[0] + v[1] * u[1] + v[2] * u[2]
+    ) < 1e-9:
+        # u, v are orthogonal to the axis and to its unit x/y/z direction d; p, q
+        # span the rest of the (d, w, v) space orthogonal to t = (s0 d, s1, s2).
+        s0 = math.sqrt(t[0] * t[0] + t[1] * t[1] + t[2] * t[2])
+        s1, s2 = t[3], t[4]
+        dx, dy, dz = t[0] / s0, t[1] / s0, t[2] / s0
+        m = math.sqrt(s0 * s0 + s1 * s1)
+        p0, p1 = -s1 / m, s0 / m
+        q0, q1, q2 = -s2 * p1, s2 * p0, s0 * p1 - s1 * p0
+        return (
+            t,
+            (u[0], u[1], u[2], 0.0, 0.0),
+            (v[0], v[1], v[2], 0.0, 0.0),
+            (p0 * dx, p0 * dy, p0 * dz, p1, 0.0),
+            (q0 * dx, q0 * dy, q0 * dz, q1, q2),
+        )
+    basis: List[Vector5] = [t]
+    _complete(basis, 4)
+    return tuple(basis)
+
+
+def frames_5d(axes: Sequence[float]) -> array:
+    """
+    Frames of many axes given as a flat 5-per-axis buffer: 25 floats per axis
+    (t, u, v, p, q rows). Zero-length axes get all-zero frames.
+    """
+    if len(axes) % 5:
+        raise ValueError("buffer length must be a multiple of 5")
+    out = array("d", bytes(8 * 5 * len(axes)))
+    for k in range(0, len(axes), 5):
+        a = axes[k : k + 5]
+        if math.sqrt(sum(c * c for c in a)) >= 1e-10:
+            out[5 * k : 5 * k + 25] = array("d", [c for row in frame_5d(a) for c in row])
+    return out
+
+
+def ring_offsets(
+    starts: Sequence[Sequence[float]],
+    ends: Sequence[Sequence[float]],
+    radii: Sequence[float],
+    num_radial: int,
+) -> List[List[array | None]]:
+    """
+    Ring offsets of K tubes given as five coordinate columns of their starts and
+    ends: out[j][axis] is the column of offsets of ring step j along `axis`, or
+    None where no tube's ring leaves its endpoints' coordinate (w and v, since
+    frame_5d keeps ring planes in x/y/z whenever it can). Zero-length tubes get
+    zero offsets.
+    """
+    axes = array("d", bytes(8 * 5 * len(radii)))
+    for axis in range(5):
+        axes[axis::5] = array("d", [q - p for p, q in zip(starts[axis], ends[axis])])
+    frames = frames_5d(axes)
+    u = [frames[5 + axis :: 25] for axis in range(5)]
+    v = [frames[10 + axis :: 25] for axis in range(5)]
+    ring_axes = 5 if any(map(any, u[3:] + v[3:])) else 3
+    out = []
+    for j in range(num_radial):
+        angle = 2 * math.pi * j / num_radial
+        cs, sn = math.cos(angle), math.sin(angle)
+        out.append(
+            [
+                array("d", [fu * (r * cs) + fv * (r * sn) for fu, fv, r in zip(fus, fvs, radii)])
+                if axis < ring_axes
+                else None
+                for axis, fus, fvs in zip(range(5), u, v)
+            ]
+        )
+    return out
+
+
+def sphere_directions(count: int) -> List[Tuple[float, float, float, float]]:
+    """
+    `count` unit 4D directions spread evenly over the 3-sphere: a low-discrepancy
+    sequence mapped through Hopf coordinates, which preserve uniform density.
+    """
+    g = 1.324717957244746  # plastic number: 2D golden-ratio sequence
+    a1, a2 = 1.0 / g, 1.0 / (g * g)
+    out = []
+    for i in range(count):
+        s1 = (i + 0.5) / count
+        r1, r2 = math.sqrt(1.0 - s1), math.sqrt(s1)
+        th1 = 2 * math.pi * ((0.5 + a1 * i) % 1.0)
+        th2 = 2 * math.pi * ((0.5 + a2 * i) % 1.0)
+        out.append((r1 * math.sin(th1), r1 * math.cos(th1), r2 * math.sin(th2), r2 * math.cos(th2)))
+    return out
+
+
+def check_cross_section(cross_section: str) -> None:
+    if cross_section not in CROSS_SECTIONS:
+        raise ValueError(f"cross_section must be one of {CROSS_SECTIONS}, got {cross_section!r}")
+
+
+def cross_section_offsets(
+    frame: Frame5D, radius: float, count: int, cross_section: str = "ring"
+) -> List[Vector5]:
+    """Offsets from the axis to the `count` cross-section vertices of a tube."""
+    _, u, v, p, q = frame
+    if cross_section == "ring":
+        out = []
+        for i in range(count):
+            angle = 2 * math.pi * i / count
+            r_u = radius * math.cos(angle)
+            r_v = radius * math.sin(angle)
+            out.append(tuple(u[k] * r_u + v[k] * r_v for k in range(5)))
+        return out
+    if cross_section == "sphere":
+        return [
+            tuple(radius * (a * u[k] + b * v[k] + c * p[k] + d * q[k]) for k in range(5))
+            for a, b, c, d in sphere_directions(count)
+        ]
+    check_cross_section(cross_section)
+    raise AssertionError(cross_section)
+
+
+def tube_vertices(
+    start: Point5D, end: Point5D, radius: float, num_radial: int, cross_section: str = "ring"
+) -> List[Point5D]:
+    """
+    start, end, then one (start, end) vertex pair per cross-section offset; just
+    the endpoints for a zero-length tube.
+    """
+    o, e = start, end
+    out: List[Point5D] = [o, e]
+    axis = (e.x - o.x, e.y - o.y, e.z - o.z, e.w - o.w, e.v - o.v)
+    if math.sqrt(sum(c * c for c in axis)) < 1e-10:
+        return out
+    offsets = cross_section_offsets(frame_5d(axis), radius, num_radial, cross_section)
+    # Offsets are built from scalars: no temporary Vector5D per ring vertex.
+    if any(dw or dv for _, _, _, dw, dv in offsets):
+        for dx, dy, dz, dw, dv in offsets:
+            out.append(Point5D(o.x + dx, o.y + dy, o.z + dz, o.w + dw, o.v + dv))
+            out.append(Point5D(e.x + dx, e.y + dy, e.z + dz, e.w + dw, e.v + dv))
+    else:
+        for dx, dy, dz, _, _ in offsets:
+            out.append(Point5D(o.x + dx, o.y + dy, o.z + dz, o.w, o.v))
+            out.append(Point5D(e.x + dx, e.y + dy, e.z + dz, e.w, e.v))
+    return out
 
 
 class LimbSegment(ABC):
@@ -33,56 +246,37 @@ class LimbSegment(ABC):
         """Geometric vertices of this limb in 5D."""
         ...
 
+    def memory_footprint(self) -> Footprint:
+        """Object overhead and vertex payload in bytes (see body.footprint)."""
+        return memory_footprint(self)
+
 
 class CylindricalLimb(LimbSegment):
     """
     Limb segment as a 5D cylinder: axis from origin to end, optional radial vertices.
     """
 
+    cross_section = "ring"
+
     def __init__(
         self,
         origin: Point5D,
         end: Point5D,
         radius: float = 0.12,
         num_radial: int = 6,
+        cross_section: str = "ring",
     ):
         super().__init__(origin, end)
+        check_cross_section(cross_section)
         self.radius = radius
         self.num_radial = max(2, num_radial)
+        if cross_section != "ring":
+            self.cross_section = cross_section
 
     def vertices_5d(self) -> List[Point5D]:
-        out: List[Point5D] = [self.origin, self.end]
-        axis = self.axis()
-        n = axis.norm()
-        if n < 1e-10:
-            return out
-        u = Vector5D(-axis.dy, axis.dx, 0, 0, 0)
-        un = u.norm()
-        if un < 1e-10:
-            u = Vector5D(0, -axis.dz, axis.dy, 0, 0)
-            un = u.norm()
-        if un >= 1e-10:
-            u = u.scale(1.0 / un)
-        v = Vector5D(
-            axis.dz * 0 - axis.dz * u.dy,
-            axis.dz * u.dx - axis.dx * 0,
-            axis.dx * u.dy - axis.dy * u.dx,
-            0,
-            0,
+        return tube_vertices(
+            self.origin, self.end, self.radius, self.num_radial, self.cross_section
         )
-        vn = v.norm()
-        if vn >= 1e-10:
-            v = v.scale(1.0 / vn)
-        else:
-            v = Vector5D(1, 0, 0, 0, 0)
-        for i in range(self.num_radial):
-            angle = 2 * math.pi * i / self.num_radial
-            r_u = self.radius * math.cos(angle)
-            r_v = self.radius * math.sin(angle)
-            offset = u.scale(r_u) + v.scale(r_v)
-            out.append(self.origin + offset)
-            out.append(self.end + offset)
-        return out
 
 
 class Leg(CylindricalLimb):
@@ -113,3 +307,7 @@ class Legs:
 
     def segments(self) -> Tuple[Leg, Leg]:
         return (self.left, self.right)
+
+    def memory_footprint(self) -> Footprint:
+        """Object overhead and vertex payload in bytes (see body.footprint)."""
+        return memory_footprint(self)
@@ -0,0 +1,144 @@
+"""
+Morph: interpolate vertex buffers between keyframe figures of equal topology.
+Keyframes are flattened once; per-segment deltas (linear) or Hermite
+tangents (spline) are precomputed, so each frame is a single pass that
+writes straight into a caller-owned buffer.
+"""
+
+import bisect
+from array import array
+from typing import Iterator, List, Sequence
+
+from .geometry import Point5D, flatten_points, unflatten_points
+from .quantize import QuantizedBuffer, quantize
+from .sscha import Sscha
+
+EASINGS = ("linear", "smooth", "spline")
+
+
+def _zeros(n: int) -> array:
+    return array("d", bytes(8 * n))
+
+
+class Morph:
+    """
+    Animation through K >= 2 keyframes (Sscha figures or flat 5-per-vertex
+    buffers) at increasing `times` (default: evenly spaced over [0, 1]).
+
+    Easing:
+      linear  straight interpolation between neighbouring keyframes
+      smooth  same path, eased in and out of every keyframe (smoothstep)
+      spline  Catmull-Rom through all keyframes (C1 across keyframes)
+
+    Times outside the keyframe range are clamped.
+    """
+
+    def __init__(
+        self,
+        keyframes: Sequence[Sscha | Sequence[float]],
+        times: Sequence[float] | None = None,
+        easing: str = "linear",
+    ):
+        if len(keyframes) < 2:
+            raise ValueError("a morph needs at least two keyframes")
+        if easing not in EASINGS:
+            raise ValueError(f"easing must be one of {EASINGS}")
+        self.keys: List[array] = [
+            flatten_points(k.vertices_5d()) if isinstance(k, Sscha) else array("d", k)
+            for k in keyframes
+        ]
+        size = len(self.keys[0])
+        if size % 5 or any(len(k) != size for k in self.keys):
+            raise ValueError("keyframes must share one topology (same vertex count)")
+        k = len(self.keys)
+        self.times = array("d", times if times is not None else [i / (k - 1) for i in range(k)])
+        if len(self.times) != k:
+            raise ValueError("need one time per keyframe")
+        if any(b <= a for a, b in zip(self.times, self.times[1:])):
+            raise ValueError("keyframe times must be strictly increasing")
+        self.easing = easing
+        self._deltas = [array("d", (y - x for x, y in zip(a, b))) for a, b in zip(self.keys, self.keys[1:])]
+        self._tangents = self._spline_tangents() if easing == "spline" else None
+
+    def _spline_tangents(self) -> List[array]:
+        """Per-keyframe dP/dt (finite differences; one-sided at the ends)."""
+        keys, t = self.keys, self.times
+        out = []
+        for i in range(len(keys)):
+            a, b = max(i - 1, 0), min(i + 1, len(keys) - 1)
+            inv = 1.0 / (t[b] - t[a])
+            out.append(array("d", ((y - x) * inv for x, y in zip(keys[a], keys[b]))))
+        return out
+
+    @property
+    def frame_size(self) -> int:
+        """Floats per frame (5 * vertex count)."""
+        return len(self.keys[0])
+
+    @property
+    def vertex_count(self) -> int:
+        return self.frame_size // 5
+
+    def frame_into(self, t: float, out: array, offset: int = 0) -> None:
+        """Write the frame at time t into out[offset : offset + frame_size]."""
+        times = self.times
+        t = min(max(t, times[0]), times[-1])
+        k = min(bisect.bisect_right(times, t) - 1, len(times) - 2)
+        t0, t1 = times[k], times[k + 1]
+        h = t1 - t0
+        u = (t - t0) / h
+        a = self.keys[k]
+        if self.easing == "spline":
+            u2, u3 = u * u, u * u * u
+            h00, h01 = 2 * u3 - 3 * u2 + 1, 3 * u2 - 2 * u3
+            h10, h11 = (u3 - 2 * u2 + u) * h, (u3 - u2) * h
+            b, ma, mb = self.keys[k + 1], self._tangents[k], self._tangents[k + 1]
+            for i in range(self.frame_size):
+                out[offset + i] = h00 * a[i] + h01 * b[i] + h10 * ma[i] + h11 * mb[i]
+            return
+        if self.easing == "smooth":
+            u = u * u * (3.0 - 2.0 * u)
+        d = self._deltas[k]
+        for i in range(self.frame_size):
+            out[offset + i] = a[i] + u * d[i]
+
+    def frame(self, t: float) -> array:
+        out = _zeros(self.frame_size)
+        self.frame_into(t, out)
+        return out
+
+    def points(self, t: float) -> List[Point5D]:
+        return unflatten_points(self.frame(t))
+
+    def frames(
+        self, ts: Sequence[float], out: array | None = None, precision: str = "float64"
+    ) -> array | QuantizedBuffer:
+        """
+        All frames as one flat (T, N, 5) row-major buffer. Pass a preallocated
+        `out` of at least T * frame_size floats to reuse memory across calls.
+        Other precisions return a QuantizedBuffer of the T frames (int16: one
+        bounding box per frame), with `out` as float64 scratch.
+        """
+        size = self.frame_size
+        if out is None:
+            out = _zeros(len(ts) * size)
+        elif len(out) < len(ts) * size:
+            raise ValueError("output buffer too small")
+        for j, t in enumerate(ts):
+            self.frame_into(t, out, j * size)
+        if precision == "float64":
+            return out
+        return quantize(out[: len(ts) * size], precision, [size // 5] * len(ts))
+
+    def iter_frames(self, ts: Sequence[float], out: array | None = None) -> Iterator[array]:
+        """
+        Stream frames one at a time through a single buffer: each yielded buffer is
+        overwritten by the next frame, so copy it if it must outlive the step.
+        """
+        if out is None:
+            out = _zeros(self.frame_size)
+        elif len(out) < self.frame_size:
+            raise ValueError("output buffer too small")
+        for t in ts:
+            self.frame_into(t, out)
+            yield out
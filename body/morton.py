@@ -0,0 +1,122 @@
+"""
+Morton: Z-order keys over 5D points for cache-friendly layouts.
+Points are quantized to a grid of 2**bits cells per axis over their bounding
+box and the five cell coordinates are bit-interleaved (x in the lowest bit),
+so points close in 5D mostly get close keys. Sorting by key gives a
+permutation: perm[i] is the original index of the item now at position i.
+"""
+
+from array import array
+from functools import lru_cache
+from typing import List, Sequence, Tuple
+
+# Bits per axis; 5 * 12 = 60-bit keys.
+DEFAULT_BITS = 12
+
+
+@lru_cache(maxsize=None)
+def _spread_table(bits: int) -> Tuple[int, ...]:
+    """Value -> value with its bits moved to every fifth position."""
+    table = []
+    for q in range(1 << bits):
+        s = 0
+        for b in range(bits):
+            if q >> b & 1:
+                s |= 1 << (5 * b)
+        table.append(s)
+    return tuple(table)
+
+
+def morton_key(cell: Sequence[int], bits: int = DEFAULT_BITS) -> int:
+    """Interleaved key of five non-negative cell coordinates below 2**bits."""
+    spread = _spread_table(bits)
+    return (
+        spread[cell[0]]
+        | spread[cell[1]] << 1
+        | spread[cell[2]] << 2
+        | spread[cell[3]] << 3
+        | spread[cell[4]] << 4
+    )
+
+
+def _bounds(buf: Sequence[float]) -> Tuple[Tuple[float, ...], Tuple[float, ...]]:
+    if not buf:
+        return (0.0,) * 5, (0.0,) * 5
+    return (
+        tuple(min(buf[i::5]) for i in range(5)),
+        tuple(max(buf[i::5]) for i in range(5)),
+    )
+
+
+def morton_keys(
+    buf: Sequence[float],
+    bits: int = DEFAULT_BITS,
+    bounds: Tuple[Sequence[float], Sequence[float]] | None = None,
+) -> List[int]:
+    """
+    Key of every point of a flat 5-per-point buffer, quantized over `bounds`
+    (default: the buffer's bounding box; points outside are clamped).
+    """
+    if len(buf) % 5:
+        raise ValueError("buffer length must be a multiple of 5")
+    lo, hi = _bounds(buf) if bounds is None else bounds
+    spread = _spread_table(bits)
+    top = (1 << bits) - 1
+    keys = [0] * (len(buf) // 5)
+    for axis in range(5):
+        span = hi[axis] - lo[axis]
+        if span <= 0.0:
+            continue
+        k = (top + 1) / span
+        o = lo[axis]
+        for j, x in enumerate(buf[axis::5]):
+            q = int((x - o) * k)
+            keys[j] |= spread[0 if q < 0 else top if q > top else q] << axis
+    return keys
+
+
+def morton_order(buf: Sequence[float], bits: int = DEFAULT_BITS) -> array:
+    """Permutation array('I') sorting the points of `buf` by Morton key (stable)."""
+    keys = morton_keys(buf, bits)
+    return array("I", sorted(range(len(keys)), key=keys.__getitem__))
+
+
+def invert_permutation(perm: Sequence[int]) -> array:
+    """inv with inv[perm[i]] = i: maps original indices to new positions."""
+    inv = array("I", bytes(4 * len(perm)))
+    for i, p in enumerate(perm):
+        inv[p] = i
+    return inv
+
+
+def permute(buf: Sequence[float], perm: Sequence[int], stride: int = 5) -> array:
+    """New array (typecode of buf, else "d") of the `stride`-sized items in `perm` order."""
+    if len(buf) != stride * len(perm):
+        raise ValueError(f"buffer holds {len(buf) // stride} items, permutation {len(perm)}")
+    typecode = buf.typecode if isinstance(buf, array) else "d"
+    out = array(typecode, bytes(array(typecode).itemsize * len(buf)))
+    for i in range(stride):
+        col = buf[i::stride]
+        out[i::stride] = array(typecode, [col[p] for p in perm])
+    return out
+
+
+def permute_in_place(buf: array, perm: Sequence[int], stride: int = 5) -> None:
+    """Reorder the `stride`-sized items of an array in place (same object)."""
+    buf[:] = permute(buf, perm, stride)
+
+
+def figure_positions(figures: Sequence) -> array:
+    """Flat (x, y, z, plane_w, plane_v) per figure: where each Sscha sits in 5D."""
+    out = array("d")
+    for fig in figures:
+        o = fig.origin
+        out.extend((o.x, o.y, o.z, fig.plane_w, fig.plane_v))
+    return out
+
+
+def morton_sort(buf: array, bits: int = DEFAULT_BITS) -> array:
+    """Sort the points of a flat vertex buffer in place; returns the permutation."""
+    perm = morton_order(buf, bits)
+    permute_in_place(buf, perm)
+    return perm
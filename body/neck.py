@@ -2,10 +2,11 @@
 Neck: 5D link between torso and head. A segment (line) or thin cylinder in 5D.
 """
 
-import math
 from typing import List
 
 from .geometry import Point5D, Vector5D
+from .limbs import check_cross_section, tube_vertices
+from .footprint import Footprint, memory_footprint
 
 
 class Neck:
@@ -14,17 +15,23 @@ class Neck:
     Geometrically a line segment plus optional radial vertices (cylinder).
     """
 
+    cross_section = "ring"
+
     def __init__(
         self,
         base: Point5D,
         head_end: Point5D,
         num_radial: int = 8,
         radius: float = 0.15,
+        cross_section: str = "ring",
     ):
+        check_cross_section(cross_section)
         self.base = base
         self.head_end = head_end
         self.num_radial = max(3, num_radial)
         self.radius = radius
+        if cross_section != "ring":
+            self.cross_section = cross_section
 
     def axis_vector(self) -> Vector5D:
         return self.head_end - self.base
@@ -38,43 +45,17 @@ class Neck:
 
     def vertices_5d(self) -> List[Point5D]:
         """
-        Vertices along the neck: base, head_end, and radial rings at both ends.
-        In 5D we project radius into the two principal perpendicular directions.
+        Vertices along the neck: base, head_end, and cross-section vertices at
+        both ends (a ring, or 3-sphere samples with cross_section="sphere").
         """
-        out: List[Point5D] = [self.base, self.head_end]
-        axis = self.axis_vector()
-        n = axis.norm()
-        if n < 1e-10:
-            return out
-        # Two orthonormal directions in 5D (simplified: use dx,dy,dz for radial)
-        u = Vector5D(-axis.dy, axis.dx, 0, 0, 0)
-        un = u.norm()
-        if un < 1e-10:
-            u = Vector5D(0, -axis.dz, axis.dy, 0, 0)
-            un = u.norm()
-        if un >= 1e-10:
-            u = u.scale(1.0 / un)
-        v = Vector5D(
-            axis.dy * 0 - axis.dz * u.dy,
-            axis.dz * u.dx - axis.dx * 0,
-            axis.dx * u.dy - axis.dy * u.dx,
-            0,
-            0,
+        return tube_vertices(
+            self.base, self.head_end, self.radius, self.num_radial, self.cross_section
         )
-        vn = v.norm()
-        if vn >= 1e-10:
-            v = v.scale(1.0 / vn)
-        else:
-            v = Vector5D(1, 0, 0, 0, 0)
-        for i in range(self.num_radial):
-            angle = 2 * math.pi * i / self.num_radial
-            r_u = self.radius * math.cos(angle)
-            r_v = self.radius * math.sin(angle)
-            offset = u.scale(r_u) + v.scale(r_v)
-            out.append(self.base + offset)
-            out.append(self.head_end + offset)
-        return out
 
     def segment_endpoints(self) -> List[Point5D]:
         """Just the two endpoints for line geometry."""
         return [self.base, self.head_end]
+
+    def memory_footprint(self) -> Footprint:
+        """Object overhead and vertex payload in bytes (see body.footprint)."""
+        return memory_footprint(self)
@@ -0,0 +1,253 @@
+"""
+Occupancy: sparse hashed 5D occupancy grid for repeated point lookups.
+Only occupied cells are stored, in a dict keyed by the cell's five integer
+coordinates packed into one 64-bit int (14 bits each for x, y, z and 11 for
+w, v, all biased so negative cells pack too). A cell is occupied when its
+center lies inside a box or tube part, as in body.voxelize; the face patch has
+no volume and is skipped.
+
+Each cell holds a reference count: the number of inserted owners (usually
+figures) that cover it, so owners can be inserted, moved and removed one at a
+time while others stay in place.
+
+Serialized layout (little-endian): OCCUPANCY_HEADER (magic, version, cell
+count, origin, cell size), then the sorted uint64 cell keys and the uint32
+counts. Owner records are not serialized; a loaded grid keeps its counts.
+"""
+
+import math
+import struct
+from array import array
+from typing import Dict, Hashable, Iterable, List, Sequence, Set, Tuple
+
+from .primitives import Box5D, Capsule5D, Primitive, figure_primitives
+
+OCCUPANCY_HEADER = struct.Struct("<4sBI10d")
+OCCUPANCY_MAGIC = b"SOCC"
+OCCUPANCY_VERSION = 1
+
+# Bits per axis of a packed cell key; cell coordinates lie in [-2**(b-1), 2**(b-1)).
+KEY_BITS = (14, 14, 14, 11, 11)
+_SHIFTS = tuple(sum(KEY_BITS[:i]) for i in range(5))
+_BIAS = tuple(1 << (b - 1) for b in KEY_BITS)
+
+
+def _figures(source) -> List:
+    if hasattr(source, "leaf_parts"):
+        return [source]
+    if hasattr(source, "records") and hasattr(source, "figure"):
+        return [source.figure(i) for i in range(len(source))]
+    return list(source)
+
+
+class OccupancyGrid:
+    """
+    Sparse occupancy over cells of `cell_size` (one value or five per-axis
+    sizes) anchored at `origin`. `counts` maps packed cell keys to the number of
+    owners covering the cell; `owners` maps owner keys to their sorted cells.
+    """
+
+    def __init__(
+        self, cell_size: float | Sequence[float] = 0.1, origin: Sequence[float] = (0.0,) * 5
+    ):
+        if isinstance(cell_size, (int, float)):
+            size = (float(cell_size),) * 5
+        else:
+            size = tuple(map(float, cell_size))
+        if len(size) != 5 or min(size) <= 0.0:
+            raise ValueError("cell_size must be positive (one value or five)")
+        if len(origin) != 5:
+            raise ValueError("origin must have five coordinates")
+        self.cell_size: Tuple[float, ...] = size
+        self.origin: Tuple[float, ...] = tuple(map(float, origin))
+        self.counts: Dict[int, int] = {}
+        self.owners: Dict[Hashable, array] = {}
+        self._inv = tuple(1.0 / s for s in size)
+
+    @classmethod
+    def from_figures(
+        cls, source, cell_size: float | Sequence[float] = 0.1, origin: Sequence[float] = (0.0,) * 5
+    ) -> "OccupancyGrid":
+        """
+        Grid of a Sscha, a sequence of figures or an InstancedPopulation, with
+        figure indices as owner keys.
+        """
+        grid = cls(cell_size, origin)
+        for i, fig in enumerate(_figures(source)):
+            grid.insert(i, fig)
+        return grid
+
+    def __len__(self) -> int:
+        """Number of occupied cells."""
+        return len(self.counts)
+
+    # --- Cells ---------------------------------------------------------------
+
+    def _axis_key(self, axis: int, c: int) -> int:
+        c += _BIAS[axis]
+        if not 0 <= c < 1 << KEY_BITS[axis]:
+            raise ValueError(f"cell out of range on axis {axis}; move the grid origin")
+        return c << _SHIFTS[axis]
+
+    def cell(self, point: Sequence[float]) -> Tuple[int, ...]:
+        o, inv = self.origin, self._inv
+        return tuple(math.floor((point[i] - o[i]) * inv[i]) for i in range(5))
+
+    def pack(self, cell: Sequence[int]) -> int:
+        """Packed key of integer cell coordinates."""
+        return sum(self._axis_key(i, cell[i]) for i in range(5))
+
+    def unpack(self, key: int) -> Tuple[int, ...]:
+        return tuple(((key >> _SHIFTS[i]) & ((1 << KEY_BITS[i]) - 1)) - _BIAS[i] for i in range(5))
+
+    def cell_center(self, cell: Sequence[int]) -> Tuple[float, ...]:
+        o, s = self.origin, self.cell_size
+        return tuple(o[i] + (cell[i] + 0.5) * s[i] for i in range(5))
+
+    def _range(self, axis: int, lo: float, hi: float) -> range:
+        """Cells on one axis whose centers lie in [lo, hi]."""
+        o, s = self.origin[axis], self.cell_size[axis]
+        return range(math.ceil((lo - o) / s - 0.5), math.floor((hi - o) / s - 0.5) + 1)
+
+    def primitive_cells(self, prim: Primitive) -> Set[int]:
+        """Packed keys of the cells whose centers lie inside `prim` (empty for patches)."""
+        if isinstance(prim, Box5D):
+            ks = [
+                [self._axis_key(i, c) for c in self._range(i, prim.lower[i], prim.upper[i])]
+                for i in range(5)
+            ]
+            return {
+                kx + ky + kz + kw + kv
+                for kv in ks[4]
+                for kw in ks[3]
+                for kz in ks[2]
+                for ky in ks[1]
+                for kx in ks[0]
+            }
+        if not isinstance(prim, Capsule5D):
+            return set()
+        # Exact x-interval of every (y, z, w, v) row via the capsule line span.
+        lo, hi = prim.bounds()
+        o, s = self.origin, self.cell_size
+        centers = [
+            [(self._axis_key(i, c), o[i] + (c + 0.5) * s[i]) for c in self._range(i, lo[i], hi[i])]
+            for i in range(1, 5)
+        ]
+        out: Set[int] = set()
+        x_dir = (1.0, 0.0, 0.0, 0.0, 0.0)
+        for kv, cv in centers[3]:
+            for kw, cw in centers[2]:
+                for kz, cz in centers[1]:
+                    for ky, cy in centers[0]:
+                        span = prim.line_span((0.0, cy, cz, cw, cv), x_dir)
+                        if span is None:
+                            continue
+                        row = ky + kz + kw + kv
+                        xs = self._range(0, span[0], span[1])
+                        out.update(row + self._axis_key(0, c) for c in xs)
+        return out
+
+    def figure_cells(self, figure) -> Set[int]:
+        cells: Set[int] = set()
+        for _, prim in figure_primitives(figure):
+            cells |= self.primitive_cells(prim)
+        return cells
+
+    # --- Owners --------------------------------------------------------------
+
+    def _add(self, cells: Iterable[int]) -> None:
+        counts = self.counts
+        for k in cells:
+            counts[k] = counts.get(k, 0) + 1
+
+    def _discard(self, cells: Iterable[int]) -> None:
+        counts = self.counts
+        for k in cells:
+            n = counts[k] - 1
+            if n:
+                counts[k] = n
+            else:
+                del counts[k]
+
+    def insert(self, key: Hashable, figure) -> None:
+        """Add the cells of `figure` under owner `key` (KeyError if already present)."""
+        if key in self.owners:
+            raise KeyError(f"owner {key!r} already inserted")
+        cells = self.figure_cells(figure)
+        self._add(cells)
+        self.owners[key] = array("Q", sorted(cells))
+
+    def remove(self, key: Hashable) -> None:
+        """Drop owner `key`; cells no other owner covers become free."""
+        self._discard(self.owners.pop(key))
+
+    def update(self, key: Hashable, figure) -> Tuple[int, int]:
+        """
+        Re-rasterize owner `key` from `figure` (e.g. after it moved), touching
+        only cells that changed. Returns (cells added, cells removed).
+        """
+        new = self.figure_cells(figure)
+        old = set(self.owners.get(key, ()))
+        self._add(new - old)
+        self._discard(old - new)
+        self.owners[key] = array("Q", sorted(new))
+        return len(new - old), len(old - new)
+
+    # --- Lookups -------------------------------------------------------------
+
+    def count(self, point: Sequence[float]) -> int:
+        """Number of owners covering the cell of `point`."""
+        return self.counts.get(self.pack(self.cell(point)), 0)
+
+    def __contains__(self, point: Sequence[float]) -> bool:
+        return self.count(point) > 0
+
+    def lookup(self, buf: Sequence[float]) -> array:
+        """array('I') of owner counts for a flat 5-per-point buffer."""
+        if len(buf) % 5:
+            raise ValueError("buffer length must be a multiple of 5")
+        o, inv, get = self.origin, self._inv, self.counts.get
+        floor = math.floor
+        out = array("I", bytes(4 * (len(buf) // 5)))
+        lim = tuple(1 << b for b in KEY_BITS)
+        for j in range(0, len(buf), 5):
+            key = 0
+            for i in range(5):
+                c = floor((buf[j + i] - o[i]) * inv[i]) + _BIAS[i]
+                if not 0 <= c < lim[i]:
+                    break
+                key += c << _SHIFTS[i]
+            else:
+                out[j // 5] = get(key, 0)
+        return out
+
+    def occupied(self, buf: Sequence[float]) -> array:
+        """array('B'): 1 where the point's cell is occupied."""
+        return array("B", (1 if n else 0 for n in self.lookup(buf)))
+
+    # --- Serialization -------------------------------------------------------
+
+    def to_bytes(self) -> bytes:
+        keys = sorted(self.counts)
+        n = len(keys)
+        return (
+            OCCUPANCY_HEADER.pack(
+                OCCUPANCY_MAGIC, OCCUPANCY_VERSION, n, *self.origin, *self.cell_size
+            )
+            + struct.pack(f"<{n}Q", *keys)
+            + struct.pack(f"<{n}I", *(self.counts[k] for k in keys))
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "OccupancyGrid":
+        magic, version, n, *vals = OCCUPANCY_HEADER.unpack_from(data, 0)
+        if magic != OCCUPANCY_MAGIC or version != OCCUPANCY_VERSION:
+            raise ValueError("not a packed occupancy grid")
+        start = OCCUPANCY_HEADER.size
+        if len(data) < start + 12 * n:
+            raise ValueError("truncated occupancy grid")
+        grid = cls(vals[5:], vals[:5])
+        keys = struct.unpack_from(f"<{n}Q", data, start)
+        counts = struct.unpack_from(f"<{n}I", data, start + 8 * n)
+        grid.counts = dict(zip(keys, counts))
+        return grid
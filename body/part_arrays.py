@@ -0,0 +1,201 @@
+"""
+Part arrays: struct-of-arrays storage for any number K of tubes or boxes.
+Endpoints, centers, radii and half-extents live in contiguous float64 arrays
+(5 per point, x-fastest), so multi-limbed bodies need no per-limb objects and
+vertex generation runs one column per vertex slot across all K parts.
+"""
+
+import math
+from array import array
+from typing import Iterable, List, Sequence, Tuple
+
+from .geometry import Point5D, unflatten_points
+from .limbs import CylindricalLimb, ring_offsets
+from .primitives import Box5D, Capsule5D
+from .quantize import QuantizedBuffer, with_precision
+from .footprint import Footprint, memory_footprint
+
+
+def _zeros(n: int) -> array:
+    return array("d", bytes(8 * n))
+
+
+class TubeArray:
+    """
+    K tubes (origin → end, radius) sharing one ring resolution. Vertex layout per
+    tube matches CylindricalLimb.vertices_5d: origin, end, then one (origin, end)
+    ring pair per radial step. A zero-length tube keeps its ring slots, collapsed
+    onto the endpoints, so every tube has exactly 2 + 2 * num_radial vertices.
+    """
+
+    def __init__(self, num_radial: int = 6):
+        self.num_radial = max(2, num_radial)
+        self.origins = array("d")
+        self.ends = array("d")
+        self.radii = array("d")
+
+    @classmethod
+    def from_limbs(cls, limbs: Iterable[CylindricalLimb]) -> "TubeArray":
+        limbs = list(limbs)
+        out = cls(limbs[0].num_radial if limbs else 6)
+        for limb in limbs:
+            if limb.num_radial != out.num_radial:
+                raise ValueError("all limbs must share one num_radial")
+            if limb.cross_section != "ring":
+                raise ValueError("TubeArray holds ring cross-sections only")
+            out.append(limb.origin, limb.end, limb.radius)
+        return out
+
+    def __len__(self) -> int:
+        return len(self.radii)
+
+    def append(self, origin: Point5D, end: Point5D, radius: float) -> int:
+        self.origins.extend(origin)
+        self.ends.extend(end)
+        self.radii.append(radius)
+        return len(self) - 1
+
+    def set_endpoints(self, k: int, origin: Point5D, end: Point5D) -> None:
+        self.origins[5 * k : 5 * k + 5] = array("d", origin)
+        self.ends[5 * k : 5 * k + 5] = array("d", end)
+
+    def origin(self, k: int) -> Point5D:
+        return Point5D(*self.origins[5 * k : 5 * k + 5])
+
+    def end(self, k: int) -> Point5D:
+        return Point5D(*self.ends[5 * k : 5 * k + 5])
+
+    def lengths(self) -> array:
+        """Axis length of every tube."""
+        o, e = self.origins, self.ends
+        d2 = [0.0] * len(self)
+        for axis in range(5):
+            d2 = [s + (b - a) ** 2 for s, a, b in zip(d2, o[axis::5], e[axis::5])]
+        return array("d", map(math.sqrt, d2))
+
+    @property
+    def vertices_per_tube(self) -> int:
+        return 2 + 2 * self.num_radial
+
+    def vertex_array(self, precision: str = "float64") -> array | QuantizedBuffer:
+        """
+        Flat buffer of all tube vertices (tube-major): an array('d') for float64,
+        otherwise a QuantizedBuffer (int16: one bounding box per tube).
+        """
+        k = len(self)
+        vt = self.vertices_per_tube
+        stride = 5 * vt
+        out = _zeros(stride * k)
+        if not k:
+            return with_precision(out, precision)
+        o_cols = [self.origins[a::5] for a in range(5)]
+        e_cols = [self.ends[a::5] for a in range(5)]
+        for axis in range(5):
+            out[axis::stride] = o_cols[axis]
+            out[5 + axis :: stride] = e_cols[axis]
+        for j, offsets in enumerate(ring_offsets(o_cols, e_cols, self.radii, self.num_radial)):
+            slot = 5 * (2 + 2 * j)
+            for axis, off in enumerate(offsets):
+                if off is None:
+                    out[slot + axis :: stride] = o_cols[axis]
+                    out[slot + 5 + axis :: stride] = e_cols[axis]
+                    continue
+                out[slot + axis :: stride] = array("d", [p + q for p, q in zip(o_cols[axis], off)])
+                out[slot + 5 + axis :: stride] = array(
+                    "d", [p + q for p, q in zip(e_cols[axis], off)]
+                )
+        return with_precision(out, precision, [vt] * k)
+
+    def vertices_5d(self) -> List[Point5D]:
+        return unflatten_points(self.vertex_array())
+
+    def segments(self) -> Tuple[CylindricalLimb, ...]:
+        """Materialize each tube as a CylindricalLimb (new objects per call)."""
+        return tuple(
+            CylindricalLimb(self.origin(k), self.end(k), self.radii[k], self.num_radial)
+            for k in range(len(self))
+        )
+
+    def primitives(self) -> List[Capsule5D]:
+        o, e = self.origins, self.ends
+        return [
+            Capsule5D(tuple(o[5 * k : 5 * k + 5]), tuple(e[5 * k : 5 * k + 5]), self.radii[k])
+            for k in range(len(self))
+        ]
+
+    def memory_footprint(self) -> Footprint:
+        """Object overhead and vertex payload in bytes (see body.footprint)."""
+        return memory_footprint(self)
+
+
+class BoxArray:
+    """K axis-aligned 5D boxes (center, half-extents), 32 vertices each in part order."""
+
+    def __init__(self):
+        self.centers = array("d")
+        self.half_extents = array("d")
+
+    @classmethod
+    def from_boxes(cls, boxes: Iterable) -> "BoxArray":
+        """From any parts with `center` and `half_extents` (Torso, Hips, Head, Hand, Foot)."""
+        out = cls()
+        for box in boxes:
+            out.append(box.center, box.half_extents)
+        return out
+
+    def __len__(self) -> int:
+        return len(self.centers) // 5
+
+    def append(self, center: Point5D, half_extents: Sequence[float]) -> int:
+        self.centers.extend(center)
+        self.half_extents.extend(half_extents)
+        return len(self) - 1
+
+    def center(self, k: int) -> Point5D:
+        return Point5D(*self.centers[5 * k : 5 * k + 5])
+
+    def vertex_array(self, precision: str = "float64") -> array | QuantizedBuffer:
+        """
+        Flat buffer of all box corners (box-major, corner order as the parts): an
+        array('d') for float64, otherwise a QuantizedBuffer (int16: one bounding
+        box per box).
+        """
+        k = len(self)
+        stride = 5 * 32
+        out = _zeros(stride * k)
+        if not k:
+            return with_precision(out, precision)
+        c_cols = [self.centers[a::5] for a in range(5)]
+        h_cols = [self.half_extents[a::5] for a in range(5)]
+        slot = 0
+        for ix in (-1, 1):
+            for iy in (-1, 1):
+                for iz in (-1, 1):
+                    for iw in (-1, 1):
+                        for iv in (-1, 1):
+                            for axis, sign in enumerate((ix, iy, iz, iw, iv)):
+                                col = [c + sign * h for c, h in zip(c_cols[axis], h_cols[axis])]
+                                out[slot + axis :: stride] = array("d", col)
+                            slot += 5
+        return with_precision(out, precision, [32] * k)
+
+    def vertices_5d(self) -> List[Point5D]:
+        return unflatten_points(self.vertex_array())
+
+    def segments(self) -> Tuple[Box5D, ...]:
+        """Each box as an exact Box5D primitive."""
+        return tuple(self.primitives())
+
+    def primitives(self) -> List[Box5D]:
+        c, h = self.centers, self.half_extents
+        return [
+            Box5D(
+                tuple(c[5 * k + a] - h[5 * k + a] for a in range(5)),
+                tuple(c[5 * k + a] + h[5 * k + a] for a in range(5)),
+            )
+            for k in range(len(self))
+        ]
+
+    def memory_footprint(self) -> Footprint:
+        """Object overhead and vertex payload in bytes (see body.footprint)."""
+        return memory_footprint(self)
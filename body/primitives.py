@@ -0,0 +1,243 @@
+"""
+Primitives: exact geometric volumes behind the Sscha body parts.
+Box parts become 5D axis-aligned boxes, limbs and neck become 5D capsules
+(segment + radius), the face becomes a bounded 2D patch.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from .geometry import Point5D, Vector5D
+from .torso import Torso
+from .hips import Hips
+from .head import Head
+from .hands import Hand
+from .feet import Foot
+from .neck import Neck
+from .face import Face
+from .limbs import CylindricalLimb
+
+Tuple5 = Tuple[float, float, float, float, float]
+
+_EPS = 1e-12
+
+
+def _sub(a: Sequence[float], b: Sequence[float]) -> Tuple5:
+    return (a[0] - b[0], a[1] - b[1], a[2] - b[2], a[3] - b[3], a[4] - b[4])
+
+
+def _dot(a: Sequence[float], b: Sequence[float]) -> float:
+    return a[0] * b[0] + a[1] * b[1] + a[2] * b[2] + a[3] * b[3] + a[4] * b[4]
+
+
+@dataclass(frozen=True)
+class Box5D:
+    """Axis-aligned 5D box given by its lower and upper corners."""
+
+    lower: Tuple5
+    upper: Tuple5
+
+    @classmethod
+    def from_center(cls, center: Point5D, half_extents: Sequence[float]) -> "Box5D":
+        c = center.as_tuple()
+        return cls(
+            tuple(c[i] - half_extents[i] for i in range(5)),
+            tuple(c[i] + half_extents[i] for i in range(5)),
+        )
+
+    def bounds(self) -> Tuple[Tuple5, Tuple5]:
+        return self.lower, self.upper
+
+    def contains(self, point: Sequence[float]) -> bool:
+        lo, hi = self.lower, self.upper
+        return all(lo[i] <= point[i] <= hi[i] for i in range(5))
+
+    def line_span(
+        self, origin: Sequence[float], direction: Sequence[float]
+    ) -> Optional[Tuple[float, float]]:
+        """
+        Parameter interval [t0, t1] where origin + t*direction lies inside the box
+        (slab method), or None if the line misses.
+        """
+        t0, t1 = -math.inf, math.inf
+        lo, hi = self.lower, self.upper
+        for i in range(5):
+            o, d = origin[i], direction[i]
+            if -_EPS < d < _EPS:
+                if o < lo[i] or o > hi[i]:
+                    return None
+                continue
+            ta = (lo[i] - o) / d
+            tb = (hi[i] - o) / d
+            if ta > tb:
+                ta, tb = tb, ta
+            if ta > t0:
+                t0 = ta
+            if tb < t1:
+                t1 = tb
+            if t0 > t1:
+                return None
+        return t0, t1
+
+    def normal_at(self, point: Sequence[float]) -> Vector5D:
+        """Outward unit normal of the face closest to `point` (relative to half-extent)."""
+        best, axis, sign = -math.inf, 0, 1.0
+        for i in range(5):
+            h = 0.5 * (self.upper[i] - self.lower[i])
+            if h <= 0:
+                continue
+            off = (point[i] - 0.5 * (self.upper[i] + self.lower[i])) / h
+            if abs(off) > best:
+                best, axis, sign = abs(off), i, (1.0 if off >= 0 else -1.0)
+        n = [0.0] * 5
+        n[axis] = sign
+        return Vector5D(*n)
+
+
+@dataclass(frozen=True)
+class Capsule5D:
+    """Set of 5D points within `radius` of the segment a→b (tube with rounded ends)."""
+
+    a: Tuple5
+    b: Tuple5
+    radius: float
+
+    def bounds(self) -> Tuple[Tuple5, Tuple5]:
+        r = self.radius
+        return (
+            tuple(min(self.a[i], self.b[i]) - r for i in range(5)),
+            tuple(max(self.a[i], self.b[i]) + r for i in range(5)),
+        )
+
+    def closest_param(self, point: Sequence[float]) -> float:
+        """Segment parameter in [0, 1] of the axis point closest to `point`."""
+        ba = _sub(self.b, self.a)
+        baba = _dot(ba, ba)
+        if baba < _EPS:
+            return 0.0
+        y = _dot(_sub(point, self.a), ba) / baba
+        return 0.0 if y < 0.0 else 1.0 if y > 1.0 else y
+
+    def axis_point(self, s: float) -> Tuple5:
+        a, b = self.a, self.b
+        return tuple(a[i] + s * (b[i] - a[i]) for i in range(5))
+
+    def contains(self, point: Sequence[float]) -> bool:
+        q = self.axis_point(self.closest_param(point))
+        d = _sub(point, q)
+        return _dot(d, d) <= self.radius * self.radius
+
+    def line_span(
+        self, origin: Sequence[float], direction: Sequence[float]
+    ) -> Optional[Tuple[float, float]]:
+        """
+        Parameter interval [t0, t1] where origin + t*direction lies inside the capsule,
+        or None. Collects the exact surface crossings of the cylinder body and both caps;
+        the capsule is convex so the extreme crossings bound the span.
+        """
+        a, b, r = self.a, self.b, self.radius
+        d = direction
+        ba = _sub(b, a)
+        oa = _sub(origin, a)
+        baba = _dot(ba, ba)
+        bard = _dot(ba, d)
+        baoa = _dot(ba, oa)
+        dd = _dot(d, d)
+        if dd < _EPS:
+            return None
+        ts: List[float] = []
+        if baba >= _EPS:
+            qa = baba * dd - bard * bard
+            if qa > _EPS * baba * dd:
+                qb = baba * _dot(d, oa) - baoa * bard
+                qc = baba * _dot(oa, oa) - baoa * baoa - r * r * baba
+                h = qb * qb - qa * qc
+                if h >= 0.0:
+                    sh = math.sqrt(h)
+                    for t in ((-qb - sh) / qa, (-qb + sh) / qa):
+                        y = baoa + t * bard
+                        if 0.0 <= y <= baba:
+                            ts.append(t)
+        for cap, below in ((a, True), (b, False)):
+            oc = _sub(origin, cap)
+            qb = _dot(d, oc)
+            h = qb * qb - dd * (_dot(oc, oc) - r * r)
+            if h < 0.0:
+                continue
+            sh = math.sqrt(h)
+            for t in ((-qb - sh) / dd, (-qb + sh) / dd):
+                y = baoa + t * bard
+                if baba < _EPS or (y <= 0.0 if below else y >= baba):
+                    ts.append(t)
+        if not ts:
+            return None
+        return min(ts), max(ts)
+
+    def normal_at(self, point: Sequence[float]) -> Vector5D:
+        """Outward unit normal at a surface point."""
+        q = self.axis_point(self.closest_param(point))
+        d = _sub(point, q)
+        n = math.sqrt(_dot(d, d))
+        if n < _EPS:
+            return Vector5D(0.0, 0.0, 0.0, 0.0, 0.0)
+        return Vector5D(*(c / n for c in d))
+
+
+@dataclass(frozen=True)
+class Patch5D:
+    """Bounded planar patch: center ± half_u * u ± half_t * t (u, t orthonormal)."""
+
+    center: Tuple5
+    u: Tuple5
+    t: Tuple5
+    half_u: float
+    half_t: float
+
+    def bounds(self) -> Tuple[Tuple5, Tuple5]:
+        ext = tuple(
+            abs(self.u[i]) * self.half_u + abs(self.t[i]) * self.half_t for i in range(5)
+        )
+        return (
+            tuple(self.center[i] - ext[i] for i in range(5)),
+            tuple(self.center[i] + ext[i] for i in range(5)),
+        )
+
+
+Primitive = Box5D | Capsule5D | Patch5D
+
+_BOX_PARTS = (Torso, Hips, Head, Hand, Foot)
+
+
+def part_primitive(part: object) -> Primitive:
+    """Exact primitive for a single body part (see `Sscha.leaf_parts`)."""
+    if isinstance(part, _BOX_PARTS):
+        return Box5D.from_center(part.center, part.half_extents)
+    if isinstance(part, CylindricalLimb):
+        return Capsule5D(part.origin.as_tuple(), part.end.as_tuple(), part.radius)
+    if isinstance(part, Neck):
+        return Capsule5D(part.base.as_tuple(), part.head_end.as_tuple(), part.radius)
+    if isinstance(part, Face):
+        plane = part.plane_5d()
+        return Patch5D(
+            part.center.as_tuple(),
+            plane.u.as_tuple(),
+            plane.t.as_tuple(),
+            part.width * 0.5,
+            part.height * 0.5,
+        )
+    raise TypeError(f"no primitive for part type {type(part).__name__}")
+
+
+def figure_primitives(figure) -> List[Tuple[str, Primitive]]:
+    """(part name, primitive) for every leaf part of a Sscha."""
+    return [(name, part_primitive(part)) for name, part in figure.leaf_parts()]
+
+
+def iter_population_primitives(
+    figures: Sequence,
+) -> Iterator[Tuple[int, str, Primitive]]:
+    """(figure index, part name, primitive) over a population of figures."""
+    for i, fig in enumerate(figures):
+        for name, prim in figure_primitives(fig):
+            yield i, name, prim
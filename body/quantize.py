@@ -0,0 +1,175 @@
+"""
+Quantize: reduced-precision storage for flat vertex buffers.
+
+  float64  array('d'), exact (8 bytes per coordinate)
+  float32  array('f'), |error| <= |x| * 2**-24 (4 bytes per coordinate)
+  int16    array('h') quantized to a bounding box per vertex group (a figure or
+           a part): x = offset + scale * q with q in [-32767, 32767], so
+           |error| <= scale / 2 = (upper - lower) / 131068 per axis
+           (2 bytes per coordinate plus 80 bytes per group)
+
+A QuantizedBuffer reads like a flat float sequence and dequantizes lazily, one
+coordinate or one vertex range at a time.
+"""
+
+import bisect
+from array import array
+from typing import List, Sequence, Tuple
+
+from .geometry import Point5D, flatten_points
+
+PRECISIONS = ("float64", "float32", "int16")
+_TYPECODES = {"float64": "d", "float32": "f", "int16": "h"}
+_QMAX = 32767
+
+
+class QuantizedBuffer:
+    """
+    Flat 5-per-vertex buffer at a chosen precision. For int16, vertices are split
+    into groups, each with its own per-axis offset and scale; `starts` holds the
+    first vertex of every group. Float precisions use one implicit group.
+    """
+
+    def __init__(self, precision: str = "int16"):
+        if precision not in PRECISIONS:
+            raise ValueError(f"precision must be one of {PRECISIONS}")
+        self.precision = precision
+        self.data = array(_TYPECODES[precision])
+        self.offsets = array("d")
+        self.scales = array("d")
+        self.starts = array("I")
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    @property
+    def vertex_count(self) -> int:
+        return len(self.data) // 5
+
+    @property
+    def nbytes(self) -> int:
+        return sum(a.itemsize * len(a) for a in (self.data, self.offsets, self.scales, self.starts))
+
+    def extend(self, buf: Sequence[float], groups: Sequence[int] | None = None) -> None:
+        """
+        Append a flat float buffer. `groups` lists the vertex counts of consecutive
+        bounding-box groups (default: the whole buffer is one group); ignored for
+        float precisions.
+        """
+        if len(buf) % 5:
+            raise ValueError("buffer length must be a multiple of 5")
+        if self.precision != "int16":
+            data = self.data
+            if not (isinstance(buf, array) and buf.typecode == data.typecode):
+                buf = array(data.typecode, buf)
+            data.extend(buf)
+            return
+        n = len(buf) // 5
+        groups = [n] if groups is None else groups
+        if sum(groups) != n:
+            raise ValueError("group sizes must add up to the vertex count")
+        start = 0
+        for size in groups:
+            if size:
+                self._extend_group(buf[5 * start : 5 * (start + size)])
+            start += size
+
+    def _extend_group(self, chunk: Sequence[float]) -> None:
+        self.starts.append(self.vertex_count)
+        q = [0] * len(chunk)
+        for axis in range(5):
+            col = chunk[axis::5]
+            lo, hi = min(col), max(col)
+            offset = 0.5 * (lo + hi)
+            scale = (hi - lo) / (2 * _QMAX)
+            self.offsets.append(offset)
+            self.scales.append(scale)
+            if scale > 0.0:
+                inv = 1.0 / scale
+                q[axis::5] = [max(-_QMAX, min(_QMAX, round((x - offset) * inv))) for x in col]
+        self.data.extend(q)
+
+    def _group(self, vertex: int) -> int:
+        return bisect.bisect_right(self.starts, vertex) - 1
+
+    def __getitem__(self, k):
+        if isinstance(k, slice):
+            start, stop, step = k.indices(len(self))
+            if step == 1 and start % 5 == 0 and stop % 5 == 0:
+                return self.dequantize(start // 5, stop // 5)
+            return array("d", (self[i] for i in range(start, stop, step)))
+        if self.precision != "int16":
+            return float(self.data[k])
+        if k < 0:
+            k += len(self)
+        g = 5 * self._group(k // 5) + k % 5
+        return self.offsets[g] + self.scales[g] * self.data[k]
+
+    def vertex(self, i: int) -> Point5D:
+        return Point5D(*self.dequantize(i, i + 1))
+
+    def dequantize(self, start: int = 0, stop: int | None = None) -> array:
+        """Float64 coordinates of vertices [start, stop)."""
+        stop = self.vertex_count if stop is None else stop
+        if self.precision != "int16":
+            return array("d", self.data[5 * start : 5 * stop])
+        out = array("d", bytes(8 * 5 * max(0, stop - start)))
+        g = self._group(start)
+        v = start
+        while v < stop:
+            end = self.starts[g + 1] if g + 1 < len(self.starts) else self.vertex_count
+            end = min(end, stop)
+            for axis in range(5):
+                o, s = self.offsets[5 * g + axis], self.scales[5 * g + axis]
+                out[5 * (v - start) + axis : 5 * (end - start) : 5] = array(
+                    "d", [o + s * q for q in self.data[5 * v + axis : 5 * end : 5]]
+                )
+            v = end
+            g += 1
+        return out
+
+    def to_array(self) -> array:
+        return self.dequantize()
+
+    def error_bound(self) -> Tuple[float, ...]:
+        """Per-axis bound on |original - dequantized| over the whole buffer."""
+        if self.precision == "float64":
+            return (0.0,) * 5
+        if self.precision == "float32":
+            return tuple(
+                max((abs(x) for x in self.data[a::5]), default=0.0) * 2.0**-24 for a in range(5)
+            )
+        return tuple(0.5 * max(self.scales[a::5], default=0.0) for a in range(5))
+
+
+def quantize(
+    buf: Sequence[float], precision: str = "int16", groups: Sequence[int] | None = None
+) -> QuantizedBuffer:
+    """Quantize a flat buffer; `groups` gives per-bounding-box vertex counts (int16)."""
+    out = QuantizedBuffer(precision)
+    out.extend(buf, groups)
+    return out
+
+
+def with_precision(
+    buf: array, precision: str = "float64", groups: Sequence[int] | None = None
+) -> array | QuantizedBuffer:
+    """
+    `buf` itself for float64, otherwise quantize(buf, precision, groups): the
+    `precision` argument of the buffer-producing APIs.
+    """
+    if precision == "float64":
+        return buf
+    return quantize(buf, precision, groups)
+
+
+def quantize_figure(figure, precision: str = "int16", per_part: bool = False) -> QuantizedBuffer:
+    """
+    A figure's vertices (Sscha.vertices_5d order) quantized to the figure's
+    bounding box, or to each leaf part's box with per_part=True (tighter bounds).
+    """
+    buf = flatten_points(figure.vertices_5d())
+    groups: List[int] | None = None
+    if per_part:
+        groups = [len(part.vertices_5d()) for _, part in figure.leaf_parts()]
+    return quantize(buf, precision, groups)
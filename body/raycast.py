@@ -0,0 +1,98 @@
+"""
+Raycast: batched 5D ray casting against populations of Sscha figures.
+Box parts and tube parts (limbs, neck) are intersected exactly; a BVH over
+all part bounds keeps large scenes cheap. The face patch is two-dimensional
+and a ray in 5D generically never meets it, so it is not a ray target.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+from .geometry import Point5D, Vector5D
+from .primitives import Patch5D, Primitive, iter_population_primitives
+from .bvh import BVH
+
+
+@dataclass(frozen=True)
+class RayHit:
+    """Nearest intersection of one ray: figure index, part name, distance, point, normal."""
+
+    figure: int
+    part: str
+    distance: float
+    point: Point5D
+    normal: Vector5D
+
+
+def _first_hit(
+    prim: Primitive, origin: Sequence[float], direction: Sequence[float]
+) -> Optional[float]:
+    """Smallest t >= 0 where the ray touches the primitive surface (exit if inside)."""
+    span = prim.line_span(origin, direction)
+    if span is None:
+        return None
+    t0, t1 = span
+    if t0 >= 0.0:
+        return t0
+    if t1 >= 0.0:
+        return t1
+    return None
+
+
+class RayCaster:
+    """
+    Casts batches of rays against a fixed list of figures.
+    Build once per scene; `cast` accepts parallel sequences of origins and directions
+    (Point5D/Vector5D or any 5-sequences). Directions are normalized, so distances
+    are Euclidean.
+    """
+
+    def __init__(self, figures: Sequence, leaf_size: int = 4):
+        self._items: List[Tuple[int, str, Primitive]] = [
+            item
+            for item in iter_population_primitives(figures)
+            if not isinstance(item[2], Patch5D)
+        ]
+        self._bvh = BVH([prim.bounds() for _, _, prim in self._items], leaf_size)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def cast_one(
+        self,
+        origin: Sequence[float],
+        direction: Sequence[float],
+        max_distance: float = math.inf,
+    ) -> Optional[RayHit]:
+        o = tuple(origin)
+        d = tuple(direction)
+        n = math.sqrt(sum(c * c for c in d))
+        if n < 1e-12:
+            raise ValueError("ray direction must be non-zero")
+        d = tuple(c / n for c in d)
+        items = self._items
+
+        def test(k: int) -> Optional[Tuple[float, int]]:
+            t = _first_hit(items[k][2], o, d)
+            return None if t is None else (t, k)
+
+        best = self._bvh.nearest_ray_hit(o, d, test, max_distance)
+        if best is None:
+            return None
+        t, k = best
+        fig, part, prim = items[k]
+        p = tuple(o[i] + t * d[i] for i in range(5))
+        return RayHit(fig, part, t, Point5D(*p), prim.normal_at(p))
+
+    def cast(
+        self,
+        origins: Sequence[Sequence[float]],
+        directions: Sequence[Sequence[float]],
+        max_distance: float = math.inf,
+    ) -> List[Optional[RayHit]]:
+        """Nearest hit (or None) for each ray, in input order."""
+        if len(origins) != len(directions):
+            raise ValueError("origins and directions must have the same length")
+        cast_one = self.cast_one
+        return [cast_one(o, d, max_distance) for o, d in zip(origins, directions)]
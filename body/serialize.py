@@ -0,0 +1,341 @@
+"""
+Serialize: compact parameter codecs for Sscha and its parts.
+A Sscha is fully determined by origin, scale, plane_w, plane_v and the tube
+resolutions, so only those are stored, plus (in dicts) any parts posed through
+`own_part`; binary records reject posed figures. Parts are stored by their defining
+parameters and restored directly, skipping constructor clamping and frame setup.
+"""
+
+import json
+import struct
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+from .geometry import Point5D, Vector5D, Plane5D
+from .torso import Torso
+from .hips import Hips
+from .head import Head
+from .hands import Hand, Hands
+from .feet import Foot, Feet
+from .neck import Neck
+from .face import Face
+from .limbs import CROSS_SECTIONS, CylindricalLimb, Leg, Legs
+from .arms import Arms
+from .sscha import Sscha, PROPORTIONS
+from .morton import figure_positions, morton_order
+
+# origin (5), scale, plane_w, plane_v, neck/arm/leg ring resolution
+SSCHA_RECORD = struct.Struct("<8d3H")
+POPULATION_HEADER = struct.Struct("<4sBI")
+POPULATION_MAGIC = b"SSCH"
+POPULATION_VERSION = 1
+LAYOUTS = ("input", "morton")
+
+_TAG = struct.Struct("<B")
+_BOX = struct.Struct("<10d")
+# start (5), end (5), radius, ring resolution, index into CROSS_SECTIONS
+_TUBE = struct.Struct("<11dHB")
+_FACE = struct.Struct("<22d")
+
+_BOX_TAGS = {Torso: 1, Hips: 2, Head: 3, Hand: 4, Foot: 5}
+_TUBE_TAGS = {Neck: 6, CylindricalLimb: 7, Leg: 8}
+_FACE_TAG = 9
+_PAIR_TAGS = {Arms: 10, Legs: 11, Hands: 12, Feet: 13}
+_TYPES = {
+    tag: cls
+    for table in (_BOX_TAGS, _TUBE_TAGS, _PAIR_TAGS)
+    for cls, tag in table.items()
+}
+_TYPES[_FACE_TAG] = Face
+_BY_NAME = {cls.__name__: cls for cls in _TYPES.values()}
+
+
+# --- Sscha ---------------------------------------------------------------
+
+
+def _proportion_overrides(s: Sscha) -> Dict[str, float]:
+    if s.proportions is PROPORTIONS:
+        return {}
+    return {k: v for k, v in s.proportions.items() if PROPORTIONS[k] != v}
+
+
+def edited_leaf_parts(s: Sscha) -> List[Tuple[str, object]]:
+    """(name, part) of the leaf parts edited through `own_part` (whole pairs included)."""
+    edited = s.edited_parts()
+    if not edited:
+        return []
+    return [
+        (name, part)
+        for name, part in s.leaf_parts()
+        if name in edited or name.partition(".")[0] in edited
+    ]
+
+
+def sscha_params(s: Sscha) -> Tuple:
+    """Flat parameter tuple in SSCHA_RECORD order (default proportions, unposed only)."""
+    if _proportion_overrides(s):
+        raise ValueError("binary records cannot hold custom proportions; use sscha_to_dict")
+    if s.edited_parts():
+        raise ValueError("binary records cannot hold edited parts; use sscha_to_dict")
+    return (
+        *s.origin.as_tuple(),
+        s.scale,
+        s.plane_w,
+        s.plane_v,
+        s.neck_radial,
+        s.arm_radial,
+        s.leg_radial,
+    )
+
+
+def sscha_from_params(params: Sequence) -> Sscha:
+    return Sscha(
+        origin=Point5D(*params[:5]),
+        scale=params[5],
+        plane_w=params[6],
+        plane_v=params[7],
+        neck_radial=params[8],
+        arm_radial=params[9],
+        leg_radial=params[10],
+    )
+
+
+def pack_sscha(s: Sscha) -> bytes:
+    """Fixed-size binary record (SSCHA_RECORD.size bytes)."""
+    return SSCHA_RECORD.pack(*sscha_params(s))
+
+
+def unpack_sscha(data: bytes) -> Sscha:
+    return sscha_from_params(SSCHA_RECORD.unpack(data))
+
+
+def sscha_to_dict(s: Sscha) -> Dict:
+    d = {
+        "origin": list(s.origin.as_tuple()),
+        "scale": s.scale,
+        "plane_w": s.plane_w,
+        "plane_v": s.plane_v,
+        "neck_radial": s.neck_radial,
+        "arm_radial": s.arm_radial,
+        "leg_radial": s.leg_radial,
+    }
+    overrides = _proportion_overrides(s)
+    if overrides:
+        d["proportions"] = overrides
+    # Parts edited through own_part (poses) are stored whole.
+    parts = {name: part_to_dict(part) for name, part in edited_leaf_parts(s)}
+    if parts:
+        d["parts"] = parts
+    return d
+
+
+def sscha_from_dict(d: Dict) -> Sscha:
+    s = Sscha(
+        origin=Point5D(*d["origin"]),
+        scale=d["scale"],
+        plane_w=d["plane_w"],
+        plane_v=d["plane_v"],
+        neck_radial=d.get("neck_radial", 8),
+        arm_radial=d.get("arm_radial", 6),
+        leg_radial=d.get("leg_radial", 6),
+        proportions=d.get("proportions"),
+    )
+    for name, part in d.get("parts", {}).items():
+        s.set_part(name, part_from_dict(part))
+    return s
+
+
+def sscha_to_json(s: Sscha) -> str:
+    return json.dumps(sscha_to_dict(s), separators=(",", ":"))
+
+
+def sscha_from_json(text: str) -> Sscha:
+    return sscha_from_dict(json.loads(text))
+
+
+# --- Populations -----------------------------------------------------------
+
+
+def pack_population(figures: Sequence[Sscha], layout: str = "input") -> bytes:
+    """
+    Header (magic, version, count) followed by one SSCHA_RECORD per figure, in
+    input order or, with layout="morton", in Morton order of the figure
+    positions (`morton_order(figure_positions(figures))` maps records back).
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"layout must be one of {LAYOUTS}, got {layout!r}")
+    if layout == "morton":
+        figures = [figures[i] for i in morton_order(figure_positions(figures))]
+    out = bytearray(POPULATION_HEADER.size + SSCHA_RECORD.size * len(figures))
+    POPULATION_HEADER.pack_into(out, 0, POPULATION_MAGIC, POPULATION_VERSION, len(figures))
+    offset = POPULATION_HEADER.size
+    pack_into = SSCHA_RECORD.pack_into
+    for s in figures:
+        pack_into(out, offset, *sscha_params(s))
+        offset += SSCHA_RECORD.size
+    return bytes(out)
+
+
+def iter_population_params(data: bytes) -> Iterator[Tuple]:
+    """Parameter tuples of a packed population, without building figures."""
+    magic, version, count = POPULATION_HEADER.unpack_from(data, 0)
+    if magic != POPULATION_MAGIC or version != POPULATION_VERSION:
+        raise ValueError("not a packed Sscha population")
+    start = POPULATION_HEADER.size
+    end = start + count * SSCHA_RECORD.size
+    if len(data) < end:
+        raise ValueError("truncated Sscha population")
+    return SSCHA_RECORD.iter_unpack(memoryview(data)[start:end])
+
+
+def unpack_population(data: bytes) -> List[Sscha]:
+    return [sscha_from_params(p) for p in iter_population_params(data)]
+
+
+# --- Parts ---------------------------------------------------------------
+
+
+def _restore_box(cls, vals: Sequence[float]):
+    part = cls.__new__(cls)
+    part.center = Point5D(*vals[:5])
+    part._h = tuple(vals[5:10])
+    return part
+
+
+def _restore_tube(cls, vals: Sequence[float], num_radial: int, cross_section: str = "ring"):
+    part = cls.__new__(cls)
+    start, end = Point5D(*vals[:5]), Point5D(*vals[5:10])
+    if cls is Neck:
+        part.base, part.head_end = start, end
+    else:
+        part.origin, part.end = start, end
+    part.radius = vals[10]
+    part.num_radial = num_radial
+    if cross_section != "ring":
+        part.cross_section = cross_section
+    return part
+
+
+def _tube_ends(part) -> Tuple[Point5D, Point5D]:
+    if isinstance(part, Neck):
+        return part.base, part.head_end
+    return part.origin, part.end
+
+
+def _restore_face(vals: Sequence[float]) -> Face:
+    face = Face.__new__(Face)
+    face.center = Point5D(*vals[:5])
+    face.normal = Vector5D(*vals[5:10])
+    face.width, face.height = vals[10], vals[11]
+    face._plane = Plane5D(face.center, Vector5D(*vals[12:17]), Vector5D(*vals[17:22]))
+    return face
+
+
+def _restore_pair(cls, left, right):
+    pair = cls.__new__(cls)
+    pair.left, pair.right = left, right
+    return pair
+
+
+def pack_part(part) -> bytes:
+    """Tagged binary form of any body part (single parts and left/right pairs)."""
+    cls = type(part)
+    if cls in _BOX_TAGS:
+        return _TAG.pack(_BOX_TAGS[cls]) + _BOX.pack(*part.center, *part.half_extents)
+    if cls in _TUBE_TAGS:
+        start, end = _tube_ends(part)
+        return _TAG.pack(_TUBE_TAGS[cls]) + _TUBE.pack(
+            *start, *end, part.radius, part.num_radial, CROSS_SECTIONS.index(part.cross_section)
+        )
+    if cls is Face:
+        plane = part.plane_5d()
+        return _TAG.pack(_FACE_TAG) + _FACE.pack(
+            *part.center, *part.normal, part.width, part.height, *plane.u, *plane.t
+        )
+    if cls in _PAIR_TAGS:
+        return _TAG.pack(_PAIR_TAGS[cls]) + pack_part(part.left) + pack_part(part.right)
+    raise TypeError(f"cannot serialize part type {cls.__name__}")
+
+
+def _unpack_part_from(data: bytes, offset: int):
+    (tag,) = _TAG.unpack_from(data, offset)
+    offset += _TAG.size
+    cls = _TYPES.get(tag)
+    if cls is None:
+        raise ValueError(f"unknown part tag {tag}")
+    if tag in _BOX_TAGS.values():
+        return _restore_box(cls, _BOX.unpack_from(data, offset)), offset + _BOX.size
+    if tag in _TUBE_TAGS.values():
+        vals = _TUBE.unpack_from(data, offset)
+        if vals[12] >= len(CROSS_SECTIONS):
+            raise ValueError(f"unknown cross-section code {vals[12]}")
+        part = _restore_tube(cls, vals[:11], vals[11], CROSS_SECTIONS[vals[12]])
+        return part, offset + _TUBE.size
+    if tag == _FACE_TAG:
+        return _restore_face(_FACE.unpack_from(data, offset)), offset + _FACE.size
+    left, offset = _unpack_part_from(data, offset)
+    right, offset = _unpack_part_from(data, offset)
+    return _restore_pair(cls, left, right), offset
+
+
+def unpack_part(data: bytes):
+    part, _ = _unpack_part_from(data, 0)
+    return part
+
+
+def part_to_dict(part) -> Dict:
+    """JSON-ready form of any body part."""
+    cls = type(part)
+    if cls in _BOX_TAGS:
+        return {
+            "type": cls.__name__,
+            "center": list(part.center),
+            "half_extents": list(part.half_extents),
+        }
+    if cls in _TUBE_TAGS:
+        start, end = _tube_ends(part)
+        return {
+            "type": cls.__name__,
+            "start": list(start),
+            "end": list(end),
+            "radius": part.radius,
+            "num_radial": part.num_radial,
+            **({"cross_section": part.cross_section} if part.cross_section != "ring" else {}),
+        }
+    if cls is Face:
+        plane = part.plane_5d()
+        return {
+            "type": "Face",
+            "center": list(part.center),
+            "normal": list(part.normal),
+            "width": part.width,
+            "height": part.height,
+            "u": list(plane.u),
+            "t": list(plane.t),
+        }
+    if cls in _PAIR_TAGS:
+        return {
+            "type": cls.__name__,
+            "left": part_to_dict(part.left),
+            "right": part_to_dict(part.right),
+        }
+    raise TypeError(f"cannot serialize part type {cls.__name__}")
+
+
+def part_from_dict(d: Dict):
+    cls = _BY_NAME.get(d.get("type"))
+    if cls is None:
+        raise ValueError(f"unknown part type {d.get('type')!r}")
+    if cls in _BOX_TAGS:
+        return _restore_box(cls, [*d["center"], *d["half_extents"]])
+    if cls in _TUBE_TAGS:
+        return _restore_tube(
+            cls,
+            [*d["start"], *d["end"], d["radius"]],
+            d["num_radial"],
+            d.get("cross_section", "ring"),
+        )
+    if cls is Face:
+        return _restore_face(
+            [*d["center"], *d["normal"], d["width"], d["height"], *d["u"], *d["t"]]
+        )
+    return _restore_pair(cls, part_from_dict(d["left"]), part_from_dict(d["right"]))
@@ -0,0 +1,275 @@
+"""
+Slicing: exact 3D cross-sections of Sscha figures at fixed (w, v).
+A 5D box slices to a 3D box when (w, v) lies inside its w/v extents; a 5D tube
+slices to a sweep of 3D balls whose radius shrinks with the w/v distance to
+the axis; the face patch slices to a rectangle, a segment or a point.
+"""
+
+import bisect
+import math
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .primitives import Box5D, Capsule5D, Patch5D, iter_population_primitives
+from .sscha import Sscha
+
+Tuple3 = Tuple[float, float, float]
+
+_EPS = 1e-12
+
+
+@dataclass(frozen=True)
+class BoxSlice:
+    """3D box present in a slice."""
+
+    figure: int
+    part: str
+    lower: Tuple3
+    upper: Tuple3
+
+    def contains(self, x: float, y: float, z: float) -> bool:
+        lo, hi = self.lower, self.upper
+        return lo[0] <= x <= hi[0] and lo[1] <= y <= hi[1] and lo[2] <= z <= hi[2]
+
+
+@dataclass(frozen=True)
+class TubeSlice:
+    """
+    Cross-section of a 5D tube: union over s in [s0, s1] of 3D balls centered on
+    the axis point at s with radius sqrt(r^2 - d_wv(s)^2), where d_wv(s) is the
+    (w, v) distance from the slice to the axis. Constant radius (a plain 3D
+    capsule) when the tube axis has no w/v extent.
+    """
+
+    figure: int
+    part: str
+    capsule: Capsule5D
+    w: float
+    v: float
+    s0: float
+    s1: float
+
+    def axis_point(self, s: float) -> Tuple3:
+        p = self.capsule.axis_point(s)
+        return (p[0], p[1], p[2])
+
+    @property
+    def start(self) -> Tuple3:
+        return self.axis_point(self.s0)
+
+    @property
+    def end(self) -> Tuple3:
+        return self.axis_point(self.s1)
+
+    def radius_at(self, s: float) -> float:
+        p = self.capsule.axis_point(s)
+        d2 = (self.w - p[3]) ** 2 + (self.v - p[4]) ** 2
+        r2 = self.capsule.radius ** 2 - d2
+        return math.sqrt(r2) if r2 > 0.0 else 0.0
+
+    @property
+    def is_capsule(self) -> bool:
+        a, b = self.capsule.a, self.capsule.b
+        return abs(a[3] - b[3]) < _EPS and abs(a[4] - b[4]) < _EPS
+
+    def max_radius(self) -> float:
+        """Largest ball radius in the section (at the axis point closest in w/v)."""
+        a, b = self.capsule.a, self.capsule.b
+        ew, ev = b[3] - a[3], b[4] - a[4]
+        ee = ew * ew + ev * ev
+        s = self.s0
+        if ee >= _EPS:
+            s = ((self.w - a[3]) * ew + (self.v - a[4]) * ev) / ee
+            s = min(self.s1, max(self.s0, s))
+        return self.radius_at(s)
+
+    def contains(self, x: float, y: float, z: float) -> bool:
+        return self.capsule.contains((x, y, z, self.w, self.v))
+
+    def bounds(self) -> Tuple[Tuple3, Tuple3]:
+        r = self.max_radius()
+        p, q = self.start, self.end
+        return (
+            tuple(min(p[i], q[i]) - r for i in range(3)),
+            tuple(max(p[i], q[i]) + r for i in range(3)),
+        )
+
+
+@dataclass(frozen=True)
+class PatchSlice:
+    """
+    Face patch in a slice: 4 corners (whole rectangle), 2 (segment) or 1 (point).
+    """
+
+    figure: int
+    part: str
+    corners: Tuple[Tuple3, ...]
+
+
+@dataclass
+class CrossSection:
+    """All primitives of the figures present at one (w, v)."""
+
+    w: float
+    v: float
+    boxes: List[BoxSlice] = field(default_factory=list)
+    tubes: List[TubeSlice] = field(default_factory=list)
+    patches: List[PatchSlice] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.boxes) + len(self.tubes) + len(self.patches)
+
+    def parts(self) -> List[Tuple[int, str]]:
+        return [(p.figure, p.part) for p in (*self.boxes, *self.tubes, *self.patches)]
+
+    def contains(self, x: float, y: float, z: float) -> bool:
+        """True when (x, y, z) lies inside a box or tube of the section."""
+        return any(b.contains(x, y, z) for b in self.boxes) or any(
+            t.contains(x, y, z) for t in self.tubes
+        )
+
+
+def _tube_interval(cap: Capsule5D, w: float, v: float) -> Optional[Tuple[float, float]]:
+    """Axis parameters in [0, 1] whose (w, v) distance to the slice is at most the radius."""
+    a, b, r = cap.a, cap.b, cap.radius
+    cw, cv = w - a[3], v - a[4]
+    ew, ev = b[3] - a[3], b[4] - a[4]
+    ee = ew * ew + ev * ev
+    cc = cw * cw + cv * cv
+    if ee < _EPS:
+        return (0.0, 1.0) if cc <= r * r else None
+    ce = cw * ew + cv * ev
+    h = ce * ce - ee * (cc - r * r)
+    if h < 0.0:
+        return None
+    sh = math.sqrt(h)
+    s0 = max(0.0, (ce - sh) / ee)
+    s1 = min(1.0, (ce + sh) / ee)
+    return (s0, s1) if s0 <= s1 else None
+
+
+def _patch_corners(p: Patch5D, w: float, v: float, tol: float) -> Tuple[Tuple3, ...]:
+    """Solve center + s*u + r*t = (.., w, v) for |s| <= half_u, |r| <= half_t."""
+    c, u, t = p.center, p.u, p.t
+    hu, ht = p.half_u, p.half_t
+
+    def at(s: float, r: float) -> Tuple3:
+        return tuple(c[i] + s * u[i] + r * t[i] for i in range(3))
+
+    rw, rv = w - c[3], v - c[4]
+    m00, m01, m10, m11 = u[3], t[3], u[4], t[4]
+    det = m00 * m11 - m01 * m10
+    if abs(det) > _EPS:
+        s = (rw * m11 - m01 * rv) / det
+        r = (m00 * rv - m10 * rw) / det
+        if abs(s) <= hu + tol and abs(r) <= ht + tol:
+            return (at(s, r),)
+        return ()
+    rows = [(m00, m01, rw), (m10, m11, rv)]
+    rows = [row for row in rows if abs(row[0]) > _EPS or abs(row[1]) > _EPS]
+    if not rows:
+        if abs(rw) <= tol and abs(rv) <= tol:
+            return (at(-hu, -ht), at(hu, -ht), at(hu, ht), at(-hu, ht))
+        return ()
+    # Rank 1: both rows describe one line a*s + b*r = k; clip it to the rectangle.
+    a_, b_, k = max(rows, key=lambda row: row[0] * row[0] + row[1] * row[1])
+    nn = a_ * a_ + b_ * b_
+    for a2, b2, k2 in rows:
+        if abs(k2 - (a2 * a_ + b2 * b_) / nn * k) > tol:
+            return ()
+    s0, r0 = a_ * k / nn, b_ * k / nn
+    ds, dr = -b_, a_
+    lo, hi = -math.inf, math.inf
+    for p, d, h in ((s0, ds, hu), (r0, dr, ht)):
+        if abs(d) < _EPS:
+            if abs(p) > h + tol:
+                return ()
+            continue
+        la, lb = (-h - p) / d, (h - p) / d
+        lo, hi = max(lo, min(la, lb)), min(hi, max(la, lb))
+    if lo > hi:
+        return ()
+    return (at(s0 + lo * ds, r0 + lo * dr), at(s0 + hi * ds, r0 + hi * dr))
+
+
+class SliceEngine:
+    """
+    Precomputes the w/v interval of every part of a population once, then answers
+    `slice_at(w, v)` via a sorted interval index and `sweep(ws, vs)` via a single
+    sweep over w that keeps the set of parts active at the current w.
+    """
+
+    def __init__(self, figures: Sscha | Sequence[Sscha], tol: float = 1e-9):
+        if isinstance(figures, Sscha):
+            figures = [figures]
+        self.tol = tol
+        self._items = list(iter_population_primitives(figures))
+        n = len(self._items)
+        self._w_lo: List[float] = [0.0] * n
+        self._w_hi: List[float] = [0.0] * n
+        self._v_lo: List[float] = [0.0] * n
+        self._v_hi: List[float] = [0.0] * n
+        for k, (_, _, prim) in enumerate(self._items):
+            lo, hi = prim.bounds()
+            self._w_lo[k], self._w_hi[k] = lo[3] - tol, hi[3] + tol
+            self._v_lo[k], self._v_hi[k] = lo[4] - tol, hi[4] + tol
+        self._by_w_lo = sorted(range(n), key=self._w_lo.__getitem__)
+        self._sorted_w_lo = [self._w_lo[k] for k in self._by_w_lo]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def intervals(self) -> List[Tuple[int, str, Tuple[float, float], Tuple[float, float]]]:
+        """(figure, part, (w_lo, w_hi), (v_lo, v_hi)) for every part, tolerance included."""
+        return [
+            (fig, name, (self._w_lo[k], self._w_hi[k]), (self._v_lo[k], self._v_hi[k]))
+            for k, (fig, name, _) in enumerate(self._items)
+        ]
+
+    def _section(self, w: float, v: float, candidates: Sequence[int]) -> CrossSection:
+        out = CrossSection(w, v)
+        for k in sorted(candidates):
+            if not (self._v_lo[k] <= v <= self._v_hi[k]):
+                continue
+            fig, name, prim = self._items[k]
+            if isinstance(prim, Box5D):
+                out.boxes.append(BoxSlice(fig, name, prim.lower[:3], prim.upper[:3]))
+            elif isinstance(prim, Capsule5D):
+                span = _tube_interval(prim, w, v)
+                if span is not None:
+                    out.tubes.append(TubeSlice(fig, name, prim, w, v, span[0], span[1]))
+            else:
+                corners = _patch_corners(prim, w, v, self.tol)
+                if corners:
+                    out.patches.append(PatchSlice(fig, name, corners))
+        return out
+
+    def slice_at(self, w: float, v: float) -> CrossSection:
+        """Exact 3D primitives present at (w, v)."""
+        end = bisect.bisect_right(self._sorted_w_lo, w)
+        candidates = [k for k in self._by_w_lo[:end] if self._w_hi[k] >= w]
+        return self._section(w, v, candidates)
+
+    def sweep(self, ws: Sequence[float], vs: Sequence[float]) -> List[CrossSection]:
+        """
+        Cross-sections at many (w, v) positions, returned in input order.
+        Queries are visited in increasing w; parts enter the active set when
+        w passes their w_lo and are evicted lazily once w exceeds their w_hi.
+        """
+        if len(ws) != len(vs):
+            raise ValueError("ws and vs must have the same length")
+        order = sorted(range(len(ws)), key=ws.__getitem__)
+        results: List[Optional[CrossSection]] = [None] * len(ws)
+        active: Dict[int, None] = {}
+        nxt = 0
+        n = len(self._by_w_lo)
+        for q in order:
+            w = ws[q]
+            while nxt < n and self._sorted_w_lo[nxt] <= w:
+                active[self._by_w_lo[nxt]] = None
+                nxt += 1
+            expired = [k for k in active if self._w_hi[k] < w]
+            for k in expired:
+                del active[k]
+            results[q] = self._section(w, vs[q], list(active))
+        return results
@@ -0,0 +1,140 @@
+"""
+Snapshot: immutable copies of a Sscha and its parts, safe to share between threads.
+Snapshots hold only tuples, frozen dataclasses and numbers, so derived data
+can be computed once and read concurrently without locks. `generate` builds
+figures on a thread pool, each task from its own parameters, and returns
+snapshots in input order.
+"""
+
+from array import array
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Mapping, Sequence, Tuple
+
+from .geometry import Point5D
+from .primitives import Primitive, part_primitive
+from .serialize import edited_leaf_parts, pack_part, unpack_part
+from .sscha import Sscha, PROPORTIONS
+
+
+@dataclass(frozen=True)
+class PartSnapshot:
+    """One leaf part: name, part class name, vertices and exact primitive."""
+
+    name: str
+    kind: str
+    vertices: Tuple[Point5D, ...]
+    primitive: Primitive
+
+
+@dataclass(frozen=True)
+class SschaSnapshot:
+    """
+    Frozen Sscha: construction parameters (proportions as sorted overrides),
+    one PartSnapshot per leaf part, in `Sscha.leaf_parts` order, and the packed
+    records (see body.serialize.pack_part) of parts edited through `own_part`.
+    """
+
+    origin: Point5D
+    scale: float
+    plane_w: float
+    plane_v: float
+    neck_radial: int
+    arm_radial: int
+    leg_radial: int
+    proportions: Tuple[Tuple[str, float], ...]
+    parts: Tuple[PartSnapshot, ...]
+    edits: Tuple[Tuple[str, bytes], ...] = ()
+
+    @classmethod
+    def of(cls, figure: Sscha) -> "SschaSnapshot":
+        overrides = ()
+        if figure.proportions is not PROPORTIONS:
+            overrides = tuple(
+                sorted((k, v) for k, v in figure.proportions.items() if PROPORTIONS[k] != v)
+            )
+        return cls(
+            figure.origin,
+            figure.scale,
+            figure.plane_w,
+            figure.plane_v,
+            figure.neck_radial,
+            figure.arm_radial,
+            figure.leg_radial,
+            overrides,
+            tuple(
+                PartSnapshot(name, type(part).__name__, tuple(part.vertices_5d()), part_primitive(part))
+                for name, part in figure.leaf_parts()
+            ),
+            tuple((name, pack_part(part)) for name, part in edited_leaf_parts(figure)),
+        )
+
+    def part(self, name: str) -> PartSnapshot:
+        for p in self.parts:
+            if p.name == name:
+                return p
+        raise KeyError(name)
+
+    def vertices_5d(self) -> List[Point5D]:
+        """Same vertices and order as Sscha.vertices_5d()."""
+        return [v for p in self.parts for v in p.vertices]
+
+    def vertex_array(self) -> array:
+        """New flat float64 buffer owned by the caller."""
+        out = array("d")
+        for p in self.parts:
+            for v in p.vertices:
+                out.extend(v)
+        return out
+
+    def thaw(self) -> Sscha:
+        """A new mutable Sscha with the same parameters and edited parts."""
+        figure = Sscha(
+            self.origin,
+            self.scale,
+            self.plane_w,
+            self.plane_v,
+            self.neck_radial,
+            self.arm_radial,
+            self.leg_radial,
+            dict(self.proportions) or None,
+        )
+        for name, data in self.edits:
+            figure.set_part(name, unpack_part(data))
+        return figure
+
+
+def snapshot(figure: Sscha) -> SschaSnapshot:
+    return SschaSnapshot.of(figure)
+
+
+def _build(params: Mapping | Sequence) -> SschaSnapshot:
+    # Each task owns its Sscha; nothing mutable escapes the worker.
+    figure = Sscha(**params) if isinstance(params, Mapping) else Sscha(*params)
+    return SschaSnapshot.of(figure)
+
+
+def iter_generate(
+    params: Iterable[Mapping | Sequence],
+    max_workers: int | None = None,
+    executor: Executor | None = None,
+    chunksize: int = 1,
+) -> Iterator[SschaSnapshot]:
+    """
+    Snapshots of Sscha(**p) (mappings) or Sscha(*p) (sequences) for every p, in
+    input order regardless of completion order. Uses `executor` if given,
+    otherwise a private ThreadPoolExecutor with `max_workers` threads.
+    """
+    if executor is not None:
+        yield from executor.map(_build, params, chunksize=chunksize)
+        return
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        yield from pool.map(_build, params, chunksize=chunksize)
+
+
+def generate(
+    params: Iterable[Mapping | Sequence],
+    max_workers: int | None = None,
+    executor: Executor | None = None,
+) -> List[SschaSnapshot]:
+    return list(iter_generate(params, max_workers, executor))
@@ -3,7 +3,8 @@ Sscha: Green Humanoid Reptile (GHR) as a 5D geometric construct.
 Composes all body parts on a 5D plane from an origin and scale.
 """
 
-from typing import List, Iterator
+import copy
+from typing import Dict, FrozenSet, List, Iterator, Mapping, Tuple
 
 from .geometry import Point5D, Vector5D, Plane5D, origin_5d
 from .torso import Torso
@@ -15,6 +16,8 @@ from .limbs import Legs
 from .arms import Arms
 from .hands import Hands
 from .feet import Feet
+from .weld import weld_points
+from .footprint import Footprint, memory_footprint
 
 
 # Default axes in 5D: +y = up, +z = forward, +x = right; w,v = extended dimensions
@@ -22,6 +25,115 @@ UP = Vector5D(0, 1, 0, 0, 0)
 FORWARD = Vector5D(0, 0, 1, 0, 0)
 RIGHT = Vector5D(1, 0, 0, 0, 0)
 
+# Body proportions in units of `scale` (half-extents, offsets along UP/RIGHT/FORWARD, radii).
+PROPORTIONS: Dict[str, float] = {
+    "torso_half_x": 0.5,
+    "torso_half_y": 0.6,
+    "torso_half_z": 0.3,
+    "torso_half_w": 0.2,
+    "torso_half_v": 0.2,
+    "hips_drop": 0.9,
+    "hips_half_x": 0.4,
+    "hips_half_y": 0.25,
+    "hips_half_z": 0.25,
+    "hips_half_w": 0.15,
+    "hips_half_v": 0.15,
+    "neck_base": 0.6,
+    "neck_top": 1.2,
+    "neck_radius": 0.12,
+    "head_height": 1.5,
+    "head_half_x": 0.2,
+    "head_half_y": 0.2,
+    "head_half_z": 0.22,
+    "head_half_w": 0.1,
+    "head_half_v": 0.1,
+    "face_offset": 0.22,
+    "face_width": 0.35,
+    "face_height": 0.4,
+    "shoulder_height": 0.4,
+    "shoulder_offset": 0.5,
+    "arm_reach": 0.7,
+    "arm_drop": 0.2,
+    "arm_radius": 0.08,
+    "hip_anchor_offset": 0.35,
+    "leg_drop": 1.0,
+    "foot_offset": 0.2,
+    "leg_radius": 0.1,
+}
+
+# Part attributes of Sscha; the pairs hold `left` and `right` leaf parts.
+PART_NAMES = ("torso", "hips", "neck", "head", "face", "legs", "arms", "hands", "feet")
+PAIR_NAMES = ("legs", "arms", "hands", "feet")
+_SHARABLE = frozenset(PART_NAMES) | {f"{p}.{s}" for p in PAIR_NAMES for s in ("left", "right")}
+
+# Attachment points: each is its parent anchor (None: the torso center) moved by
+# (direction, proportion, sign) terms, each sign * proportion * scale along direction,
+# in order. Parents come before their children.
+ANCHORS: Dict[str, Tuple[str | None, Tuple[Tuple[Vector5D, str, float], ...]]] = {
+    "torso": (None, ()),
+    "hips": (None, ((UP, "hips_drop", -1.0),)),
+    "neck_base": (None, ((UP, "neck_base", 1.0),)),
+    "neck_top": (None, ((UP, "neck_top", 1.0),)),
+    "head": (None, ((UP, "head_height", 1.0),)),
+    "face": ("head", ((FORWARD, "face_offset", 1.0),)),
+    "shoulders": (None, ((UP, "shoulder_height", 1.0),)),
+    "shoulder.left": ("shoulders", ((RIGHT, "shoulder_offset", -1.0),)),
+    "shoulder.right": ("shoulders", ((RIGHT, "shoulder_offset", 1.0),)),
+    "hand.left": ("shoulder.left", ((RIGHT, "arm_reach", -1.0), (UP, "arm_drop", -1.0))),
+    "hand.right": ("shoulder.right", ((RIGHT, "arm_reach", 1.0), (UP, "arm_drop", -1.0))),
+    "hip.left": ("hips", ((RIGHT, "hip_anchor_offset", -1.0),)),
+    "hip.right": ("hips", ((RIGHT, "hip_anchor_offset", 1.0),)),
+    "feet": ("hips", ((UP, "leg_drop", -1.0),)),
+    "foot.left": ("feet", ((RIGHT, "foot_offset", -1.0),)),
+    "foot.right": ("feet", ((RIGHT, "foot_offset", 1.0),)),
+}
+
+# Leaf parts in `leaf_parts` order: (name, kind, anchors, sizing proportions).
+# "box": center anchor and the "<prefix>x" ... "<prefix>v" half-extents (None:
+# the part class's fixed size); "tube": start and end anchors and the radius,
+# with the ring resolution in the matching "<limb>_radial" argument; "face":
+# center anchor, width and height.
+LAYOUT: Tuple[Tuple[str, str, Tuple[str, ...], Tuple[str, ...] | str | None], ...] = (
+    ("torso", "box", ("torso",), "torso_half_"),
+    ("hips", "box", ("hips",), "hips_half_"),
+    ("neck", "tube", ("neck_base", "neck_top"), "neck_radius"),
+    ("head", "box", ("head",), "head_half_"),
+    ("face", "face", ("face",), ("face_width", "face_height")),
+    ("legs.left", "tube", ("hip.left", "foot.left"), "leg_radius"),
+    ("legs.right", "tube", ("hip.right", "foot.right"), "leg_radius"),
+    ("arms.left", "tube", ("shoulder.left", "hand.left"), "arm_radius"),
+    ("arms.right", "tube", ("shoulder.right", "hand.right"), "arm_radius"),
+    ("hands.left", "box", ("hand.left",), None),
+    ("hands.right", "box", ("hand.right",), None),
+    ("feet.left", "box", ("foot.left",), None),
+    ("feet.right", "box", ("foot.right",), None),
+)
+
+
+def anchor_points(
+    center: Point5D, scale: float, proportions: Mapping[str, float]
+) -> Dict[str, Point5D]:
+    """Every ANCHORS point of a figure whose torso sits at `center`."""
+    out: Dict[str, Point5D] = {}
+    steps: Dict[Tuple[Vector5D, str, float], Vector5D] = {}
+    for name, (parent, terms) in ANCHORS.items():
+        q = center if parent is None else out[parent]
+        for term in terms:
+            if term not in steps:
+                direction, proportion, sign = term
+                steps[term] = direction.scale(sign * proportions[proportion] * scale)
+            q = q + steps[term]
+        out[name] = q
+    return out
+
+
+def _copy_part(part):
+    # Parts hold frozen points, vectors and tuples, except the face's Plane5D.
+    twin = copy.copy(part)
+    if isinstance(twin, Face):
+        twin._plane = copy.copy(part._plane)
+    return twin
+
 
 class Sscha:
     """
@@ -40,18 +152,39 @@ class Sscha:
         scale: float = 1.0,
         plane_w: float = 0.0,
         plane_v: float = 0.0,
+        neck_radial: int = 8,
+        arm_radial: int = 6,
+        leg_radial: int = 6,
+        proportions: Mapping[str, float] | None = None,
     ):
         """
         Build Sscha on a 5D plane. The plane is the 3D (x,y,z) subspace at fixed (w, v) = (plane_w, plane_v).
         origin: center of the figure (default: 5D origin).
         scale: uniform scale for proportions.
+        neck_radial, arm_radial, leg_radial: ring resolution of the neck, arm and leg tubes.
+        proportions: overrides for entries of PROPORTIONS (unknown names raise KeyError).
         """
         self.origin = origin if origin is not None else origin_5d()
         self.scale = scale
         self.plane_w = plane_w
         self.plane_v = plane_v
+        self.neck_radial = neck_radial
+        self.arm_radial = arm_radial
+        self.leg_radial = leg_radial
+        if proportions:
+            unknown = set(proportions) - set(PROPORTIONS)
+            if unknown:
+                raise KeyError(f"unknown proportions: {sorted(unknown)}")
+            self.proportions = {**PROPORTIONS, **proportions}
+        else:
+            self.proportions = PROPORTIONS
+        p = self.proportions
+        # Part names shared with clones (copied before modification) and edited via
+        # own_part. Frozen, and replaced rather than mutated, so clones can share them.
+        self._shared: FrozenSet[str] = frozenset()
+        self._edited: FrozenSet[str] = frozenset()
 
-        # Torso center (at origin in x,y,z; w,v on the plane)
+        # Torso center (at origin in x,y,z; w,v on the plane); the rest hangs off it.
         torso_center = Point5D(
             self.origin.x,
             self.origin.y,
@@ -59,82 +192,70 @@ class Sscha:
             plane_w,
             plane_v,
         )
+        a = anchor_points(torso_center, scale, p)
         self.torso = Torso(
-            torso_center,
-            half_extent_x=0.5 * scale,
-            half_extent_y=0.6 * scale,
-            half_extent_z=0.3 * scale,
-            half_extent_w=0.2 * scale,
-            half_extent_v=0.2 * scale,
+            a["torso"],
+            half_extent_x=p["torso_half_x"] * scale,
+            half_extent_y=p["torso_half_y"] * scale,
+            half_extent_z=p["torso_half_z"] * scale,
+            half_extent_w=p["torso_half_w"] * scale,
+            half_extent_v=p["torso_half_v"] * scale,
         )
 
         # Hips below torso
-        hip_center = torso_center + UP.scale(-0.9 * scale)
         self.hips = Hips(
-            hip_center,
-            half_extent_x=0.4 * scale,
-            half_extent_y=0.25 * scale,
-            half_extent_z=0.25 * scale,
-            half_extent_w=0.15 * scale,
-            half_extent_v=0.15 * scale,
+            a["hips"],
+            half_extent_x=p["hips_half_x"] * scale,
+            half_extent_y=p["hips_half_y"] * scale,
+            half_extent_z=p["hips_half_z"] * scale,
+            half_extent_w=p["hips_half_w"] * scale,
+            half_extent_v=p["hips_half_v"] * scale,
         )
 
         # Neck: from top of torso to bottom of head
-        torso_top = torso_center + UP.scale(0.6 * scale)
-        head_bottom = torso_center + UP.scale(1.2 * scale)
         self.neck = Neck(
-            torso_top,
-            head_bottom,
-            num_radial=8,
-            radius=0.12 * scale,
+            a["neck_base"],
+            a["neck_top"],
+            num_radial=neck_radial,
+            radius=p["neck_radius"] * scale,
         )
 
         # Head
-        head_center = torso_center + UP.scale(1.5 * scale)
         self.head = Head(
-            head_center,
-            half_extent_x=0.2 * scale,
-            half_extent_y=0.2 * scale,
-            half_extent_z=0.22 * scale,
-            half_extent_w=0.1 * scale,
-            half_extent_v=0.1 * scale,
+            a["head"],
+            half_extent_x=p["head_half_x"] * scale,
+            half_extent_y=p["head_half_y"] * scale,
+            half_extent_z=p["head_half_z"] * scale,
+            half_extent_w=p["head_half_w"] * scale,
+            half_extent_v=p["head_half_v"] * scale,
         )
 
         # Face (front of head, normal = forward)
-        face_center = head_center + FORWARD.scale(0.22 * scale)
         self.face = Face(
-            face_center,
+            a["face"],
             normal=FORWARD,
-            width=0.35 * scale,
-            height=0.4 * scale,
+            width=p["face_width"] * scale,
+            height=p["face_height"] * scale,
             up=UP,
         )
 
-        # Shoulders (for arms)
-        left_shoulder = torso_center + UP.scale(0.4 * scale) + RIGHT.scale(-0.5 * scale)
-        right_shoulder = torso_center + UP.scale(0.4 * scale) + RIGHT.scale(0.5 * scale)
-        left_hand = left_shoulder + RIGHT.scale(-0.7 * scale) + UP.scale(-0.2 * scale)
-        right_hand = right_shoulder + RIGHT.scale(0.7 * scale) + UP.scale(-0.2 * scale)
+        # Arms: shoulders to hands
         self.arms = Arms(
-            left_shoulder, left_hand,
-            right_shoulder, right_hand,
-            radius=0.08 * scale,
-            num_radial=6,
+            a["shoulder.left"], a["hand.left"],
+            a["shoulder.right"], a["hand.right"],
+            radius=p["arm_radius"] * scale,
+            num_radial=arm_radial,
         )
-        self.hands = Hands(left_hand, right_hand)
+        self.hands = Hands(a["hand.left"], a["hand.right"])
 
         # Legs: hips to feet
-        left_hip_anchor = hip_center + RIGHT.scale(-0.35 * scale)
-        right_hip_anchor = hip_center + RIGHT.scale(0.35 * scale)
-        left_foot_center = hip_center + UP.scale(-1.0 * scale) + RIGHT.scale(-0.2 * scale)
-        right_foot_center = hip_center + UP.scale(-1.0 * scale) + RIGHT.scale(0.2 * scale)
         self.legs = Legs(
-            left_hip_anchor, left_foot_center,
-            right_hip_anchor, right_foot_center,
-            radius=0.1 * scale,
-            num_radial=6,
+            a["hip.left"], a["foot.left"],
+            a["hip.right"], a["foot.right"],
+            radius=p["leg_radius"] * scale,
+            num_radial=leg_radial,
         )
-        self.feet = Feet(left_foot_center, right_foot_center)
+        self.feet = Feet(a["foot.left"], a["foot.right"])
 
     def plane_5d(self) -> Plane5D:
         """The 5D plane this Sscha is constructed on (x,y,z free; w,v fixed)."""
@@ -158,6 +279,13 @@ class Sscha:
             + self.feet.vertices_5d()
         )
 
+    def welded_vertices_5d(self, tol: float = 1e-9) -> Tuple[List[Point5D], List[int]]:
+        """
+        Vertices merged within `tol`: (unique vertices, remap) where remap[i] is the
+        index of vertices_5d()[i] in the unique list.
+        """
+        return weld_points(self.vertices_5d(), tol)
+
     def parts(self) -> Iterator[object]:
         """Iterate over all body part objects."""
         yield self.torso
@@ -169,3 +297,75 @@ class Sscha:
         yield self.arms
         yield self.hands
         yield self.feet
+
+    def leaf_parts(self) -> Iterator[Tuple[str, object]]:
+        """Iterate over (name, part) for every single volume, splitting left/right pairs."""
+        yield "torso", self.torso
+        yield "hips", self.hips
+        yield "neck", self.neck
+        yield "head", self.head
+        yield "face", self.face
+        yield "legs.left", self.legs.left
+        yield "legs.right", self.legs.right
+        yield "arms.left", self.arms.left
+        yield "arms.right", self.arms.right
+        yield "hands.left", self.hands.left
+        yield "hands.right", self.hands.right
+        yield "feet.left", self.feet.left
+        yield "feet.right", self.feet.right
+
+    def clone(self) -> "Sscha":
+        """
+        Copy that shares every part with this figure. A part is copied only when
+        one of the figures asks to modify it through `own_part`, so memory grows
+        with the number of edited parts rather than the number of clones.
+        """
+        twin = Sscha.__new__(Sscha)
+        twin.__dict__.update(self.__dict__)
+        # From now on neither figure may modify a part in place.
+        self._shared = twin._shared = _SHARABLE
+        return twin
+
+    def own_part(self, name: str) -> object:
+        """
+        Part `name` ("torso", "arms", "arms.left", ...) made private to this
+        figure, copying it (and its left/right pair) if it is shared
+        with a clone. Parts must only be modified through the returned object;
+        owning a pair owns both of its sides.
+        """
+        if name not in _SHARABLE:
+            raise KeyError(name)
+        top, _, side = name.partition(".")
+        part = getattr(self, top)
+        if top in self._shared:
+            part = _copy_part(part)
+            setattr(self, top, part)
+            self._shared = self._shared - {top}
+        if top in PAIR_NAMES and not side:
+            self.own_part(f"{top}.left")
+            self.own_part(f"{top}.right")
+        elif side:
+            if name in self._shared:
+                setattr(part, side, _copy_part(getattr(part, side)))
+                self._shared = self._shared - {name}
+            part = getattr(part, side)
+        if name not in self._edited:
+            self._edited = self._edited | {name}
+        return part
+
+    def set_part(self, name: str, part) -> None:
+        """Replace part `name` with `part` (e.g. a restored pose); it counts as edited."""
+        top, _, side = name.partition(".")
+        self.own_part(name)
+        if side:
+            setattr(getattr(self, top), side, part)
+        else:
+            setattr(self, top, part)
+
+    def edited_parts(self) -> FrozenSet[str]:
+        """Names passed to `own_part`: parts that may differ from the parameters."""
+        return self._edited
+
+    def memory_footprint(self) -> Footprint:
+        """Object overhead and vertex payload in bytes (see body.footprint)."""
+        return memory_footprint(self)
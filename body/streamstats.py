@@ -0,0 +1,391 @@
+"""
+Stream stats: single-pass, mergeable statistics over populations too large to
+materialize. Accumulators consume flat buffers chunk by chunk (vertex buffers
+from InstancedPopulation.iter_vertices, parameter tuples from
+iter_population_params, ...) and never keep the values themselves.
+
+Every accumulator has `merge`, so workers can each reduce a slice of the
+population and the parent combines their results: RunningStats combines
+count, mean and the sum of squared deviations with Chan's pairwise formula
+(each chunk is reduced two-pass, then merged, so large populations keep
+Welford's stability), and histograms use fixed edges so merging adds counts.
+`to_bytes` / `from_bytes` give a compact little-endian form for sending
+results between processes. body.uncertainty reduces its samples with the same
+RunningStats.
+"""
+
+import math
+import struct
+from array import array
+from typing import Iterable, List, Sequence, Tuple
+
+from .byteorder import from_le, to_le
+from .geometry import flatten_points
+from .instancing import canonical_mesh
+
+STATS_HEADER = struct.Struct("<4sBQI")
+STATS_MAGIC = b"SSTA"
+HISTOGRAM_HEADER = struct.Struct("<4sBIIdd")
+HISTOGRAM_MAGIC = b"SHST"
+POPULATION_STATS_HEADER = struct.Struct("<4sBI")
+POPULATION_STATS_MAGIC = b"SPST"
+STREAMSTATS_VERSION = 1
+
+# Fields of a SSCHA_RECORD tuple covered by parameter_stats: origin, scale, plane_w, plane_v.
+PARAMETER_FIELDS = ("x", "y", "z", "w", "v", "scale", "plane_w", "plane_v")
+
+_NAME = struct.Struct("<H")
+
+
+def _read(typecode: str, data, offset: int, count: int) -> Tuple[array, int]:
+    end = offset + array(typecode).itemsize * count
+    if len(data) < end:
+        raise ValueError("truncated statistics")
+    return from_le(typecode, data[offset:end]), end
+
+
+class RunningStats:
+    """
+    Count, min, max, mean and variance of every column of a stream of
+    `dims`-wide rows (default 5: one row per 5D vertex). Rows arrive as flat
+    row-major buffers (`update`) or as one sequence per column (`update_columns`).
+    """
+
+    def __init__(self, dims: int = 5):
+        if dims < 1:
+            raise ValueError("dims must be positive")
+        self.dims = dims
+        self.count = 0
+        self.mean = array("d", bytes(8 * dims))
+        # Sum of squared deviations from the mean (Welford's M2).
+        self.m2 = array("d", bytes(8 * dims))
+        self.lo = array("d", [math.inf] * dims)
+        self.hi = array("d", [-math.inf] * dims)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _combine(self, axis: int, n: int, mean: float, m2: float, lo: float, hi: float) -> None:
+        # Chan et al.: merge (count, mean, M2) of two disjoint samples.
+        # Caller updates self.count after all axes.
+        na = self.count
+        total = na + n
+        delta = mean - self.mean[axis]
+        self.mean[axis] += delta * n / total
+        self.m2[axis] += m2 + delta * delta * na * n / total
+        if lo < self.lo[axis]:
+            self.lo[axis] = lo
+        if hi > self.hi[axis]:
+            self.hi[axis] = hi
+
+    def update(self, buf: Sequence[float]) -> "RunningStats":
+        """Add the rows of a flat `dims`-per-row buffer; returns self."""
+        dims = self.dims
+        if len(buf) % dims:
+            raise ValueError(f"buffer length must be a multiple of {dims}")
+        return self.update_columns([buf[axis::dims] for axis in range(dims)])
+
+    def update_columns(self, columns: Sequence[Sequence[float]]) -> "RunningStats":
+        """Add rows given as `dims` equal-length columns; returns self."""
+        if len(columns) != self.dims:
+            raise ValueError(f"expected {self.dims} columns, got {len(columns)}")
+        n = len(columns[0])
+        if not n:
+            return self
+        for axis, col in enumerate(columns):
+            if len(col) != n:
+                raise ValueError("columns must have equal lengths")
+            mean = math.fsum(col) / n
+            m2 = math.fsum([(x - mean) * (x - mean) for x in col])
+            self._combine(axis, n, mean, m2, min(col), max(col))
+        self.count += n
+        return self
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        """Fold another accumulator (e.g. a worker's result) into this one; returns self."""
+        if other.dims != self.dims:
+            raise ValueError(f"cannot merge {other.dims}-wide stats into {self.dims}-wide")
+        if other.count:
+            for axis in range(self.dims):
+                self._combine(
+                    axis,
+                    other.count,
+                    other.mean[axis],
+                    other.m2[axis],
+                    other.lo[axis],
+                    other.hi[axis],
+                )
+            self.count += other.count
+        return self
+
+    def variance(self, ddof: int = 0) -> Tuple[float, ...]:
+        """Per-column variance (ddof=1: sample variance); 0.0 without enough rows."""
+        n = self.count - ddof
+        return tuple(m2 / n if n > 0 else 0.0 for m2 in self.m2)
+
+    def std(self, ddof: int = 0) -> Tuple[float, ...]:
+        return tuple(math.sqrt(v) for v in self.variance(ddof))
+
+    def bounds(self) -> Tuple[Tuple[float, ...], Tuple[float, ...]]:
+        """(lower, upper) per column; (inf, -inf) while empty."""
+        return tuple(self.lo), tuple(self.hi)
+
+    def to_bytes(self) -> bytes:
+        header = STATS_HEADER.pack(STATS_MAGIC, STREAMSTATS_VERSION, self.count, self.dims)
+        return header + b"".join(to_le(a) for a in (self.mean, self.m2, self.lo, self.hi))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "RunningStats":
+        return cls._unpack_from(data, 0)[0]
+
+    @classmethod
+    def _unpack_from(cls, data, offset: int) -> Tuple["RunningStats", int]:
+        if len(data) < offset + STATS_HEADER.size:
+            raise ValueError("truncated statistics")
+        magic, version, count, dims = STATS_HEADER.unpack_from(data, offset)
+        if magic != STATS_MAGIC or version != STREAMSTATS_VERSION:
+            raise ValueError("not packed running statistics")
+        stats = cls(dims)
+        stats.count = count
+        offset += STATS_HEADER.size
+        stats.mean, offset = _read("d", data, offset, dims)
+        stats.m2, offset = _read("d", data, offset, dims)
+        stats.lo, offset = _read("d", data, offset, dims)
+        stats.hi, offset = _read("d", data, offset, dims)
+        return stats, offset
+
+
+class Histogram:
+    """
+    Per-column histograms of `dims`-wide rows over `bins` equal bins of
+    [lo, hi). Values below lo or at/above hi are counted in `underflow` /
+    `overflow`; NaN is ignored. `counts[axis * bins + b]` is bin b of a column.
+    """
+
+    def __init__(self, lo: float, hi: float, bins: int = 32, dims: int = 5):
+        if not hi > lo:
+            raise ValueError("hi must be greater than lo")
+        if bins < 1 or dims < 1:
+            raise ValueError("bins and dims must be positive")
+        self.lo = float(lo)
+        self.hi = float(hi)
+        self.bins = bins
+        self.dims = dims
+        self.counts = array("Q", bytes(8 * bins * dims))
+        self.underflow = array("Q", bytes(8 * dims))
+        self.overflow = array("Q", bytes(8 * dims))
+
+    def edges(self) -> List[float]:
+        """The bins + 1 bin edges, shared by every column."""
+        step = (self.hi - self.lo) / self.bins
+        return [self.lo + b * step for b in range(self.bins)] + [self.hi]
+
+    def column(self, axis: int) -> array:
+        return self.counts[axis * self.bins : (axis + 1) * self.bins]
+
+    def total(self) -> int:
+        """Rows added (per column, NaN excluded), counting under- and overflow."""
+        return sum(self.column(0)) + self.underflow[0] + self.overflow[0]
+
+    def update(self, buf: Sequence[float]) -> "Histogram":
+        """Add the rows of a flat `dims`-per-row buffer; returns self."""
+        dims, bins, lo, hi = self.dims, self.bins, self.lo, self.hi
+        if len(buf) % dims:
+            raise ValueError(f"buffer length must be a multiple of {dims}")
+        k = bins / (hi - lo)
+        counts = self.counts
+        for axis in range(dims):
+            base = axis * bins
+            under = over = 0
+            for x in buf[axis::dims]:
+                if x < lo:
+                    under += 1
+                elif x >= hi:
+                    over += 1
+                elif x == x:
+                    # Rounding can put x just below hi into bin `bins`.
+                    b = int((x - lo) * k)
+                    counts[base + (b if b < bins else bins - 1)] += 1
+            self.underflow[axis] += under
+            self.overflow[axis] += over
+        return self
+
+    def merge(self, other: "Histogram") -> "Histogram":
+        """Add another histogram's counts (same edges and dims); returns self."""
+        if (other.lo, other.hi, other.bins, other.dims) != (self.lo, self.hi, self.bins, self.dims):
+            raise ValueError("cannot merge histograms with different edges")
+        for target, source in (
+            (self.counts, other.counts),
+            (self.underflow, other.underflow),
+            (self.overflow, other.overflow),
+        ):
+            for i, c in enumerate(source):
+                if c:
+                    target[i] += c
+        return self
+
+    def to_bytes(self) -> bytes:
+        return (
+            HISTOGRAM_HEADER.pack(
+                HISTOGRAM_MAGIC, STREAMSTATS_VERSION, self.bins, self.dims, self.lo, self.hi
+            )
+            + to_le(self.counts)
+            + to_le(self.underflow)
+            + to_le(self.overflow)
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Histogram":
+        return cls._unpack_from(data, 0)[0]
+
+    @classmethod
+    def _unpack_from(cls, data, offset: int) -> Tuple["Histogram", int]:
+        if len(data) < offset + HISTOGRAM_HEADER.size:
+            raise ValueError("truncated statistics")
+        magic, version, bins, dims, lo, hi = HISTOGRAM_HEADER.unpack_from(data, offset)
+        if magic != HISTOGRAM_MAGIC or version != STREAMSTATS_VERSION:
+            raise ValueError("not a packed histogram")
+        hist = cls(lo, hi, bins, dims)
+        offset += HISTOGRAM_HEADER.size
+        hist.counts, offset = _read("Q", data, offset, bins * dims)
+        hist.underflow, offset = _read("Q", data, offset, dims)
+        hist.overflow, offset = _read("Q", data, offset, dims)
+        return hist, offset
+
+
+class PopulationStats:
+    """
+    Statistics of a stream of whole-figure vertex buffers sharing one
+    topology ((part, first vertex, vertex count) per leaf part, as in
+    CanonicalMesh.topology): `vertices` over every vertex, `centroids` over
+    the per-figure vertex centroids, and `extents[part]`, a histogram of the
+    part's per-axis bounding-box size over [0, extent_max).
+    """
+
+    def __init__(
+        self, topology: Sequence[Tuple[str, int, int]], extent_max: float = 4.0, bins: int = 40
+    ):
+        self.topology = [tuple(t) for t in topology]
+        self.figure_floats = 5 * sum(count for _, _, count in self.topology)
+        if not self.figure_floats:
+            raise ValueError("topology has no vertices")
+        self.vertices = RunningStats()
+        self.centroids = RunningStats()
+        self.extents = {name: Histogram(0.0, extent_max, bins) for name, _, _ in self.topology}
+
+    @property
+    def figures(self) -> int:
+        return len(self.centroids)
+
+    def update(self, buf: Sequence[float]) -> "PopulationStats":
+        """Add a chunk of whole figures (a flat buffer of one or more figures); returns self."""
+        n5 = self.figure_floats
+        if len(buf) % n5:
+            raise ValueError(f"buffer length must be a multiple of {n5} (one figure)")
+        self.vertices.update(buf)
+        per_figure = n5 // 5
+        centroids = array("d")
+        extents = {name: array("d") for name in self.extents}
+        for f in range(0, len(buf), n5):
+            centroids.extend(
+                math.fsum(buf[f + axis : f + n5 : 5]) / per_figure for axis in range(5)
+            )
+            for name, start, count in self.topology:
+                part = buf[f + 5 * start : f + 5 * (start + count)]
+                extents[name].extend(
+                    max(part[axis::5]) - min(part[axis::5]) for axis in range(5)
+                )
+        self.centroids.update(centroids)
+        for name, values in extents.items():
+            self.extents[name].update(values)
+        return self
+
+    def merge(self, other: "PopulationStats") -> "PopulationStats":
+        """Fold another worker's statistics (same topology and bins) into these; returns self."""
+        if other.topology != self.topology:
+            raise ValueError("cannot merge statistics of different topologies")
+        self.vertices.merge(other.vertices)
+        self.centroids.merge(other.centroids)
+        for name, hist in other.extents.items():
+            self.extents[name].merge(hist)
+        return self
+
+    def to_bytes(self) -> bytes:
+        out = [
+            POPULATION_STATS_HEADER.pack(
+                POPULATION_STATS_MAGIC, STREAMSTATS_VERSION, len(self.topology)
+            ),
+            self.vertices.to_bytes(),
+            self.centroids.to_bytes(),
+        ]
+        for name, start, count in self.topology:
+            encoded = name.encode()
+            out.append(_NAME.pack(len(encoded)) + encoded + struct.pack("<II", start, count))
+            out.append(self.extents[name].to_bytes())
+        return b"".join(out)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "PopulationStats":
+        if len(data) < POPULATION_STATS_HEADER.size:
+            raise ValueError("truncated statistics")
+        magic, version, parts = POPULATION_STATS_HEADER.unpack_from(data, 0)
+        if magic != POPULATION_STATS_MAGIC or version != STREAMSTATS_VERSION:
+            raise ValueError("not packed population statistics")
+        offset = POPULATION_STATS_HEADER.size
+        vertices, offset = RunningStats._unpack_from(data, offset)
+        centroids, offset = RunningStats._unpack_from(data, offset)
+        topology, extents = [], {}
+        for _ in range(parts):
+            if len(data) < offset + _NAME.size:
+                raise ValueError("truncated statistics")
+            (size,) = _NAME.unpack_from(data, offset)
+            offset += _NAME.size
+            name = bytes(data[offset : offset + size]).decode()
+            start, count = struct.unpack_from("<II", data, offset + size)
+            offset += size + 8
+            topology.append((name, start, count))
+            extents[name], offset = Histogram._unpack_from(data, offset)
+        first = extents[topology[0][0]]
+        stats = cls(topology, first.hi, first.bins)
+        stats.vertices, stats.centroids, stats.extents = vertices, centroids, extents
+        return stats
+
+
+def population_stats(
+    source, chunk: int = 64, extent_max: float = 4.0, bins: int = 40
+) -> PopulationStats:
+    """
+    Stream an InstancedPopulation (`chunk` figures at a time) or an iterable of
+    Sscha (one at a time) into a PopulationStats. Sscha figures must share
+    tube resolutions.
+    """
+    if hasattr(source, "iter_vertices") and hasattr(source, "mesh"):
+        stats = PopulationStats(source.mesh.topology, extent_max, bins)
+        for buf in source.iter_vertices(chunk):
+            stats.update(buf)
+        return stats
+    stats = None
+    for fig in source:
+        if stats is None:
+            mesh = canonical_mesh(fig.neck_radial, fig.arm_radial, fig.leg_radial)
+            stats = PopulationStats(mesh.topology, extent_max, bins)
+        stats.update(flatten_points(fig.vertices_5d()))
+    if stats is None:
+        stats = PopulationStats(canonical_mesh().topology, extent_max, bins)
+    return stats
+
+
+def parameter_stats(params: Iterable[Sequence[float]]) -> RunningStats:
+    """
+    RunningStats over the PARAMETER_FIELDS of Sscha parameter tuples (e.g.
+    iter_population_params of a packed population), without building figures.
+    """
+    stats = RunningStats(len(PARAMETER_FIELDS))
+    width = len(PARAMETER_FIELDS)
+    batch = array("d")
+    for p in params:
+        batch.extend(p[:width])
+        if len(batch) >= 4096 * width:
+            stats.update(batch)
+            batch = array("d")
+    return stats.update(batch)
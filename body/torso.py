@@ -5,6 +5,7 @@ Torso: central 5D volume of Sscha. Represented as a 5D box (32 vertices).
 from typing import List
 
 from .geometry import Point5D, Vector5D
+from .footprint import Footprint, memory_footprint
 
 
 class Torso:
@@ -62,3 +63,7 @@ class Torso:
     def top_center(self, up: Vector5D) -> Point5D:
         """Center of the top face (toward +up)."""
         return self.center + up.scale(self._h[0])  # use first extent along up
+
+    def memory_footprint(self) -> Footprint:
+        """Object overhead and vertex payload in bytes (see body.footprint)."""
+        return memory_footprint(self)
@@ -0,0 +1,378 @@
+"""
+Uncertainty: propagate distributions over `scale` and the body PROPORTIONS to
+vertex, limb-length and extent statistics. Samples are drawn and evaluated in
+column batches (one list per vertex coordinate across a chunk of samples), so
+no Sscha or part objects are built per sample and memory is bounded by the chunk.
+"""
+
+import math
+import random
+from array import array
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from .geometry import Point5D, origin_5d, unflatten_points
+from .face import Face
+from .hands import Hand
+from .feet import Foot
+from .limbs import ring_offsets
+from .quantize import QuantizedBuffer, with_precision
+from .sscha import Sscha, ANCHORS, LAYOUT, PROPORTIONS, UP, FORWARD
+from .streamstats import RunningStats
+
+Column = List[float]
+
+LIMBS = ("neck", "legs.left", "legs.right", "arms.left", "arms.right")
+
+
+# --- Distributions ---------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class Fixed:
+    """Point value."""
+
+    value: float
+
+    def sample(self, rng: random.Random, n: int) -> Column:
+        return [self.value] * n
+
+
+@dataclass(frozen=True)
+class Normal:
+    mean: float
+    std: float
+
+    def sample(self, rng: random.Random, n: int) -> Column:
+        gauss, mu, sigma = rng.gauss, self.mean, self.std
+        return [gauss(mu, sigma) for _ in range(n)]
+
+
+@dataclass(frozen=True)
+class Uniform:
+    low: float
+    high: float
+
+    def sample(self, rng: random.Random, n: int) -> Column:
+        uniform, lo, hi = rng.uniform, self.low, self.high
+        return [uniform(lo, hi) for _ in range(n)]
+
+
+Distribution = Fixed | Normal | Uniform
+
+
+def _as_distribution(value) -> Distribution:
+    return value if hasattr(value, "sample") else Fixed(float(value))
+
+
+# --- Results ---------------------------------------------------------------
+
+
+@dataclass
+class PropagationResult:
+    """
+    Statistics over `count` samples. Vertex buffers are flat (x, y, z, w, v per
+    vertex, Sscha.vertices_5d order); vertex_covariance, when requested, holds a
+    row-major 5x5 block per vertex. `limb_lengths` has one column per LIMBS
+    entry and `extents` one per axis (bounding-box size of each sample).
+    """
+
+    count: int
+    vertex_mean: array
+    vertex_variance: array
+    vertex_covariance: Optional[array]
+    limb_lengths: RunningStats
+    extents: RunningStats
+    lower: Tuple[float, ...]
+    upper: Tuple[float, ...]
+
+    def mean_points(self) -> List[Point5D]:
+        return unflatten_points(self.vertex_mean)
+
+
+# --- Model -----------------------------------------------------------------
+
+
+class FigureDistribution:
+    """
+    A distribution over Sscha figures: `scale` and any PROPORTIONS entry may be a
+    distribution (Fixed, Normal, Uniform) or a plain number; origin, plane and
+    tube resolutions are fixed.
+    """
+
+    def __init__(
+        self,
+        scale=1.0,
+        proportions: Mapping[str, object] | None = None,
+        origin: Point5D | None = None,
+        plane_w: float = 0.0,
+        plane_v: float = 0.0,
+        neck_radial: int = 8,
+        arm_radial: int = 6,
+        leg_radial: int = 6,
+    ):
+        proportions = dict(proportions or {})
+        unknown = set(proportions) - set(PROPORTIONS)
+        if unknown:
+            raise KeyError(f"unknown proportions: {sorted(unknown)}")
+        self.scale = _as_distribution(scale)
+        self.proportions: Dict[str, Distribution] = {
+            name: _as_distribution(proportions.get(name, default))
+            for name, default in PROPORTIONS.items()
+        }
+        self.origin = origin if origin is not None else origin_5d()
+        self.plane_w = plane_w
+        self.plane_v = plane_v
+        self.neck_radial = max(3, neck_radial)
+        self.arm_radial = max(2, arm_radial)
+        self.leg_radial = max(2, leg_radial)
+        plane = Face(origin_5d(), FORWARD, up=UP).plane_5d()
+        self._face_u, self._face_t = plane.u.as_tuple(), plane.t.as_tuple()
+        # Fixed half-extents of the LAYOUT boxes not sized by proportions.
+        self._fixed_h = {
+            "hands": Hand(origin_5d()).half_extents,
+            "feet": Foot(origin_5d()).half_extents,
+        }
+
+    def streams(self, seed=None) -> Dict[str, random.Random]:
+        """
+        One random stream per parameter ("scale" and each proportion), seeded from
+        `seed` and the parameter name, so draws do not depend on the chunk size.
+        """
+        names = ("scale", *self.proportions)
+        if seed is None:
+            return {name: random.Random() for name in names}
+        return {name: random.Random(f"{seed}/{name}") for name in names}
+
+    def sample_params(
+        self, streams: Mapping[str, random.Random], n: int
+    ) -> Tuple[Column, Dict[str, Column]]:
+        """(scale column, proportion columns) for the next n samples of `streams`."""
+        return self.scale.sample(streams["scale"], n), {
+            name: dist.sample(streams[name], n) for name, dist in self.proportions.items()
+        }
+
+    def figure(self, scale: float, proportions: Mapping[str, float]) -> Sscha:
+        """One realization as a full Sscha (for inspection; the batch paths never build these)."""
+        return Sscha(
+            self.origin,
+            scale,
+            self.plane_w,
+            self.plane_v,
+            self.neck_radial,
+            self.arm_radial,
+            self.leg_radial,
+            proportions=proportions,
+        )
+
+    def vertex_columns(self, k: Column, p: Dict[str, Column]) -> List[Column]:
+        """
+        One column per vertex coordinate (5 per vertex, Sscha.vertices_5d order),
+        each holding that coordinate across the batch.
+        """
+        return self.vertex_layout(k, p)[1]
+
+    def vertex_layout(
+        self, k: Column, p: Dict[str, Column]
+    ) -> Tuple[List[Tuple[str, int, int]], List[Column]]:
+        """
+        (topology, vertex columns) of a batch, built from the same ANCHORS and
+        LAYOUT tables as Sscha. topology lists (part name, first vertex, vertex
+        count). A zero-length tube has only its two endpoints, as in Sscha, so
+        a tube must be zero-length in every sample of the batch or in none.
+        """
+        m = len(k)
+        ox, oy, oz = self.origin.x, self.origin.y, self.origin.z
+        center = ([ox] * m, [oy] * m, [oz] * m, [self.plane_w] * m, [self.plane_v] * m)
+        scaled: Dict[str, Column] = {}
+
+        def size(name: str) -> Column:
+            if name not in scaled:
+                scaled[name] = [a * b for a, b in zip(p[name], k)]
+            return scaled[name]
+
+        anchors: Dict[str, Tuple[Column, ...]] = {}
+        for name, (parent, terms) in ANCHORS.items():
+            q = center if parent is None else anchors[parent]
+            for direction, proportion, sign in terms:
+                d = [sign * a * b for a, b in zip(p[proportion], k)]
+                q = tuple(
+                    [c + e * f for c, f in zip(col, d)] if e else col
+                    for col, e in zip(q, direction)
+                )
+            anchors[name] = q
+
+        topology: List[Tuple[str, int, int]] = []
+        cols: List[Column] = []
+        for name, kind, ends, sizes in LAYOUT:
+            first = len(cols)
+            at = anchors[ends[0]]
+            if kind == "box":
+                if sizes is None:
+                    half = [[h] * m for h in self._fixed_h[name.partition(".")[0]]]
+                else:
+                    half = [size(sizes + axis) for axis in "xyzwv"]
+                _box(cols, at, half)
+            elif kind == "face":
+                _face(cols, at, size(sizes[0]), size(sizes[1]), self._face_u, self._face_t)
+            else:
+                num_radial = getattr(self, sizes.replace("_radius", "_radial"))
+                _tube(cols, at, anchors[ends[1]], size(sizes), num_radial, name)
+            topology.append((name, first // 5, (len(cols) - first) // 5))
+        return topology, cols
+
+
+def _box(cols: List[Column], center: Sequence[Column], half: Sequence[Column]) -> None:
+    for ix in (-1, 1):
+        for iy in (-1, 1):
+            for iz in (-1, 1):
+                for iw in (-1, 1):
+                    for iv in (-1, 1):
+                        for axis, sign in enumerate((ix, iy, iz, iw, iv)):
+                            cols.append([c + sign * h for c, h in zip(center[axis], half[axis])])
+
+
+def _face(cols, center, width: Column, height: Column, u, t) -> None:
+    for su, st in ((-1, -1), (1, -1), (1, 1), (-1, 1)):
+        for axis in range(5):
+            cols.append(
+                [
+                    c + u[axis] * (su * wd * 0.5) + t[axis] * (st * ht * 0.5)
+                    for c, wd, ht in zip(center[axis], width, height)
+                ]
+            )
+
+
+def _tube(cols, a: Sequence[Column], b: Sequence[Column], radius: Column, n: int, name: str) -> None:
+    """Endpoints then (origin, end) ring pairs, as body.limbs.tube_vertices."""
+    cols.extend(list(col) for col in a)
+    cols.extend(list(col) for col in b)
+    degenerate = [
+        math.sqrt(sum((q - p) * (q - p) for p, q in zip(pa, pb))) < 1e-10
+        for pa, pb in zip(zip(*a), zip(*b))
+    ]
+    if all(degenerate):
+        return
+    if any(degenerate):
+        raise ValueError(f"{name} is zero-length in some samples only; vertex layouts differ")
+    for offsets in ring_offsets(a, b, radius, n):
+        for end in (a, b):
+            for col, off in zip(end, offsets):
+                cols.append(list(col) if off is None else [p + o for p, o in zip(col, off)])
+
+
+# --- Batch evaluation ------------------------------------------------------
+
+
+def _chunks(
+    model: FigureDistribution, n: int, seed, chunk: int
+) -> Iterator[Tuple[List[Tuple[str, int, int]], List[Column]]]:
+    """(topology, vertex columns) for consecutive chunks of samples."""
+    streams = model.streams(seed)
+    chunk = max(1, chunk)
+    first = None
+    for start in range(0, n, chunk):
+        m = min(chunk, n - start)
+        k, p = model.sample_params(streams, m)
+        topology, cols = model.vertex_layout(k, p)
+        if first is None:
+            first = topology
+        elif topology != first:
+            raise ValueError("samples do not share one vertex layout (zero-length tubes differ)")
+        yield topology, cols
+
+
+def iter_vertex_chunks(
+    model: FigureDistribution, n: int, seed=None, chunk: int = 1024, precision: str = "float64"
+) -> Iterator[array | QuantizedBuffer]:
+    """
+    Stream sampled vertex buffers: one flat buffer per chunk, sample-major
+    (chunk_len x vertices x 5), so arbitrarily large n never resides in memory.
+    Buffers are array('d') for float64, otherwise QuantizedBuffers (int16: one
+    bounding box per sample).
+    """
+    for _, cols in _chunks(model, n, seed, chunk):
+        width = len(cols)
+        m = len(cols[0])
+        out = array("d", bytes(8 * width * m))
+        for j, col in enumerate(cols):
+            out[j::width] = array("d", col)
+        yield with_precision(out, precision, [width // 5] * m)
+
+
+def propagate(
+    model: FigureDistribution,
+    n: int,
+    seed=None,
+    chunk: int = 1024,
+    covariance: bool = False,
+) -> PropagationResult:
+    """
+    Draw n samples in chunks and reduce them to vertex mean/variance (optionally
+    per-vertex 5x5 covariance), limb length and bounding-extent summaries.
+    """
+    if n < 1:
+        raise ValueError("n must be positive")
+    coords: Optional[RunningStats] = None
+    comoments: Optional[List[float]] = None
+    limbs = RunningStats(len(LIMBS))
+    extents = RunningStats(5)
+    limb_starts: List[int] = []
+
+    for topology, cols in _chunks(model, n, seed, chunk):
+        m = len(cols[0])
+        if coords is None:
+            starts = {name: start for name, start, _ in topology}
+            limb_starts = [starts[name] for name in LIMBS]
+            coords = RunningStats(len(cols))
+            comoments = [0.0] * (len(cols) // 5 * 25) if covariance else None
+        if covariance:
+            _update_covariance(comoments, coords, cols)
+        coords.update_columns(cols)
+        lengths = []
+        for start in limb_starts:
+            a = cols[5 * start : 5 * start + 5]
+            b = cols[5 * start + 5 : 5 * start + 10]
+            lengths.append(
+                [math.sqrt(sum((b[d][i] - a[d][i]) ** 2 for d in range(5))) for i in range(m)]
+            )
+        limbs.update_columns(lengths)
+        sizes = []
+        for axis in range(5):
+            axis_cols = cols[axis::5]
+            sizes.append([max(vals) - min(vals) for vals in zip(*axis_cols)])
+        extents.update_columns(sizes)
+
+    cov = None
+    if covariance:
+        denom = max(1, n - 1)
+        cov = array("d", (c / denom for c in comoments))
+    return PropagationResult(
+        n,
+        array("d", coords.mean),
+        array("d", coords.variance(1)),
+        cov,
+        limbs,
+        extents,
+        tuple(min(coords.lo[axis::5]) for axis in range(5)),
+        tuple(max(coords.hi[axis::5]) for axis in range(5)),
+    )
+
+
+def _update_covariance(comoments: List[float], coords: RunningStats, cols: List[Column]) -> None:
+    """Merge a chunk's per-vertex 5x5 co-moments into the totals (call before coords update)."""
+    m = len(cols[0])
+    for v in range(len(cols) // 5):
+        block = cols[5 * v : 5 * v + 5]
+        means_b = [math.fsum(col) / m for col in block]
+        centered = [[x - mu for x in col] for col, mu in zip(block, means_b)]
+        n_a = coords.count
+        n = n_a + m
+        deltas = [means_b[d] - coords.mean[5 * v + d] for d in range(5)]
+        base = 25 * v
+        for i in range(5):
+            for j in range(i, 5):
+                c_b = math.fsum(x * y for x, y in zip(centered[i], centered[j]))
+                c = comoments[base + 5 * i + j] + c_b + deltas[i] * deltas[j] * n_a * m / n
+                comoments[base + 5 * i + j] = c
+                comoments[base + 5 * j + i] = c
@@ -0,0 +1,219 @@
+"""
+Voxelize: rasterize the 3D (x, y, z) slice of Sscha figures at a fixed (w, v)
+into an occupancy grid. Box and tube parts are filled exactly (a voxel is set
+when its center lies inside the part); the face patch has no volume and is skipped.
+"""
+
+import math
+import mmap
+from array import array
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Tuple
+
+from .primitives import Box5D, Capsule5D, Primitive, iter_population_primitives
+from .sscha import Sscha
+
+Tuple3 = Tuple[float, float, float]
+
+MODES = ("bool", "part", "figure")
+# "part" grids use the narrowest of _LABEL_TYPECODES that holds every label.
+_TYPECODES = {"bool": "B", "figure": "I"}
+_LABEL_TYPECODES = ("B", "H", "I")
+
+
+@dataclass
+class VoxelGrid:
+    """
+    Occupancy grid of shape (nx, ny, nz), stored x-fastest:
+    index = (iz * ny + iy) * nx + ix. A value of 0 means empty; in "part" mode a
+    value k > 0 names `labels[k - 1]`, in "figure" mode it is figure index + 1.
+    """
+
+    shape: Tuple[int, int, int]
+    lower: Tuple3
+    voxel_size: Tuple3
+    data: memoryview
+    mode: str = "bool"
+    labels: List[str] = field(default_factory=list)
+    _backing: object = field(default=None, repr=False)
+
+    def index(self, ix: int, iy: int, iz: int) -> int:
+        nx, ny, _ = self.shape
+        return (iz * ny + iy) * nx + ix
+
+    def __getitem__(self, ijk: Tuple[int, int, int]) -> int:
+        return self.data[self.index(*ijk)]
+
+    def voxel_center(self, ix: int, iy: int, iz: int) -> Tuple3:
+        lo, s = self.lower, self.voxel_size
+        return (lo[0] + (ix + 0.5) * s[0], lo[1] + (iy + 0.5) * s[1], lo[2] + (iz + 0.5) * s[2])
+
+    def count(self) -> int:
+        """Number of occupied voxels."""
+        step = 1 << 20
+        occupied = 0
+        for i in range(0, len(self.data), step):
+            block = self.data[i : i + step].tolist()
+            occupied += len(block) - block.count(0)
+        return occupied
+
+    def flush(self) -> None:
+        """Flush a memory-mapped grid to disk (no-op for in-memory grids)."""
+        if isinstance(self._backing, mmap.mmap):
+            self._backing.flush()
+
+    def close(self) -> None:
+        """Release a memory-mapped backing; the grid is unusable afterwards."""
+        if isinstance(self._backing, mmap.mmap):
+            self.data.release()
+            self._backing.close()
+
+
+def _index_range(lo: float, hi: float, origin: float, size: float, n: int) -> Tuple[int, int]:
+    """Half-open range of voxel indices whose centers lie in [lo, hi]."""
+    a = max(0, math.ceil((lo - origin) / size - 0.5))
+    b = min(n, math.floor((hi - origin) / size - 0.5) + 1)
+    return a, b
+
+
+def _label_typecode(count: int) -> str:
+    """Unsigned typecode for label values 0..count."""
+    for typecode in _LABEL_TYPECODES:
+        if count < 1 << (8 * array(typecode).itemsize):
+            return typecode
+    raise ValueError(f"too many part labels: {count}")
+
+
+def _allocate(n: int, typecode: str, out: Optional[str]) -> Tuple[memoryview, object]:
+    itemsize = array(typecode).itemsize
+    if out is None:
+        backing = bytearray(n * itemsize)
+    else:
+        with open(out, "w+b") as f:
+            f.truncate(n * itemsize)
+            backing = mmap.mmap(f.fileno(), n * itemsize)
+    return memoryview(backing).cast(typecode), backing
+
+
+def _slice_bounds(prims: Sequence[Primitive]) -> Tuple[Tuple3, Tuple3]:
+    lo = [math.inf] * 3
+    hi = [-math.inf] * 3
+    for prim in prims:
+        plo, phi = prim.bounds()
+        for i in range(3):
+            lo[i] = min(lo[i], plo[i])
+            hi[i] = max(hi[i], phi[i])
+    if lo[0] > hi[0]:
+        return (0.0, 0.0, 0.0), (1.0, 1.0, 1.0)
+    return tuple(lo), tuple(hi)
+
+
+def voxelize(
+    figures: Sscha | Sequence[Sscha],
+    w: float,
+    v: float,
+    resolution: int | Tuple[int, int, int] = 64,
+    lower: Optional[Tuple3] = None,
+    upper: Optional[Tuple3] = None,
+    mode: str = "bool",
+    chunk: int = 32,
+    out: Optional[str] = None,
+) -> VoxelGrid:
+    """
+    Voxelize the (x, y, z) slice at (w, v) of one figure or a population.
+
+    resolution: voxels per axis (int) or (nx, ny, nz).
+    lower, upper: grid bounds in x, y, z (default: bounds of the parts present in the slice).
+    mode: "bool" (1 = occupied), "part" (part label) or "figure" (figure index + 1).
+    chunk: number of z-layers rasterized together; parts are culled per chunk by their bounds.
+    out: optional file path; the grid is then written into a memory-mapped file.
+    """
+    if mode not in MODES:
+        raise ValueError(f"mode must be one of {MODES}, got {mode!r}")
+    if isinstance(figures, Sscha):
+        figures = [figures]
+    if isinstance(resolution, int):
+        resolution = (resolution, resolution, resolution)
+    nx, ny, nz = resolution
+    if min(nx, ny, nz) < 1:
+        raise ValueError("resolution must be positive")
+
+    # Keep only solid parts whose w/v extent contains the slice.
+    items = []
+    labels: List[str] = []
+    for fig, name, prim in iter_population_primitives(figures):
+        if not isinstance(prim, (Box5D, Capsule5D)):
+            continue
+        if name not in labels:
+            labels.append(name)
+        plo, phi = prim.bounds()
+        if plo[3] <= w <= phi[3] and plo[4] <= v <= phi[4]:
+            items.append((fig, name, prim, plo, phi))
+
+    if lower is None or upper is None:
+        blo, bhi = _slice_bounds([it[2] for it in items])
+        lower = blo if lower is None else lower
+        upper = bhi if upper is None else upper
+    size = tuple((upper[i] - lower[i]) / resolution[i] for i in range(3))
+    if min(size) <= 0:
+        raise ValueError("upper must exceed lower on every axis")
+
+    typecode = _label_typecode(len(labels)) if mode == "part" else _TYPECODES[mode]
+    data, backing = _allocate(nx * ny * nz, typecode, out)
+    fills = {}
+
+    def fill_row(value: int) -> memoryview:
+        if value not in fills:
+            fills[value] = memoryview(array(typecode, [value]) * nx)
+        return fills[value]
+
+    chunk = max(1, chunk)
+    for z0 in range(0, nz, chunk):
+        z1 = min(nz, z0 + chunk)
+        zlo = lower[2] + z0 * size[2]
+        zhi = lower[2] + z1 * size[2]
+        for fig, name, prim, plo, phi in items:
+            if phi[2] < zlo or plo[2] > zhi:
+                continue
+            if mode == "bool":
+                row = fill_row(1)
+            elif mode == "part":
+                row = fill_row(labels.index(name) + 1)
+            else:
+                row = fill_row(fig + 1)
+            iz0, iz1 = _index_range(plo[2], phi[2], lower[2], size[2], nz)
+            iy0, iy1 = _index_range(plo[1], phi[1], lower[1], size[1], ny)
+            iz0, iz1 = max(iz0, z0), min(iz1, z1)
+            if isinstance(prim, Box5D):
+                ix0, ix1 = _index_range(plo[0], phi[0], lower[0], size[0], nx)
+                if ix0 >= ix1:
+                    continue
+                for iz in range(iz0, iz1):
+                    for iy in range(iy0, iy1):
+                        base = (iz * ny + iy) * nx
+                        data[base + ix0 : base + ix1] = row[: ix1 - ix0]
+                continue
+            # Tube: exact x-interval of each (y, z) row via the capsule line span.
+            for iz in range(iz0, iz1):
+                zc = lower[2] + (iz + 0.5) * size[2]
+                for iy in range(iy0, iy1):
+                    yc = lower[1] + (iy + 0.5) * size[1]
+                    span = prim.line_span((0.0, yc, zc, w, v), (1.0, 0.0, 0.0, 0.0, 0.0))
+                    if span is None:
+                        continue
+                    ix0, ix1 = _index_range(span[0], span[1], lower[0], size[0], nx)
+                    if ix0 < ix1:
+                        base = (iz * ny + iy) * nx
+                        data[base + ix0 : base + ix1] = row[: ix1 - ix0]
+        if isinstance(backing, mmap.mmap):
+            backing.flush()
+
+    return VoxelGrid(
+        (nx, ny, nz),
+        tuple(lower),
+        size,
+        data,
+        mode,
+        labels if mode == "part" else [],
+        backing,
+    )
@@ -0,0 +1,81 @@
+"""
+Weld: merge 5D vertices that lie within a tolerance of each other.
+Uses a hashed grid with cells of size 2 * tol, so every neighbor within tol
+lies in the point's own cell or the adjacent cell on the near side of each
+axis (2^5 cells to probe instead of 3^5).
+"""
+
+import math
+from array import array
+from itertools import product
+from typing import Dict, List, Sequence, Tuple
+
+from .geometry import Point5D, flatten_points, unflatten_points
+
+
+def weld_array(buf: Sequence[float], tol: float = 1e-9) -> Tuple[array, array]:
+    """
+    Weld a flat 5-per-vertex buffer. Returns (unique, remap): `unique` is a flat
+    float64 buffer of representative vertices in first-seen order and
+    remap[i] is the index in `unique` of input vertex i. Each vertex joins the
+    first earlier representative within Euclidean distance `tol`; tol = 0
+    merges exact duplicates only.
+    """
+    if len(buf) % 5:
+        raise ValueError("buffer length must be a multiple of 5")
+    if tol < 0:
+        raise ValueError("tol must be non-negative")
+    unique = array("d")
+    remap = array("I")
+    if tol == 0:
+        seen: Dict[Tuple[float, ...], int] = {}
+        for i in range(0, len(buf), 5):
+            p = tuple(buf[i : i + 5])
+            k = seen.get(p)
+            if k is None:
+                k = seen[p] = len(unique) // 5
+                unique.extend(p)
+            remap.append(k)
+        return unique, remap
+
+    cell = 2.0 * tol
+    tol2 = tol * tol
+    grid: Dict[Tuple[int, ...], List[int]] = {}
+    floor = math.floor
+    for i in range(0, len(buf), 5):
+        p = buf[i : i + 5]
+        key = []
+        steps = []
+        for c in p:
+            q = c / cell
+            k = floor(q)
+            key.append(k)
+            steps.append((0, -1) if q - k < 0.5 else (0, 1))
+        found = -1
+        for offs in product(*steps):
+            bucket = grid.get(tuple(k + o for k, o in zip(key, offs)))
+            if not bucket:
+                continue
+            for j in bucket:
+                u = 5 * j
+                d2 = (
+                    (unique[u] - p[0]) ** 2
+                    + (unique[u + 1] - p[1]) ** 2
+                    + (unique[u + 2] - p[2]) ** 2
+                    + (unique[u + 3] - p[3]) ** 2
+                    + (unique[u + 4] - p[4]) ** 2
+                )
+                if d2 <= tol2 and (found < 0 or j < found):
+                    found = j
+        if found < 0:
+            found = len(unique) // 5
+            unique.extend(p)
+            grid.setdefault(tuple(key), []).append(found)
+        remap.append(found)
+    return unique, remap
+
+
+def weld_points(points: Sequence[Point5D], tol: float = 1e-9) -> Tuple[List[Point5D], List[int]]:
+    """weld_array for Point5D lists: (unique points, remap index per input point)."""
+    unique, remap = weld_array(flatten_points(points), tol)
+    return unflatten_points(unique), remap.tolist()
@@ -0,0 +1,74 @@
+"""
+Allocation budgets for hot paths. Counts of Point5D / Vector5D / Plane5D
+constructions per call are exact; peak traced bytes get headroom because they
+depend on the interpreter. Raise a budget only with a reason in review.
+"""
+
+import pytest
+
+from body.geometry import Point5D, Vector5D
+from body.sscha import Sscha
+from body.face import Face
+from body.limbs import CylindricalLimb
+from body.neck import Neck
+from body.allocations import AllocationCounter, count_allocations
+
+FIG = Sscha()
+
+# name: (call, {class: max constructions}, max peak bytes)
+BUDGETS = {
+    "CylindricalLimb.vertices_5d": (
+        lambda: FIG.arms.left.vertices_5d(),
+        {"Point5D": 12, "Vector5D": 0},
+        4_000,
+    ),
+    "Neck.vertices_5d": (lambda: FIG.neck.vertices_5d(), {"Point5D": 16, "Vector5D": 0}, 4_000),
+    "Face.__init__": (
+        lambda: Face(FIG.face.center, FIG.face.normal, 0.35, 0.4),
+        {"Point5D": 0, "Vector5D": 2, "Plane5D": 1},
+        2_000,
+    ),
+    "Face.vertices_5d": (lambda: FIG.face.vertices_5d(), {"Point5D": 4, "Vector5D": 0}, 1_000),
+    "Torso.vertices_5d": (lambda: FIG.torso.vertices_5d(), {"Point5D": 32, "Vector5D": 0}, 10_000),
+    "Sscha.__init__": (lambda: Sscha(), {"Point5D": 21, "Vector5D": 18, "Plane5D": 1}, 14_000),
+    "Sscha.vertices_5d": (lambda: FIG.vertices_5d(), {"Point5D": 292, "Vector5D": 0}, 100_000),
+}
+
+
+@pytest.mark.parametrize("name", sorted(BUDGETS))
+def test_allocation_budget(name):
+    call, counts, peak = BUDGETS[name]
+    call()  # warm up caches and free lists
+    result = count_allocations(call)
+    for cls, budget in counts.items():
+        assert result[cls] <= budget, f"{name}: {result[cls]} {cls} > budget {budget}"
+    assert result.peak_bytes <= peak, f"{name}: peak {result.peak_bytes} B > budget {peak} B"
+
+
+class TestAllocationCounter:
+    def test_counts_and_restores(self):
+        init = Point5D.__init__
+        with AllocationCounter() as counter:
+            Point5D(0, 0, 0, 0, 0)
+            Vector5D(1, 0, 0, 0, 0).scale(2.0)
+        assert counter.result["Point5D"] == 1 and counter.result["Vector5D"] == 2
+        assert counter.result.total == 3
+        assert Point5D.__init__ is init
+
+    def test_restores_on_error(self):
+        init = Vector5D.__init__
+        with pytest.raises(RuntimeError):
+            with AllocationCounter():
+                raise RuntimeError
+        assert Vector5D.__init__ is init
+
+    def test_budget_detects_regression(self):
+        def wasteful():
+            limb = CylindricalLimb(Point5D(0, 0, 0, 0, 0), Point5D(0, 1, 0, 0, 0))
+            return [p + (limb.end - limb.origin).scale(0.0) for p in limb.vertices_5d()]
+
+        assert count_allocations(wasteful)["Vector5D"] > BUDGETS["CylindricalLimb.vertices_5d"][1]["Vector5D"]
+
+    def test_degenerate_tubes_allocate_nothing(self):
+        p = Point5D(1, 1, 1, 1, 1)
+        assert count_allocations(lambda: Neck(p, p).vertices_5d()).total == 0
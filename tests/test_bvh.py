@@ -0,0 +1,35 @@
+"""Tests for body.bvh."""
+
+from body.bvh import BVH
+
+
+def _unit_boxes(n):
+    return [((float(i), 0, 0, 0, 0), (i + 0.5, 0.5, 0.5, 0.5, 0.5)) for i in range(n)]
+
+
+class TestBVH:
+    def test_query_box(self):
+        bvh = BVH(_unit_boxes(20), leaf_size=2)
+        hits = sorted(bvh.query_box((4.2, 0, 0, 0, 0), (6.2, 1, 1, 1, 1)))
+        assert hits == [4, 5, 6]
+
+    def test_order_is_permutation(self):
+        bvh = BVH(_unit_boxes(17))
+        assert sorted(bvh.order) == list(range(17))
+
+    def test_nearest_ray_hit(self):
+        bvh = BVH(_unit_boxes(20), leaf_size=1)
+        visited = []
+
+        def test(k):
+            visited.append(k)
+            return (float(k) - 3.0, k)
+
+        best = bvh.nearest_ray_hit((3.0, 0.25, 0.25, 0.25, 0.25), (1, 0, 0, 0, 0), test)
+        assert best == (0.0, 3)
+        assert len(visited) < 20
+
+    def test_empty(self):
+        bvh = BVH([])
+        assert bvh.query_box((0,) * 5, (1,) * 5) == []
+        assert bvh.nearest_ray_hit((0,) * 5, (1, 0, 0, 0, 0), lambda k: None) is None
@@ -0,0 +1,95 @@
+"""Tests for body.chain."""
+
+import math
+
+import pytest
+
+from body.geometry import Point5D
+from body.limbs import CylindricalLimb
+from body.chain import LimbChain
+
+
+def _helix(n, turns=3.0):
+    return [
+        Point5D(math.cos(2 * math.pi * turns * i / n), math.sin(2 * math.pi * turns * i / n), 0.05 * i, 0, 0)
+        for i in range(n)
+    ]
+
+
+def _close(a, b, tol=1e-9):
+    return all(abs(x - y) < tol for x, y in zip(a, b))
+
+
+class TestLimbChain:
+    def test_two_nodes_match_limb_rings(self):
+        a, b = Point5D(0, 0, 0, 0.5, 0), Point5D(0.3, -0.2, 1, 0.5, 0)
+        chain = LimbChain([a, b], 0.1, num_radial=6)
+        limb = CylindricalLimb(a, b, 0.1, 6)
+        verts = chain.vertices_5d()
+        expected = limb.vertices_5d()
+        assert verts[:2] == [a, b]
+        for j in range(6):
+            assert _close(verts[chain.ring_start(0) + j], expected[2 + 2 * j])
+            assert _close(verts[chain.ring_start(1) + j], expected[3 + 2 * j])
+
+    def test_vertex_count_and_shared_rings(self):
+        chain = LimbChain(_helix(200), 0.05, num_radial=8)
+        assert len(chain.vertices_5d()) == chain.vertex_count == 200 * 9
+        quads = chain.quads()
+        assert len(quads) == 199 * 8
+        assert quads[0][3] == quads[8][0]
+
+    def test_frames_orthonormal(self):
+        for t, u, v in LimbChain(_helix(100)).frames():
+            for x, y, want in ((t, t, 1), (u, u, 1), (v, v, 1), (t, u, 0), (t, v, 0), (u, v, 0)):
+                assert sum(p * q for p, q in zip(x, y)) == pytest.approx(want, abs=1e-9)
+
+    def test_straight_chain_does_not_twist(self):
+        nodes = [Point5D(0, 0, 0.1 * i, 0, 0) for i in range(50)]
+        frames = LimbChain(nodes).frames()
+        assert all(_close(f[1], frames[0][1]) for f in frames)
+
+    def test_low_twist_on_bend(self):
+        # Rotation-minimizing: u changes only as much as the tangent does.
+        frames = LimbChain(_helix(400)).frames()
+        for (t0, u0, _), (t1, u1, _) in zip(frames, frames[1:]):
+            du = math.dist(u0, u1)
+            dt = math.dist(t0, t1)
+            assert du <= dt + 1e-9
+
+    def test_per_node_radius(self):
+        nodes = [Point5D(0, 0, i, 0, 0) for i in range(3)]
+        chain = LimbChain(nodes, [0.3, 0.2, 0.1], num_radial=4)
+        verts = chain.vertices_5d()
+        for i, r in enumerate((0.3, 0.2, 0.1)):
+            ring = verts[chain.ring_start(i) : chain.ring_start(i) + 4]
+            assert all(math.dist(p, nodes[i]) == pytest.approx(r) for p in ring)
+        assert [c.radius for c in chain.primitives()] == [0.3, 0.2]
+
+    def test_degenerate_nodes_and_set_node(self):
+        nodes = [Point5D(0, 0, 0, 0, 0), Point5D(0, 0, 0, 1, 0), Point5D(0, 0, 1, 1, 0)]
+        chain = LimbChain(nodes)
+        assert len(chain.frames()) == 3
+        assert chain.length() == pytest.approx(2.0)
+        chain.set_node(2, Point5D(0, 0, 3, 1, 0))
+        assert chain.end == Point5D(0, 0, 3, 1, 0)
+        assert chain.length() == pytest.approx(4.0)
+
+    def test_off_plane_chain_rings_round(self):
+        # Rings stay in x/y/z, which is perpendicular to tangents running in w/v.
+        nodes = [Point5D(0, 0, 0, 0, 0), Point5D(0, 0, 0, 1, 0), Point5D(0.001, 0, 0, 2, 0.5)]
+        chain = LimbChain(nodes, 0.2, num_radial=6)
+        verts = chain.vertices_5d()
+        for i, node in enumerate(nodes):
+            a, b = nodes[max(i - 1, 0)], nodes[min(i + 1, 2)]
+            tangent = [q - p for p, q in zip(a, b)]
+            for p in verts[chain.ring_start(i) : chain.ring_start(i) + 6]:
+                d = [x - y for x, y in zip(p, node)]
+                assert math.hypot(*d) == pytest.approx(0.2)
+                assert abs(sum(x * y for x, y in zip(d, tangent))) < 1e-12
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            LimbChain([Point5D(0, 0, 0, 0, 0)])
+        with pytest.raises(ValueError):
+            LimbChain([Point5D(0, 0, 0, 0, 0)] * 3, [0.1, 0.2])
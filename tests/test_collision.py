@@ -0,0 +1,70 @@
+"""Tests for body.collision."""
+
+import pytest
+
+from body.geometry import Point5D
+from body.sscha import Sscha
+from body.ik import reach
+from body.collision import (
+    ADJACENT,
+    collision_mask,
+    collision_pairs,
+    iter_self_collisions,
+    self_collisions,
+)
+
+
+def _arm_through_torso():
+    fig = Sscha()
+    reach(fig, Point5D(0.6, 0.0, 0.0, 0.0, 0.0), stretch=True)
+    return fig
+
+
+def _crossed_legs():
+    fig = Sscha()
+    reach(fig, Point5D(0.3, -1.9, 0.0, 0.0, 0.0), limb="legs", side="left", stretch=True)
+    return fig
+
+
+class TestSelfCollisions:
+    def test_rest_pose_is_clear(self):
+        assert self_collisions(Sscha()) == []
+        assert self_collisions(Sscha(scale=2.5, plane_w=1.0)) == []
+
+    def test_arm_through_torso(self):
+        hits = self_collisions(_arm_through_torso())
+        assert ("torso", "arms.left", 0.0) in hits
+
+    def test_crossed_legs(self):
+        pairs = {(a, b) for a, b, _ in self_collisions(_crossed_legs())}
+        assert ("legs.left", "legs.right") in pairs
+
+    def test_margin_reports_near_misses(self):
+        # Legs are 0.2 apart at rest.
+        assert self_collisions(Sscha(), margin=0.1) == []
+        near = self_collisions(Sscha(), margin=0.25)
+        assert ("legs.left", "legs.right", pytest.approx(0.2)) in near
+
+    def test_attached_pairs_flagged(self):
+        names = [name for name, _ in Sscha().leaf_parts()]
+        pairs = collision_pairs(names)
+        assert len(pairs) == len(names) * (len(names) - 1) // 2
+        assert {frozenset((names[i], names[j])) for i, j, attached in pairs if attached} == ADJACENT
+
+    def test_joint_zone(self):
+        fig = _arm_through_torso()
+        assert self_collisions(fig, joint_zone=None) == []
+        # A limb resting against its parent only near the joint is not a hit.
+        fig = Sscha()
+        reach(fig, Point5D(-0.9, -0.3, 0.0, 0.0, 0.0))
+        assert self_collisions(fig) == []
+
+
+class TestBatch:
+    def test_iter_and_mask_agree(self):
+        figs = [Sscha(), _arm_through_torso(), Sscha(origin=Point5D(3, 0, 0, 0, 0)), _crossed_legs()]
+        assert list(collision_mask(figs)) == [0, 1, 0, 1]
+        hit = {k for k, *_ in iter_self_collisions(figs)}
+        assert hit == {1, 3}
+        for k, a, b, d in iter_self_collisions(figs):
+            assert (a, b, d) in self_collisions(figs[k])
@@ -0,0 +1,107 @@
+"""Tests for body.curves."""
+
+import math
+
+import pytest
+
+from body.geometry import Point5D
+from body.curves import BezierCurve5D, CatmullRomCurve5D, Curve5D
+
+
+def _close(a, b, tol=1e-9):
+    return all(abs(x - y) < tol for x, y in zip(a, b))
+
+
+@pytest.fixture
+def arc():
+    return BezierCurve5D(
+        [Point5D(0, 0, 0, 0, 0), Point5D(1, 0, 0, 0.5, 0), Point5D(1, 1, 0, 1, 0), Point5D(1, 1, 1, 1, 1)]
+    )
+
+
+class TestBezier:
+    def test_endpoints(self, arc):
+        assert arc.point(0.0) == Point5D(0, 0, 0, 0, 0)
+        assert _close(arc.point(1.0), (1, 1, 1, 1, 1))
+
+    def test_linear_is_straight(self):
+        line = BezierCurve5D([Point5D(0, 0, 0, 0, 0), Point5D(2, 0, 0, 0, 0)])
+        assert _close(line.point(0.25), (0.5, 0, 0, 0, 0))
+        assert line.length() == pytest.approx(2.0)
+        assert line.sample(max_angle=0.1) == [0, len(line.table()) - 1]
+
+    def test_tangent_matches_finite_difference(self, arc):
+        table = arc.table()
+        i = 100
+        t = table.tangents[5 * i : 5 * i + 5]
+        d = [b - a for a, b in zip(table.points[5 * (i - 1) : 5 * i], table.points[5 * (i + 1) : 5 * (i + 2)])]
+        n = math.sqrt(sum(c * c for c in d))
+        assert _close(t, [c / n for c in d], 1e-3)
+
+
+class TestCatmullRom:
+    def test_interpolates_points(self):
+        pts = [Point5D(i, (i % 2) * 0.5, 0, 0.1 * i, 0) for i in range(5)]
+        curve = CatmullRomCurve5D(pts)
+        for k, p in enumerate(pts):
+            assert _close(curve.point(k / 4), p)
+
+    def test_samples_per_span(self):
+        curve = CatmullRomCurve5D([Point5D(i, 0, 0, 0, 0) for i in range(3)], samples_per_span=10)
+        assert len(curve.table()) == 21
+
+
+class TestSweep:
+    def test_table_cached_across_lods(self, arc):
+        calls = []
+        evaluate = arc._evaluate
+        arc._evaluate = lambda params: calls.append(len(params)) or evaluate(params)
+        coarse = arc.sweep(max_angle=math.radians(30))
+        fine = arc.sweep(max_angle=math.radians(3))
+        assert calls == [arc.samples]
+        assert len(fine) > len(coarse) >= 2
+
+    def test_adaptive_density(self):
+        # Straight first half, tight bend in the second: bend gets the samples.
+        pts = [Point5D(i, 0, 0, 0, 0) for i in range(5)] + [
+            Point5D(4 + math.sin(a), 1 - math.cos(a), 0, 0, 0) for a in (0.8, 1.6, 2.4, 3.2)
+        ]
+        curve = CatmullRomCurve5D(pts)
+        rows = curve.sample(max_angle=math.radians(5))
+        half = len(curve.table()) // 2
+        assert sum(r > half for r in rows) > 3 * sum(0 < r <= half for r in rows)
+
+    def test_max_length(self, arc):
+        table = arc.table()
+        rows = arc.sample(max_angle=0, max_length=0.05)
+        gaps = [table.arc[b] - table.arc[a] for a, b in zip(rows, rows[1:])]
+        assert max(gaps) < 0.05 + max(table.arc[i + 1] - table.arc[i] for i in range(len(table) - 1))
+
+    def test_sweep_rings_and_taper(self, arc):
+        tube = arc.sweep(radius=(0.2, 0.1), num_radial=5)
+        assert tube.radii[0] == pytest.approx(0.2) and tube.radii[-1] == pytest.approx(0.1)
+        verts = tube.vertices_5d()
+        assert len(verts) == tube.vertex_count
+        for i in (0, len(tube) - 1):
+            node = tube.node(i)
+            for p in verts[tube.ring_start(i) : tube.ring_start(i) + 5]:
+                assert math.dist(p[:3], node[:3]) == pytest.approx(tube.radii[i])
+        for t, u, v in tube.frames():
+            assert abs(sum(a * b for a, b in zip(t, u))) < 1e-9
+
+    def test_callable_radius(self, arc):
+        tube = arc.sweep(radius=lambda s: 0.1 + s)
+        assert tube.radii[-1] == pytest.approx(1.1)
+
+    def test_invalid(self, arc):
+        with pytest.raises(ValueError):
+            arc.sample(max_angle=0)
+        with pytest.raises(ValueError):
+            BezierCurve5D([Point5D(0, 0, 0, 0, 0)])
+
+    def test_base_is_abstract(self):
+        class Incomplete(Curve5D):
+            pass
+
+        with pytest.raises(TypeError):
+            Incomplete()
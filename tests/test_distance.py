@@ -0,0 +1,153 @@
+"""Tests for body.distance."""
+
+import math
+import random
+import tracemalloc
+from array import array
+
+import pytest
+
+from body.geometry import Point5D, flatten_points
+from body.primitives import Box5D, Capsule5D, Patch5D
+from body.sscha import Sscha
+from body.distance import (
+    box_box_distance,
+    capsule_capsule_distance,
+    box_capsule_distance,
+    primitive_distance,
+    segment_box_params,
+    distance_matrix,
+    iter_distance_rows,
+    nearest_vertices,
+    min_vertex_distance,
+    vertex_distance_matrix,
+    population_primitives,
+    clearance,
+)
+
+
+def _box_point_distance(box, p):
+    return math.sqrt(sum(max(lo - c, 0.0, c - hi) ** 2 for lo, c, hi in zip(box.lower, p, box.upper)))
+
+
+def _lerp(a, b, s):
+    return tuple(x + s * (y - x) for x, y in zip(a, b))
+
+
+def _random_point(rng, spread=2.0):
+    return tuple(rng.uniform(-spread, spread) for _ in range(5))
+
+
+class TestPrimitiveDistances:
+    def test_box_box(self):
+        a = Box5D((0, 0, 0, 0, 0), (1, 1, 1, 1, 1))
+        b = Box5D((2, 0, 3, 0, 0), (3, 1, 4, 1, 1))
+        assert box_box_distance(a, b) == pytest.approx(math.sqrt(5))
+        assert box_box_distance(a, Box5D((0.5,) * 5, (2,) * 5)) == 0.0
+
+    def test_capsule_capsule_parallel_and_crossing(self):
+        a = Capsule5D((0, 0, 0, 0, 0), (1, 0, 0, 0, 0), 0.1)
+        b = Capsule5D((0, 1, 0, 0, 0), (1, 1, 0, 0, 0), 0.2)
+        assert capsule_capsule_distance(a, b) == pytest.approx(0.7)
+        c = Capsule5D((0.5, -1, 0, 2, 0), (0.5, 1, 0, 2, 0), 0.5)
+        assert capsule_capsule_distance(a, c) == pytest.approx(1.4)
+
+    def test_capsule_capsule_matches_sampling(self):
+        rng = random.Random(3)
+        for _ in range(30):
+            a = Capsule5D(_random_point(rng), _random_point(rng), 0.0)
+            b = Capsule5D(_random_point(rng), _random_point(rng), 0.0)
+            samples = [k / 200 for k in range(201)]
+            brute = min(math.dist(_lerp(a.a, a.b, s), _lerp(b.a, b.b, t)) for s in samples for t in samples)
+            exact = capsule_capsule_distance(a, b)
+            assert exact <= brute + 1e-12
+            assert brute - exact < 0.05
+
+    def test_box_capsule_matches_sampling(self):
+        rng = random.Random(5)
+        box = Box5D((-0.5, -0.3, -0.2, -0.4, -0.1), (0.5, 0.3, 0.2, 0.4, 0.1))
+        for _ in range(50):
+            cap = Capsule5D(_random_point(rng), _random_point(rng), 0.05)
+            brute = min(_box_point_distance(box, _lerp(cap.a, cap.b, k / 2000)) for k in range(2001))
+            exact = box_capsule_distance(box, cap)
+            assert exact <= max(0.0, brute - 0.05) + 1e-12
+            assert max(0.0, brute - 0.05) - exact < 1e-3
+
+    def test_segment_through_box(self):
+        box = Box5D((0,) * 5, (1,) * 5)
+        s, d2 = segment_box_params((-1, 0.5, 0.5, 0.5, 0.5), (2, 0.5, 0.5, 0.5, 0.5), box)
+        assert d2 == 0.0 and 1 / 3 <= s <= 2 / 3
+
+    def test_dispatch_symmetric(self):
+        box = Box5D((0,) * 5, (1,) * 5)
+        cap = Capsule5D((3, 0, 0, 0, 0), (3, 1, 0, 0, 0), 0.5)
+        assert primitive_distance(box, cap) == primitive_distance(cap, box) == pytest.approx(1.5)
+        with pytest.raises(TypeError):
+            primitive_distance(box, Patch5D((0,) * 5, (1, 0, 0, 0, 0), (0, 1, 0, 0, 0), 1, 1))
+
+
+class TestMatrices:
+    def test_distance_matrix_and_ceiling(self):
+        figs = [Sscha(origin=Point5D(2.0 * i, 0, 0, 0, 0)) for i in range(4)]
+        left = population_primitives(figs, "feet.left")
+        right = population_primitives(figs, "feet.right")
+        m = distance_matrix(left, right)
+        assert len(m) == 4 and all(len(row) == 4 for row in m)
+        assert m[0][0] < m[0][1] < m[0][3]
+        assert list(iter_distance_rows(left, right)) == m
+        with pytest.raises(ValueError):
+            distance_matrix(left, right, max_bytes=8 * 15)
+
+    def test_clearance(self):
+        figs = [Sscha(), Sscha(scale=2.0)]
+        c = clearance(figs, "hands.left", "head")
+        assert len(c) == 2 and 0.0 < c[0] < c[1]
+        with pytest.raises(KeyError):
+            clearance(figs, "tail", "head")
+
+
+class TestVertexKernels:
+    def test_nearest_matches_brute_force_any_block(self):
+        rng = random.Random(1)
+        a = [c for _ in range(40) for c in _random_point(rng)]
+        b = [c for _ in range(70) for c in _random_point(rng)]
+        brute = [
+            min(range(70), key=lambda j: math.dist(a[5 * i : 5 * i + 5], b[5 * j : 5 * j + 5]))
+            for i in range(40)
+        ]
+        for max_bytes in (1, 48 * 7, 1 << 20):
+            dist, index = nearest_vertices(a, b, max_bytes)
+            assert list(index) == brute
+            assert dist[0] == pytest.approx(math.dist(a[:5], b[5 * brute[0] : 5 * brute[0] + 5]))
+
+    @pytest.mark.parametrize("as_array", [False, True])
+    def test_working_set_within_max_bytes(self, as_array):
+        rng = random.Random(4)
+        a = [c for _ in range(4) for c in _random_point(rng)]
+        b = [c for _ in range(20000) for c in _random_point(rng)]
+        if as_array:
+            b = array("d", b)
+        max_bytes = 1 << 18
+        tracemalloc.start()
+        try:
+            nearest_vertices(a, b, max_bytes)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        assert peak <= 1.1 * max_bytes
+
+    def test_group_matrix(self):
+        figs = [Sscha(origin=Point5D(3.0 * i, 0, 0, 0, 0)) for i in range(3)]
+        groups = [flatten_points(f.feet.vertices_5d()) for f in figs]
+        m = vertex_distance_matrix(groups, groups, max_bytes=4096)
+        assert all(m[i][i] == 0.0 for i in range(3))
+        assert m[0][2] == pytest.approx(min_vertex_distance(groups[0], groups[2]))
+        assert m[0][1] < m[0][2]
+        with pytest.raises(ValueError):
+            vertex_distance_matrix(groups, groups, max_bytes=64)
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            nearest_vertices([0.0] * 4, [0.0] * 5)
+        with pytest.raises(ValueError):
+            nearest_vertices([0.0] * 5, [])
@@ -0,0 +1,75 @@
+"""Tests for body.footprint."""
+
+import pytest
+
+from body.geometry import Point5D
+from body.sscha import Sscha
+from body.instancing import InstancedPopulation
+from body.part_arrays import TubeArray
+from body.footprint import Footprint, memory_footprint, check_footprint, object_size, total_footprint
+
+
+class TestMemoryFootprint:
+    def test_figure_breakdown(self):
+        fig = Sscha()
+        fp = fig.memory_footprint()
+        assert isinstance(fp, Footprint) and fp == memory_footprint(fig)
+        assert [c.name for c in fp.children] == [n for n, _ in fig.leaf_parts()]
+        assert fp.vertices == len(fig.vertices_5d())
+        assert fp.object_bytes >= sum(c.object_bytes for c in fp.children)
+        assert fp.total == fp.object_bytes + fp.payload_bytes
+        assert "hands.left" in fp.report()
+
+    def test_parts_and_pairs(self):
+        fig = Sscha()
+        legs = fig.legs.memory_footprint()
+        assert [c.name for c in legs.children] == ["left", "right"]
+        assert legs.vertices == 28
+        torso = fig.torso.memory_footprint()
+        assert torso.vertices == 32 and torso.payload_bytes > torso.object_bytes
+
+    def test_shared_proportions_not_counted(self):
+        default = memory_footprint(Sscha()).object_bytes
+        custom = memory_footprint(Sscha(proportions={"arm_reach": 0.9})).object_bytes
+        assert 0 < custom - default < 3000
+
+    def test_population_reports_shared_mesh(self):
+        pop = InstancedPopulation()
+        for i in range(10):
+            pop.add(scale=1.0 + i)
+        fp = pop.memory_footprint()
+        assert fp.shared_bytes > 0
+        assert fp.payload_bytes == 10 * len(pop.mesh.vertices) * 8
+        assert fp.object_bytes < fp.shared_bytes
+
+    def test_lists_and_arrays(self):
+        figs = [Sscha(), Sscha(scale=2.0)]
+        fp = memory_footprint(figs)
+        assert len(fp.children) == 2
+        assert fp.payload_bytes == sum(memory_footprint(f).payload_bytes for f in figs)
+        assert fp.total > total_footprint(figs) - fp.payload_bytes
+        tubes = TubeArray.from_limbs(Sscha().legs.segments())
+        assert tubes.memory_footprint().payload_bytes == 8 * len(tubes.vertex_array())
+
+    def test_object_size_skips_seen(self):
+        p = Point5D(1.5, 2.5, 3.5, 4.5, 5.5)
+        size, count = object_size(p)
+        assert count == 6
+        assert object_size(p, {id(p)}) == (0, 0)
+
+
+class TestCheckFootprint:
+    @pytest.mark.parametrize(
+        "factory",
+        [
+            lambda: Sscha(),
+            lambda: Sscha(scale=1.7, proportions={"leg_drop": 1.2}),
+            lambda: Sscha().neck,
+            lambda: Sscha().arms,
+            lambda: TubeArray.from_limbs(Sscha().arms.segments()),
+        ],
+    )
+    def test_estimate_matches_tracemalloc(self, factory):
+        objects, payload = check_footprint(factory)
+        assert objects.within(0.25), objects
+        assert payload.within(0.2), payload
@@ -0,0 +1,75 @@
+"""Tests for body.framestream."""
+
+import pytest
+
+from body.geometry import Point5D, flatten_points
+from body.sscha import Sscha
+from body.morph import Morph
+from body.framestream import FrameEncoder, FrameDecoder, FRAME_HEADER, KEY, DELTA, DELTA_RLE
+
+
+def _kind(packet):
+    return FRAME_HEADER.unpack_from(packet, 0)[2]
+
+
+@pytest.fixture
+def frames():
+    m = Morph([Sscha(), Sscha(origin=Point5D(0.3, 0, 0, 0, 0), scale=1.2)], easing="smooth")
+    return [m.frame(t / 19) for t in range(20)]
+
+
+class TestFrameStream:
+    def test_round_trip_within_half_step(self, frames):
+        enc = FrameEncoder(step=1e-4, keyframe_interval=8)
+        dec = FrameDecoder()
+        packets = enc.encode_all(frames)
+        assert [_kind(p) for p in packets][:9:8] == [KEY, KEY]
+        for src, out in zip(frames, dec.decode_all(packets)):
+            assert max(abs(a - b) for a, b in zip(src, out)) <= 0.5e-4 + 1e-12
+
+    def test_error_does_not_accumulate(self):
+        base = flatten_points(Sscha().vertices_5d())
+        drift = [[x + 0.37e-3 * k for x in base] for k in range(200)]
+        dec = FrameDecoder()
+        for src, packet in zip(drift, FrameEncoder(step=1e-3, keyframe_interval=1000).encode_all(drift)):
+            out = dec.decode(packet)
+        assert max(abs(a - b) for a, b in zip(src, out)) <= 0.5e-3 + 1e-12
+
+    def test_static_vertices_compress(self):
+        base = flatten_points(Sscha().vertices_5d())
+        moved = list(base)
+        moved[10] += 0.5
+        enc = FrameEncoder()
+        key, delta = enc.encode(base), enc.encode(moved)
+        assert _kind(delta) == DELTA_RLE
+        assert len(delta) < FRAME_HEADER.size + 32 < len(key)
+        dec = FrameDecoder()
+        dec.decode(key)
+        assert dec.decode(delta)[10] == pytest.approx(moved[10], abs=1e-4)
+
+    def test_uncompressed_deltas(self, frames):
+        packets = FrameEncoder(compress=False).encode_all(frames[:3])
+        assert [_kind(p) for p in packets] == [KEY, DELTA, DELTA]
+        out = list(FrameDecoder().decode_all(packets))
+        assert max(abs(a - b) for a, b in zip(frames[2], out[2])) <= 0.5e-4 + 1e-12
+
+    def test_overflow_forces_keyframe(self):
+        enc = FrameEncoder(step=1e-9)
+        enc.encode([0.0] * 5)
+        assert _kind(enc.encode([10.0] * 5)) == KEY
+
+    def test_errors(self, frames):
+        enc = FrameEncoder()
+        key, d1, d2 = enc.encode_all(frames[:3])
+        with pytest.raises(ValueError):
+            FrameDecoder().decode(d1)
+        dec = FrameDecoder()
+        dec.decode(key)
+        with pytest.raises(ValueError):
+            dec.decode(d2)
+        with pytest.raises(ValueError):
+            dec.decode(b"XXXX" + key[4:])
+        with pytest.raises(ValueError):
+            enc.encode([0.0] * 5)
+        with pytest.raises(ValueError):
+            FrameEncoder(step=0)
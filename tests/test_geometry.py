@@ -2,7 +2,7 @@
 
 import pytest
 
-from body.geometry import Point5D, Vector5D, Plane5D, origin_5d
+from body.geometry import Point5D, Vector5D, Plane5D, origin_5d, flatten_points, unflatten_points
 
 
 class TestPoint5D:
@@ -78,3 +78,11 @@ class TestOrigin5d:
     def test_origin_is_zero(self):
         o = origin_5d()
         assert o.x == o.y == o.z == o.w == o.v == 0.0
+
+
+class TestFlatBuffers:
+    def test_flatten_round_trip(self):
+        pts = [Point5D(1.0, 2.0, 3.0, 4.0, 5.0), Point5D(-1.0, 0.0, 0.5, 0.0, 2.0)]
+        buf = flatten_points(pts)
+        assert list(buf[:5]) == [1.0, 2.0, 3.0, 4.0, 5.0]
+        assert unflatten_points(buf) == pts
@@ -0,0 +1,118 @@
+"""Tests for body.geometry_cache."""
+
+import os
+import threading
+
+import pytest
+
+from body.geometry import Point5D, flatten_points
+from body.sscha import Sscha
+from body.ik import reach
+from body.geometry_cache import GeometryCache, figure_key, geometry_key
+
+
+def _close(a, b, tol=1e-12):
+    return len(a) == len(b) and all(abs(x - y) <= tol for x, y in zip(a, b))
+
+
+class TestKeys:
+    def test_origin_does_not_matter(self):
+        assert figure_key(Sscha(Point5D(3, 1, 2, 0, 0))) == figure_key(Sscha())
+
+    def test_parameters_matter(self):
+        keys = {
+            geometry_key(),
+            geometry_key(scale=1.5),
+            geometry_key(plane_w=0.2),
+            geometry_key(arm_radial=8),
+            geometry_key(proportions={"arm_reach": 0.9}),
+        }
+        assert len(keys) == 5
+
+    def test_default_overrides_and_signed_zero(self):
+        assert geometry_key(proportions={"arm_reach": 0.7}) == geometry_key()
+        assert geometry_key(plane_w=-0.0) == geometry_key()
+        assert len(geometry_key()) == 64
+
+
+class TestCache:
+    def test_matches_fresh_build(self):
+        cache = GeometryCache()
+        for fig in (
+            Sscha(Point5D(4.0, -2.0, 1.5, 0, 0), 1.3, 0.2, -0.1),
+            Sscha(Point5D(-1.0, 0.5, 0.0, 0, 0), 1.3, 0.2, -0.1),
+            Sscha(scale=0.8, arm_radial=9, proportions={"leg_drop": 1.3}),
+        ):
+            assert _close(cache.figure_vertices(fig), flatten_points(fig.vertices_5d()))
+        assert (cache.hits, cache.misses, len(cache)) == (1, 2, 2)
+
+    def test_vertices_without_building_figure(self):
+        cache = GeometryCache()
+        out = cache.vertices(Point5D(1, 2, 3, 0, 0), scale=2.0)
+        assert _close(out, flatten_points(Sscha(Point5D(1, 2, 3, 0, 0), 2.0).vertices_5d()))
+
+    def test_results_are_private_copies(self):
+        cache = GeometryCache()
+        a = cache.vertices()
+        a[0] = 1e9
+        assert cache.vertices()[0] != 1e9
+
+    def test_lru_eviction_by_bytes(self):
+        per_figure = 8 * len(flatten_points(Sscha().vertices_5d()))
+        cache = GeometryCache(max_bytes=2 * per_figure)
+        k1, _ = cache.local_vertices(scale=1.0)
+        k2, _ = cache.local_vertices(scale=2.0)
+        cache.local_vertices(scale=1.0)  # k1 is now most recent
+        k3, _ = cache.local_vertices(scale=3.0)
+        assert k1 in cache and k3 in cache and k2 not in cache
+        assert cache.nbytes == 2 * per_figure
+
+    def test_too_large_for_cache(self):
+        cache = GeometryCache(max_bytes=100)
+        cache.vertices()
+        assert len(cache) == 0 and cache.nbytes == 0
+
+    def test_unknown_proportion(self):
+        with pytest.raises(KeyError):
+            GeometryCache().vertices(proportions={"tail_length": 1.0})
+
+    def test_concurrent_lookups_share_one_entry(self):
+        cache = GeometryCache()
+        results = []
+
+        def work():
+            results.append(cache.local_vertices(scale=1.25)[1])
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(cache) == 1
+        assert all(r is results[0] or r == results[0] for r in results)
+        assert cache.hits + cache.misses == 8
+
+
+class TestDisk:
+    def test_persists_across_instances(self, tmp_path):
+        first = GeometryCache(directory=str(tmp_path))
+        expected = first.vertices(scale=1.5, plane_v=0.3)
+        assert len(os.listdir(tmp_path)) == 1
+        second = GeometryCache(directory=str(tmp_path))
+        assert second.vertices(scale=1.5, plane_v=0.3) == expected
+        assert (second.disk_hits, second.misses) == (1, 0)
+
+    def test_rejects_corrupt_file(self, tmp_path):
+        cache = GeometryCache(directory=str(tmp_path))
+        key, _ = cache.local_vertices()
+        (tmp_path / (key + ".geom")).write_bytes(b"XXXX" + bytes(12))
+        with pytest.raises(ValueError):
+            GeometryCache(directory=str(tmp_path)).local_vertices()
+
+
+def test_edited_figures_bypass_cache():
+    cache = GeometryCache()
+    fig = Sscha().clone()
+    reach(fig, Point5D(-1, 1, 0, 0, 0))
+    assert cache.figure_vertices(fig) == flatten_points(fig.vertices_5d())
+    assert len(cache) == 0
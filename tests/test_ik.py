@@ -0,0 +1,110 @@
+"""Tests for body.ik."""
+
+import math
+
+import pytest
+
+from body.geometry import Point5D, flatten_points
+from body.sscha import Sscha
+from body.ik import aim_limb, reach, solve_reach
+
+
+def _dist(a, b):
+    return math.sqrt(sum((x - y) ** 2 for x, y in zip(a, b)))
+
+
+class TestReach:
+    def test_reachable_target_lands_exactly(self):
+        fig = Sscha()
+        arm = fig.arms.left
+        length = arm.length()
+        target = Point5D(arm.origin.x, arm.origin.y + length, arm.origin.z, 0, 0)
+        assert reach(fig, target) == pytest.approx(0.0, abs=1e-12)
+        assert _dist(arm.end, target) < 1e-12
+        assert arm.length() == pytest.approx(length)
+
+    def test_far_target_clamped_along_direction(self):
+        fig = Sscha()
+        arm = fig.arms.right
+        length = arm.length()
+        target = Point5D(10, 0.4, 0, 0, 0)
+        residual = reach(fig, target, side="right")
+        assert arm.length() == pytest.approx(length)
+        assert residual == pytest.approx(_dist(arm.origin, target) - length)
+        # End lies on the shoulder -> target ray.
+        assert _dist(arm.origin, arm.end) + _dist(arm.end, target) == pytest.approx(_dist(arm.origin, target))
+
+    def test_stretch_reaches_any_target(self):
+        fig = Sscha()
+        target = Point5D(0.2, -3.0, 0.5, 0.1, 0.0)
+        assert reach(fig, target, limb="legs", stretch=True) == pytest.approx(0.0, abs=1e-12)
+        assert _dist(fig.legs.left.end, target) < 1e-12
+
+    def test_effector_follows_limb_end(self):
+        fig = Sscha()
+        offset = [c - e for c, e in zip(fig.hands.left.center, fig.arms.left.end)]
+        reach(fig, Point5D(-1, 1, 0.3, 0, 0))
+        assert offset == [0.0] * 5
+        assert _dist(fig.hands.left.center, fig.arms.left.end) < 1e-12
+        reach(fig, Point5D(0.5, -2, 0.2, 0, 0), limb="legs", side="right", stretch=True)
+        assert _dist(fig.feet.right.center, fig.legs.right.end) < 1e-12
+
+    def test_other_parts_untouched(self):
+        fig = Sscha()
+        before = {name: part.vertices_5d() for name, part in fig.leaf_parts()}
+        reach(fig, Point5D(-1, 1, 0.3, 0, 0))
+        changed = {name for name, part in fig.leaf_parts() if part.vertices_5d() != before[name]}
+        assert changed == {"arms.left", "hands.left"}
+
+    def test_target_on_origin_keeps_direction(self):
+        fig = Sscha()
+        arm = fig.arms.left
+        end = arm.end
+        assert reach(fig, arm.origin) == pytest.approx(arm.length())
+        assert arm.end == end
+
+    def test_unknown_chain(self):
+        with pytest.raises(KeyError):
+            reach(Sscha(), Point5D(0, 0, 0, 0, 0), limb="tail")
+        with pytest.raises(KeyError):
+            reach(Sscha(), Point5D(0, 0, 0, 0, 0), side="middle")
+
+
+class TestSolveReach:
+    def test_matches_single_solves(self):
+        targets = [Point5D(-1.0 - 0.1 * i, 0.5 * i, 0.2, 0.0, 0.1 * i) for i in range(6)]
+        batch = [Sscha(origin=Point5D(i, 0, 0, 0, 0)) for i in range(6)]
+        single = [Sscha(origin=Point5D(i, 0, 0, 0, 0)) for i in range(6)]
+        res = solve_reach(batch, flatten_points(targets))
+        for fig, other, t, r in zip(batch, single, targets, res):
+            assert reach(other, t) == r
+            assert fig.vertices_5d() == other.vertices_5d()
+
+    def test_point_targets_and_residual_array(self):
+        figs = [Sscha(), Sscha()]
+        res = solve_reach(figs, [Point5D(-5, 0, 0, 0, 0), Point5D(-0.9, 0.3, 0, 0, 0)], stretch=True)
+        assert res.typecode == "d" and list(res) == pytest.approx([0.0, 0.0], abs=1e-12)
+
+    def test_target_count_checked(self):
+        with pytest.raises(ValueError):
+            solve_reach([Sscha()], [0.0] * 10)
+        with pytest.raises(ValueError):
+            solve_reach([Sscha()], [Point5D(0, 0, 0, 0, 0)] * 2)
+
+
+def test_aim_limb_explicit_length():
+    fig = Sscha()
+    arm = fig.arms.left
+    assert aim_limb(arm, (arm.origin.x, arm.origin.y + 2.0, arm.origin.z, 0, 0), length=0.5) == pytest.approx(1.5)
+    assert arm.length() == pytest.approx(0.5)
+
+
+def test_reach_on_clone_leaves_original():
+    base = Sscha()
+    before = base.vertices_5d()
+    variants = [base.clone() for _ in range(3)]
+    for i, fig in enumerate(variants):
+        reach(fig, Point5D(-1.0, 0.2 * i, 0.3, 0.0, 0.0))
+    assert base.vertices_5d() == before
+    assert variants[0].torso is base.torso
+    assert variants[0].arms.left is not variants[1].arms.left
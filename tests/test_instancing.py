@@ -0,0 +1,95 @@
+"""Tests for body.instancing."""
+
+import math
+
+import pytest
+
+from body.geometry import Point5D
+from body.sscha import Sscha
+from body.instancing import InstancedPopulation, canonical_mesh, clear_canonical_cache, RECORD_SIZE
+
+
+def _close(points_a, points_b):
+    return len(points_a) == len(points_b) and all(
+        math.isclose(a, b, abs_tol=1e-12) for p, q in zip(points_a, points_b) for a, b in zip(p, q)
+    )
+
+
+class TestCanonicalMesh:
+    def test_shared_per_resolution(self):
+        assert canonical_mesh() is canonical_mesh()
+        assert canonical_mesh(4, 4, 4) is not canonical_mesh()
+
+    def test_clear_cache(self):
+        old = canonical_mesh()
+        clear_canonical_cache()
+        assert canonical_mesh() is not old and canonical_mesh().vertices == old.vertices
+
+    def test_topology_covers_vertices(self):
+        mesh = canonical_mesh()
+        assert sum(count for _, _, count in mesh.topology) == len(mesh)
+        assert mesh.part_range("torso") == (0, 32)
+
+    def test_read_only(self):
+        with pytest.raises(TypeError):
+            canonical_mesh().vertices[0] = 1.0
+
+
+class TestInstancedPopulation:
+    def test_matches_sscha(self):
+        figs = [
+            Sscha(origin=Point5D(1.0, 2.0, -3.0, 0.0, 0.0), scale=1.7, plane_w=0.3, plane_v=-0.2),
+            Sscha(scale=0.5),
+        ]
+        pop = InstancedPopulation()
+        pop.extend(figs)
+        assert len(pop) == 2
+        assert len(pop.records) == 2 * RECORD_SIZE
+        for i, fig in enumerate(figs):
+            assert _close(pop.points(i), fig.vertices_5d())
+
+    def test_streaming_chunks(self):
+        pop = InstancedPopulation()
+        for i in range(5):
+            pop.add(Point5D(float(i), 0, 0, 0, 0))
+        chunks = list(pop.iter_vertices(chunk=2))
+        n5 = len(pop.mesh.vertices)
+        assert [len(c) // n5 for c in chunks] == [2, 2, 1]
+        assert list(chunks[1][:n5]) == list(pop.vertices(2))
+
+    def test_resolution_mismatch(self):
+        with pytest.raises(ValueError):
+            InstancedPopulation().add_figure(Sscha(arm_radial=4))
+
+    def test_posed_figure_rejected(self):
+        s = Sscha()
+        s.own_part("arms.left").end = Point5D(0, 3, 0, 0, 0)
+        with pytest.raises(ValueError):
+            InstancedPopulation().add_figure(s)
+
+    def test_figure_rebuild(self):
+        pop = InstancedPopulation(4, 4, 4)
+        pop.add(Point5D(1, 1, 1, 0, 0), 2.0, 0.1, 0.2)
+        fig = pop.figure(0)
+        assert fig.scale == 2.0 and fig.neck_radial == 4
+        assert _close(pop.points(0), fig.vertices_5d())
+
+    def test_index_error(self):
+        with pytest.raises(IndexError):
+            InstancedPopulation().vertices(0)
+
+    def test_sort_morton(self):
+        pop = InstancedPopulation()
+        origins = [Point5D((7 * i) % 10, (3 * i) % 4, 0, 0, 0) for i in range(40)]
+        for i, o in enumerate(origins):
+            pop.add(o, 1.0 + 0.01 * i)
+        before = [pop.record(i) for i in range(len(pop))]
+        perm = pop.sort_morton()
+        assert sorted(perm) == list(range(40))
+        assert [pop.record(i) for i in range(len(pop))] == [before[p] for p in perm]
+        assert [pop.insertion_index(i) for i in range(len(pop))] == list(perm)
+        # A second sort is a no-op; later additions keep their insertion index.
+        assert list(pop.sort_morton()) == list(range(40))
+        pop.add(Point5D(0, 0, 0, 0, 0))
+        assert pop.insertion_index(40) == 40
+        assert pop.record(pop.order.index(5)) == before[5]
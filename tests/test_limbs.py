@@ -1,9 +1,31 @@
 """Tests for body.limbs."""
 
+import math
+import random
+
 import pytest
 
 from body.geometry import Point5D, Vector5D, origin_5d
-from body.limbs import CylindricalLimb, Leg, Legs
+from body.limbs import (
+    CylindricalLimb,
+    Leg,
+    Legs,
+    frame_5d,
+    frames_5d,
+    sphere_directions,
+    radial_frame,
+    ring_offsets,
+)
+
+
+def _dot(a, b):
+    return sum(x * y for x, y in zip(a, b))
+
+
+def _assert_orthonormal(frame):
+    for i in range(5):
+        for j in range(5):
+            assert abs(_dot(frame[i], frame[j]) - (i == j)) < 1e-12
 
 
 class TestCylindricalLimb:
@@ -36,6 +58,102 @@ class TestCylindricalLimb:
         assert limb.num_radial >= 2
 
 
+class TestFrames:
+    @pytest.mark.parametrize(
+        "axis",
+        [(1, 0, 0, 0, 0), (0, 1, 0, 0, 0), (0, 0, 0, 1, 0), (0, 0, 0, 0, -2), (0, 0, 0, 3, 4)],
+    )
+    def test_axis_frames_orthonormal(self, axis):
+        frame = frame_5d(axis)
+        _assert_orthonormal(frame)
+        n = math.sqrt(_dot(axis, axis))
+        assert all(abs(t - a / n) < 1e-15 for t, a in zip(frame[0], axis))
+
+    def test_random_frames_orthonormal(self):
+        rng = random.Random(7)
+        for _ in range(200):
+            _assert_orthonormal(frame_5d([rng.uniform(-1, 1) for _ in range(5)]))
+
+    def test_matches_radial_frame_in_xyz(self):
+        u, v = radial_frame(0.3, -1.0, 0.2)
+        frame = frame_5d((0.3, -1.0, 0.2, 0.0, 0.0))
+        assert frame[1] == (*u, 0.0, 0.0) and frame[2] == (*v, 0.0, 0.0)
+
+    def test_zero_axis(self):
+        with pytest.raises(ValueError):
+            frame_5d((0, 0, 0, 0, 0))
+
+    def test_batch_matches_single(self):
+        axes = [0.3, 1, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0]
+        flat = frames_5d(axes)
+        assert len(flat) == 75
+        for k in range(2):
+            single = [c for vec in frame_5d(axes[5 * k : 5 * k + 5]) for c in vec]
+            assert list(flat[25 * k : 25 * k + 25]) == single
+        assert not any(flat[50:])
+
+    def test_ring_offsets(self):
+        starts = [[0.0, 0.0], [0.0, 0.0], [0.0, 0.0], [0.0, 0.0], [0.0, 0.0]]
+        ends = [[0.0, 0.0], [1.0, 0.0], [0.0, 0.0], [0.0, 2.0], [0.0, 0.0]]
+        rings = ring_offsets(starts, ends, [0.1, 0.3], 4)
+        assert len(rings) == 4
+        for offsets in rings:
+            # Both rings lie in x/y/z, perpendicular to the y and w axes.
+            assert [off is None for off in offsets] == [False, False, False, True, True]
+            assert math.hypot(*[off[0] for off in offsets[:3]]) == pytest.approx(0.1)
+            assert math.hypot(*[off[1] for off in offsets[:3]]) == pytest.approx(0.3)
+            assert offsets[1][0] == 0.0
+        zero = ring_offsets(starts, starts, [0.1, 0.1], 3)
+        assert all(not any(off) for offsets in zero for off in offsets if off is not None)
+
+    def test_sphere_directions_unit(self):
+        dirs = sphere_directions(32)
+        assert len(dirs) == 32 and len(set(dirs)) == 32
+        assert all(abs(_dot(d, d) - 1.0) < 1e-12 for d in dirs)
+
+
+class TestCrossSections:
+    def _offsets(self, limb):
+        a, b = limb.origin.as_tuple(), limb.end.as_tuple()
+        axis = [q - p for p, q in zip(a, b)]
+        verts = [p.as_tuple() for p in limb.vertices_5d()]
+        out = []
+        for p in verts:
+            d = [x - y for x, y in zip(p, a)]
+            if not any(d) or all(abs(x - y) < 1e-15 for x, y in zip(p, b)):
+                continue
+            d2 = [x - y for x, y in zip(p, b)]
+            out.append(d if abs(_dot(d, axis)) < 1e-12 else d2)
+        return axis, out
+
+    @pytest.mark.parametrize("cross_section", ["ring", "sphere"])
+    def test_w_axis_tube_is_round(self, cross_section):
+        limb = CylindricalLimb(
+            origin_5d(), Point5D(0, 0, 0, 2, 0), 0.25, 6, cross_section=cross_section
+        )
+        assert len(limb.vertices_5d()) == 2 + 2 * 6
+        axis, offsets = self._offsets(limb)
+        assert len(offsets) == 12
+        for d in offsets:
+            assert abs(math.sqrt(_dot(d, d)) - 0.25) < 1e-12
+            assert abs(_dot(d, axis)) < 1e-12
+
+    def test_sphere_spans_more_than_a_plane(self):
+        limb = CylindricalLimb(
+            origin_5d(), Point5D(0, 1, 0, 0, 0), 0.1, 8, cross_section="sphere"
+        )
+        _, offsets = self._offsets(limb)
+        assert any(abs(d[3]) > 1e-3 or abs(d[4]) > 1e-3 for d in offsets)
+
+    def test_ring_stays_in_axis_space(self):
+        limb = CylindricalLimb(Point5D(0, 0, 0, 0.5, 0.5), Point5D(0, 1, 0, 0.5, 0.5), 0.1, 8)
+        assert {(p.w, p.v) for p in limb.vertices_5d()} == {(0.5, 0.5)}
+
+    def test_invalid_cross_section(self):
+        with pytest.raises(ValueError):
+            CylindricalLimb(origin_5d(), Point5D(0, 1, 0, 0, 0), cross_section="square")
+
+
 class TestLeg:
     def test_leg_is_cylindrical_limb(self):
         a = Point5D(0, 0, 0, 0, 0)
@@ -0,0 +1,71 @@
+"""Tests for body.morph."""
+
+import pytest
+
+from body.geometry import Point5D, flatten_points
+from body.sscha import Sscha
+from body.morph import Morph
+
+
+def _close(a, b, tol=1e-9):
+    return len(a) == len(b) and all(abs(x - y) < tol for x, y in zip(a, b))
+
+
+@pytest.fixture
+def keys():
+    return [
+        Sscha(),
+        Sscha(origin=Point5D(1, 0, 0, 0, 0), scale=1.5, plane_w=0.4),
+        Sscha(origin=Point5D(1, 2, 0, 0, 0), scale=0.8, plane_v=-0.3),
+    ]
+
+
+class TestMorph:
+    def test_keyframes_reproduced(self, keys):
+        for easing in ("linear", "smooth", "spline"):
+            m = Morph(keys, easing=easing)
+            for t, fig in zip((0.0, 0.5, 1.0), keys):
+                assert _close(m.frame(t), flatten_points(fig.vertices_5d()))
+
+    def test_linear_matches_rebuilt_figure(self, keys):
+        # Vertices are affine in the figure parameters, so halfway = figure at halfway params.
+        m = Morph(keys[:2])
+        mid = Sscha(origin=Point5D(0.5, 0, 0, 0, 0), scale=1.25, plane_w=0.2)
+        assert _close(m.frame(0.5), flatten_points(mid.vertices_5d()))
+
+    def test_frames_shape_and_prealloc(self, keys):
+        m = Morph(keys, easing="spline")
+        ts = [i / 9 for i in range(10)]
+        out = m.frames(ts)
+        assert len(out) == 10 * m.vertex_count * 5
+        buf = out.__class__("d", bytes(8 * len(out)))
+        assert m.frames(ts, out=buf) is buf and buf == out
+        assert _close(out[3 * m.frame_size : 4 * m.frame_size], m.frame(ts[3]))
+
+    def test_iter_frames_reuses_buffer(self, keys):
+        m = Morph(keys, times=[0, 1, 3])
+        seen = [id(f) for f in m.iter_frames([0, 0.5, 2, 3])]
+        assert len(set(seen)) == 1
+
+    def test_smooth_eases(self, keys):
+        lin, smooth = Morph(keys[:2]), Morph(keys[:2], easing="smooth")
+        a, b = flatten_points(keys[0].vertices_5d()), flatten_points(keys[1].vertices_5d())
+        i = max(range(len(a)), key=lambda j: abs(b[j] - a[j]))
+        lin_step = abs(lin.frame(0.1)[i] - a[i])
+        assert abs(smooth.frame(0.1)[i] - a[i]) < lin_step
+
+    def test_clamped(self, keys):
+        m = Morph(keys)
+        assert m.frame(-1) == m.frame(0) and m.frame(2) == m.frame(1)
+
+    def test_invalid(self, keys):
+        with pytest.raises(ValueError):
+            Morph(keys[:1])
+        with pytest.raises(ValueError):
+            Morph([keys[0], Sscha(arm_radial=4)])
+        with pytest.raises(ValueError):
+            Morph(keys, easing="cubic")
+        with pytest.raises(ValueError):
+            Morph(keys, times=[0, 1, 1])
+        with pytest.raises(ValueError):
+            Morph(keys).frames([0, 1], out=Morph(keys).frame(0))
@@ -0,0 +1,71 @@
+"""Tests for body.morton."""
+
+import random
+from array import array
+
+import pytest
+
+from body.geometry import flatten_points
+from body.sscha import Sscha
+from body.morton import (
+    invert_permutation,
+    morton_key,
+    morton_keys,
+    morton_order,
+    morton_sort,
+    permute,
+)
+
+
+class TestKeys:
+    def test_interleaving(self):
+        assert morton_key((1, 0, 0, 0, 0)) == 1
+        assert morton_key((0, 0, 0, 0, 1)) == 16
+        assert morton_key((2, 0, 0, 0, 0)) == 32
+        assert morton_key((3, 3, 3, 3, 3)) == 1023
+
+    def test_quantized_over_bounds(self):
+        buf = [0.0] * 5 + [1.0] * 5
+        lo, hi = morton_keys(buf, bits=4)
+        assert lo == 0 and hi == morton_key((15,) * 5, bits=4)
+
+    def test_flat_axes_and_empty(self):
+        assert morton_keys([1.0, 2.0, 3.0, 4.0, 5.0]) == [0]
+        assert morton_keys([]) == []
+        with pytest.raises(ValueError):
+            morton_keys([0.0] * 6)
+
+
+class TestOrder:
+    def test_locality(self):
+        # Consecutive points in Morton order are much closer than in random order.
+        rng = random.Random(1)
+        pts = [rng.random() for _ in range(5 * 2000)]
+
+        def mean_step(buf):
+            n = len(buf) // 5
+            steps = [
+                sum((buf[5 * i + a] - buf[5 * i + 5 + a]) ** 2 for a in range(5)) ** 0.5
+                for i in range(n - 1)
+            ]
+            return sum(steps) / len(steps)
+
+        sorted_buf = array("d", pts)
+        morton_sort(sorted_buf)
+        assert mean_step(sorted_buf) < 0.5 * mean_step(pts)
+
+    def test_sort_in_place_and_map_back(self):
+        buf = flatten_points(Sscha().vertices_5d())
+        original = array("d", buf)
+        perm = morton_sort(buf)
+        assert permute(original, perm) == buf
+        assert permute(buf, invert_permutation(perm)) == original
+
+    def test_permute_keeps_typecode_and_checks_length(self):
+        out = permute(array("I", [10, 11, 12]), [2, 0, 1], stride=1)
+        assert out.typecode == "I" and list(out) == [12, 10, 11]
+        with pytest.raises(ValueError):
+            permute([0.0] * 10, [0])
+
+    def test_order_is_stable(self):
+        assert list(morton_order([0.5] * 15)) == [0, 1, 2]
@@ -0,0 +1,132 @@
+"""Tests for body.occupancy."""
+
+import random
+
+import pytest
+
+from body.geometry import Point5D, flatten_points
+from body.sscha import Sscha
+from body.instancing import InstancedPopulation
+from body.primitives import Box5D, Capsule5D, figure_primitives
+from body.ik import reach
+from body.occupancy import OccupancyGrid
+
+
+def _inside(fig, point):
+    prims = [p for _, p in figure_primitives(fig) if isinstance(p, (Box5D, Capsule5D))]
+    return any(p.contains(point) for p in prims)
+
+
+@pytest.fixture
+def grid():
+    return OccupancyGrid.from_figures(Sscha(), cell_size=0.1)
+
+
+class TestCells:
+    def test_pack_roundtrip(self, grid):
+        for cell in [(0, 0, 0, 0, 0), (-5, 7, -8192, 1023, -1024), (8191, -1, 3, -3, 0)]:
+            assert grid.unpack(grid.pack(cell)) == cell
+
+    def test_out_of_range(self, grid):
+        with pytest.raises(ValueError):
+            grid.pack((0, 0, 0, 1024, 0))
+
+    def test_cell_centers_match_exact_containment(self, grid):
+        fig = Sscha()
+        for key in list(grid.counts)[::50]:
+            assert _inside(fig, grid.cell_center(grid.unpack(key)))
+
+    def test_tube_cells_match_brute_force(self, grid):
+        prim = Capsule5D((0.0, 0.0, 0.0, 0.0, 0.0), (0.7, 0.3, 0.1, 0.15, 0.0), 0.17)
+        lo, hi = prim.bounds()
+        brute = set()
+        ranges = [grid._range(i, lo[i], hi[i]) for i in range(5)]
+        for x in ranges[0]:
+            for y in ranges[1]:
+                for z in ranges[2]:
+                    for w in ranges[3]:
+                        for v in ranges[4]:
+                            if prim.contains(grid.cell_center((x, y, z, w, v))):
+                                brute.add(grid.pack((x, y, z, w, v)))
+        assert grid.primitive_cells(prim) == brute
+
+    def test_bad_arguments(self):
+        with pytest.raises(ValueError):
+            OccupancyGrid(0.0)
+        with pytest.raises(ValueError):
+            OccupancyGrid((0.1, 0.1))
+
+
+class TestLookup:
+    def test_batched_matches_single(self, grid):
+        rng = random.Random(3)
+        pts = [
+            Point5D(*(rng.uniform(-1.5, 1.5) for _ in range(3)), rng.uniform(-0.2, 0.2), 0.05)
+            for _ in range(500)
+        ]
+        counts = grid.lookup(flatten_points(pts))
+        assert list(counts) == [grid.count(p) for p in pts]
+        assert list(grid.occupied(flatten_points(pts))) == [1 if p in grid else 0 for p in pts]
+        assert any(counts) and not all(counts)
+
+    def test_parts_are_occupied(self, grid):
+        fig = Sscha()
+        assert fig.torso.center in grid
+        assert Point5D(0, 0, 0, 5.0, 0) not in grid
+
+    def test_far_points_are_free(self, grid):
+        assert list(grid.lookup([1e9, 0, 0, 0, 0, 0, 0, 0, 0, 0])) == [0, 1]
+
+    def test_buffer_length_checked(self, grid):
+        with pytest.raises(ValueError):
+            grid.lookup([0.0] * 7)
+
+
+class TestOwners:
+    def test_overlapping_figures_refcount(self):
+        a, b = Sscha(), Sscha(origin=Point5D(0.3, 0, 0, 0, 0))
+        grid = OccupancyGrid.from_figures([a, b], 0.1)
+        assert max(grid.counts.values()) == 2
+        single = OccupancyGrid.from_figures(a, 0.1)
+        grid.remove(1)
+        assert grid.counts == single.counts
+
+    def test_update_matches_rebuild(self):
+        figs = [Sscha(), Sscha(origin=Point5D(2, 0, 0, 0, 0))]
+        # Cell centers on the w = v = 0 plane, so thin tubes cover whole rows.
+        origin = (0.05,) * 5
+        grid = OccupancyGrid.from_figures(figs, 0.1, origin)
+        reach(figs[0], Point5D(-0.5, 1.5, 0.0, 0.0, 0.0))
+        added, removed = grid.update(0, figs[0])
+        assert added and removed
+        assert grid.counts == OccupancyGrid.from_figures(figs, 0.1, origin).counts
+        assert grid.update(0, figs[0]) == (0, 0)
+
+    def test_duplicate_owner(self, grid):
+        with pytest.raises(KeyError):
+            grid.insert(0, Sscha())
+
+    def test_population_source(self):
+        pop = InstancedPopulation()
+        pop.add(Point5D(0, 0, 0, 0, 0), 1.0)
+        pop.add(Point5D(4, 0, 0, 0, 0), 0.5)
+        grid = OccupancyGrid.from_figures(pop, 0.1)
+        assert grid.counts == OccupancyGrid.from_figures([pop.figure(0), pop.figure(1)], 0.1).counts
+
+
+class TestSerialization:
+    def test_roundtrip(self):
+        grid = OccupancyGrid.from_figures(
+            [Sscha(), Sscha(scale=0.7)], (0.1, 0.1, 0.1, 0.05, 0.05), origin=(0.5, 0, 0, 0, 0)
+        )
+        data = grid.to_bytes()
+        back = OccupancyGrid.from_bytes(data)
+        assert back.counts == grid.counts
+        assert back.cell_size == grid.cell_size and back.origin == grid.origin
+        assert len(data) < 13 * len(grid) + 100
+
+    def test_rejects_garbage(self, grid):
+        with pytest.raises(ValueError):
+            OccupancyGrid.from_bytes(b"XXXX" + grid.to_bytes()[4:])
+        with pytest.raises(ValueError):
+            OccupancyGrid.from_bytes(grid.to_bytes()[:-4])
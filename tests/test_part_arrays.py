@@ -0,0 +1,85 @@
+"""Tests for body.part_arrays."""
+
+import math
+
+import pytest
+
+from body.geometry import Point5D
+from body.limbs import CylindricalLimb
+from body.sscha import Sscha
+from body.part_arrays import TubeArray, BoxArray
+
+
+class TestTubeArray:
+    def test_matches_pair_classes(self):
+        s = Sscha()
+        for pair in (s.legs, s.arms):
+            tubes = TubeArray.from_limbs(pair.segments())
+            assert tubes.vertices_5d() == pair.vertices_5d()
+
+    def test_many_limbs(self):
+        tubes = TubeArray(num_radial=4)
+        limbs = []
+        for k in range(12):
+            angle = 2 * math.pi * k / 12
+            end = Point5D(math.cos(angle), math.sin(angle), 0.3 * k, 0, 0)
+            tubes.append(Point5D(0, 0, 0, 0, 0), end, 0.05)
+            limbs.append(CylindricalLimb(Point5D(0, 0, 0, 0, 0), end, 0.05, 4))
+        assert len(tubes) == 12
+        assert tubes.vertices_5d() == [p for limb in limbs for p in limb.vertices_5d()]
+        assert [round(x, 12) for x in tubes.lengths()] == [round(l.length(), 12) for l in limbs]
+
+    def test_off_plane_axes(self):
+        ends = [Point5D(0, 0, 0, 1, 0), Point5D(0, 0, 0, 0, -1), Point5D(0.5, 0, 0, 0.5, 0.5)]
+        tubes = TubeArray(num_radial=5)
+        limbs = []
+        for end in ends:
+            tubes.append(Point5D(0, 0, 0, 0, 0), end, 0.1)
+            limbs.append(CylindricalLimb(Point5D(0, 0, 0, 0, 0), end, 0.1, 5))
+        expected = [p for limb in limbs for p in limb.vertices_5d()]
+        got = tubes.vertices_5d()
+        assert len(got) == len(expected)
+        for p, q in zip(got, expected):
+            assert max(abs(a - b) for a, b in zip(p.as_tuple(), q.as_tuple())) < 1e-12
+
+    def test_segments_and_primitives(self):
+        tubes = TubeArray.from_limbs(Sscha().legs.segments())
+        left, right = tubes.segments()
+        assert left.origin == Sscha().legs.left.origin
+        assert tubes.primitives()[1].radius == right.radius
+
+    def test_degenerate_tube_keeps_stride(self):
+        tubes = TubeArray(num_radial=3)
+        tubes.append(Point5D(1, 1, 1, 0, 0), Point5D(1, 1, 1, 0, 0), 0.1)
+        verts = tubes.vertices_5d()
+        assert len(verts) == tubes.vertices_per_tube
+        assert set(verts) == {Point5D(1, 1, 1, 0, 0)}
+
+    def test_set_endpoints(self):
+        tubes = TubeArray.from_limbs(Sscha().arms.segments())
+        tubes.set_endpoints(0, Point5D(0, 0, 0, 0, 0), Point5D(0, 2, 0, 0, 0))
+        assert tubes.lengths()[0] == 2.0
+
+    def test_mixed_resolution_rejected(self):
+        a = CylindricalLimb(Point5D(0, 0, 0, 0, 0), Point5D(0, 1, 0, 0, 0), num_radial=4)
+        b = CylindricalLimb(Point5D(0, 0, 0, 0, 0), Point5D(0, 1, 0, 0, 0), num_radial=6)
+        with pytest.raises(ValueError):
+            TubeArray.from_limbs([a, b])
+
+
+class TestBoxArray:
+    def test_matches_parts(self):
+        s = Sscha()
+        parts = [s.torso, s.hips, s.head, s.hands.left, s.hands.right, s.feet.left]
+        boxes = BoxArray.from_boxes(parts)
+        assert len(boxes) == 6
+        assert boxes.vertices_5d() == [p for part in parts for p in part.vertices_5d()]
+
+    def test_primitives(self):
+        boxes = BoxArray()
+        boxes.append(Point5D(0, 0, 0, 0, 0), (1, 2, 3, 4, 5))
+        (box,) = boxes.segments()
+        assert box.lower == (-1, -2, -3, -4, -5) and box.upper == (1, 2, 3, 4, 5)
+
+    def test_empty(self):
+        assert BoxArray().vertices_5d() == [] and TubeArray().vertices_5d() == []
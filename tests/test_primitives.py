@@ -0,0 +1,73 @@
+"""Tests for body.primitives."""
+
+import math
+
+import pytest
+
+from body.geometry import Vector5D
+from body.primitives import Box5D, Capsule5D, Patch5D, part_primitive, figure_primitives
+from body.torso import Torso
+from body.limbs import CylindricalLimb
+from body.sscha import Sscha
+
+
+class TestBox5D:
+    def test_from_center(self, origin):
+        box = Box5D.from_center(origin, (1.0, 2.0, 3.0, 0.5, 0.5))
+        assert box.lower == (-1.0, -2.0, -3.0, -0.5, -0.5)
+        assert box.upper == (1.0, 2.0, 3.0, 0.5, 0.5)
+
+    def test_line_span_through_center(self, origin):
+        box = Box5D.from_center(origin, (1.0, 1.0, 1.0, 1.0, 1.0))
+        assert box.line_span((-5, 0, 0, 0, 0), (1, 0, 0, 0, 0)) == (4.0, 6.0)
+
+    def test_line_span_miss_parallel(self, origin):
+        box = Box5D.from_center(origin, (1.0, 1.0, 1.0, 1.0, 1.0))
+        assert box.line_span((-5, 0, 0, 2, 0), (1, 0, 0, 0, 0)) is None
+
+    def test_normal_at_face(self, origin):
+        box = Box5D.from_center(origin, (1.0, 1.0, 1.0, 1.0, 1.0))
+        assert box.normal_at((0, 0, 0, -1, 0)) == Vector5D(0, 0, 0, -1, 0)
+
+
+class TestCapsule5D:
+    def test_line_span_body(self):
+        cap = Capsule5D((0, 0, 0, 0, 0), (0, 2, 0, 0, 0), 0.5)
+        t0, t1 = cap.line_span((-3, 1, 0, 0, 0), (1, 0, 0, 0, 0))
+        assert math.isclose(t0, 2.5) and math.isclose(t1, 3.5)
+
+    def test_line_span_cap(self):
+        cap = Capsule5D((0, 0, 0, 0, 0), (0, 2, 0, 0, 0), 0.5)
+        t0, t1 = cap.line_span((0, 5, 0, 0, 0), (0, -1, 0, 0, 0))
+        assert math.isclose(t0, 2.5) and math.isclose(t1, 5.5)
+
+    def test_line_span_in_w(self):
+        cap = Capsule5D((0, 0, 0, 0, 0), (0, 2, 0, 0, 0), 0.5)
+        t0, t1 = cap.line_span((0, 1, 0, -2, 0), (0, 0, 0, 1, 0))
+        assert math.isclose(t0, 1.5) and math.isclose(t1, 2.5)
+
+    def test_contains(self):
+        cap = Capsule5D((0, 0, 0, 0, 0), (0, 2, 0, 0, 0), 0.5)
+        assert cap.contains((0.4, 1, 0, 0, 0))
+        assert not cap.contains((0, 1, 0, 0, 0.6))
+        assert cap.contains((0, 2.4, 0, 0, 0))
+
+
+class TestPartPrimitive:
+    def test_torso_is_box(self, origin):
+        prim = part_primitive(Torso(origin, half_extent_x=0.5))
+        assert isinstance(prim, Box5D) and prim.upper[0] == 0.5
+
+    def test_limb_is_capsule(self, origin, point_b):
+        prim = part_primitive(CylindricalLimb(origin, point_b, radius=0.2))
+        assert isinstance(prim, Capsule5D) and prim.radius == 0.2
+
+    def test_unknown_part_raises(self):
+        with pytest.raises(TypeError):
+            part_primitive(object())
+
+    def test_figure_primitives_names(self):
+        prims = dict(figure_primitives(Sscha()))
+        assert len(prims) == 13
+        assert isinstance(prims["face"], Patch5D)
+        assert isinstance(prims["arms.left"], Capsule5D)
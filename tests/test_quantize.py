@@ -0,0 +1,134 @@
+"""Tests for body.quantize."""
+
+import random
+
+import pytest
+
+from body.geometry import Point5D, flatten_points
+from body.sscha import Sscha
+from body.chain import LimbChain
+from body.instancing import InstancedPopulation
+from body.morph import Morph
+from body.part_arrays import BoxArray, TubeArray
+from body.quantize import QuantizedBuffer, quantize, quantize_figure
+from body.uncertainty import FigureDistribution, Uniform, iter_vertex_chunks
+
+
+def _max_errors(src, q):
+    out = q.to_array()
+    return [max(abs(a - b) for a, b in zip(src[axis::5], out[axis::5])) for axis in range(5)]
+
+
+@pytest.fixture
+def buf():
+    return flatten_points(Sscha(origin=Point5D(3, -1, 2, 0.5, 0), plane_w=0.25).vertices_5d())
+
+
+class TestQuantize:
+    @pytest.mark.parametrize("precision", ["float64", "float32", "int16"])
+    def test_error_within_bound(self, buf, precision):
+        q = quantize(buf, precision)
+        bound = q.error_bound()
+        for err, b in zip(_max_errors(buf, q), bound):
+            assert err <= b * (1 + 1e-9) + 1e-15
+
+    def test_memory(self, buf):
+        assert quantize(buf, "float32").nbytes == 4 * len(buf)
+        assert quantize(buf, "int16").nbytes == 2 * len(buf) + 80 + 4
+
+    def test_per_part_tighter(self):
+        fig = Sscha(scale=3.0)
+        src = flatten_points(fig.vertices_5d())
+        whole, parts = quantize_figure(fig), quantize_figure(fig, per_part=True)
+        assert len(parts.starts) == len(list(fig.leaf_parts()))
+        assert sum(_max_errors(src, parts)) < sum(_max_errors(src, whole))
+        assert max(parts.error_bound()) <= max(whole.error_bound())
+
+    def test_lazy_access(self, buf):
+        q = quantize(buf, "int16", groups=[10, len(buf) // 5 - 10])
+        full = q.to_array()
+        assert [q[k] for k in (0, 7, 49, 50, 51, -1)] == [full[k] for k in (0, 7, 49, 50, 51, -1)]
+        assert q[45:60] == full[45:60]
+        assert q[1:12:3] == full[1:12:3]
+        assert q.vertex(11) == Point5D(*full[55:60])
+        assert q.dequantize(8, 13) == full[40:65]
+
+    def test_constant_axis_exact(self):
+        q = quantize([1.0, 2.0, 0.5, 0.0, 0.0, 3.0, 2.0, 0.5, 0.0, 0.0])
+        assert q.to_array()[1::5].tolist() == [2.0, 2.0]
+        assert q.error_bound()[1] == 0.0
+
+    def test_extend_accumulates_groups(self):
+        rng = random.Random(0)
+        q = QuantizedBuffer("int16")
+        chunks = [[rng.uniform(-k, k) for _ in range(25)] for k in (1, 100)]
+        for c in chunks:
+            q.extend(c)
+        assert list(q.starts) == [0, 5]
+        assert max(abs(a - b) for a, b in zip(chunks[0], q[:25])) <= 1 / 32767
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            QuantizedBuffer("float16")
+        with pytest.raises(ValueError):
+            quantize([0.0] * 4)
+        with pytest.raises(ValueError):
+            quantize([0.0] * 10, groups=[1])
+
+
+class TestPopulationPrecision:
+    def test_vertices_and_quantized(self):
+        pop = InstancedPopulation()
+        for i in range(5):
+            pop.add(Point5D(10.0 * i, 0, 0, 0, 0), 1.0 + 0.1 * i)
+        exact = [pop.vertices(i) for i in range(5)]
+        q = pop.quantized("int16", chunk=2)
+        assert len(q.starts) == 5
+        per_fig = len(pop.mesh)
+        for i in range(5):
+            got = q.dequantize(i * per_fig, (i + 1) * per_fig)
+            assert max(abs(a - b) for a, b in zip(exact[i], got)) <= max(q.error_bound()) * (1 + 1e-9)
+        f32 = pop.vertices(2, "float32")
+        assert f32.precision == "float32" and len(f32) == len(exact[2])
+        chunks = list(pop.iter_vertices(chunk=3, precision="int16"))
+        assert [len(c.starts) for c in chunks] == [3, 2]
+
+
+def _buffer_apis():
+    s = Sscha()
+    tubes = TubeArray.from_limbs(s.arms.segments() + s.legs.segments())
+    boxes = BoxArray.from_boxes([s.torso, s.hips, s.head])
+    chain = LimbChain([Point5D(0, 0, 0, 0, 0), Point5D(0, 1, 0, 0, 0), Point5D(1, 2, 0, 0, 0)], 0.1)
+    morph = Morph([Sscha(), Sscha(origin=Point5D(5, 0, 0, 0, 0), scale=1.5)])
+    model = FigureDistribution(scale=Uniform(0.8, 1.2))
+    per_sample = len(s.vertices_5d())
+    return [
+        (tubes.vertex_array, tubes.vertices_per_tube, 4),
+        (boxes.vertex_array, 32, 3),
+        (chain.vertex_array, chain.vertex_count, 1),
+        (lambda precision="float64": morph.frames([0.0, 0.5, 1.0], precision=precision), per_sample, 3),
+        (
+            lambda precision="float64": next(iter_vertex_chunks(model, 4, seed=0, precision=precision)),
+            per_sample,
+            4,
+        ),
+    ]
+
+
+class TestArrayPrecision:
+    @pytest.mark.parametrize("index", range(5))
+    def test_precision_argument(self, index):
+        produce, group_size, groups = _buffer_apis()[index]
+        exact = produce()
+        assert exact == produce("float64") and exact.typecode == "d"
+        for precision in ("float32", "int16"):
+            q = produce(precision)
+            assert isinstance(q, QuantizedBuffer) and q.precision == precision
+            assert len(q) == len(exact)
+            bound, got = q.error_bound(), q.to_array()
+            for a in range(5):
+                error = max(abs(x - y) for x, y in zip(exact[a::5], got[a::5]))
+                assert error <= bound[a] * (1 + 1e-9)
+        assert list(produce("int16").starts) == [group_size * g for g in range(groups)]
+        with pytest.raises(ValueError):
+            produce("float16")
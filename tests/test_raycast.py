@@ -0,0 +1,56 @@
+"""Tests for body.raycast."""
+
+import math
+
+import pytest
+
+from body.geometry import Point5D, Vector5D
+from body.raycast import RayCaster
+from body.sscha import Sscha
+
+
+class TestRayCaster:
+    def test_hits_torso_front(self):
+        caster = RayCaster([Sscha()])
+        hit = caster.cast_one((0, 0, 5, 0, 0), (0, 0, -1, 0, 0))
+        assert hit is not None
+        assert hit.figure == 0 and hit.part == "torso"
+        assert math.isclose(hit.distance, 4.7)
+        assert hit.normal == Vector5D(0, 0, 1, 0, 0)
+
+    def test_hits_limb_exactly(self):
+        caster = RayCaster([Sscha()])
+        # Left leg runs from x=-0.35 (y=-0.9) to x=-0.2 (y=-1.9); radius 0.1
+        hit = caster.cast_one((-0.275, -1.4, 5, 0, 0), (0, 0, -1, 0, 0))
+        assert hit.part == "legs.left"
+        assert math.isclose(hit.distance, 4.9)
+
+    def test_miss_returns_none(self):
+        caster = RayCaster([Sscha()])
+        assert caster.cast_one((0, 0, 5, 3, 0), (0, 0, -1, 0, 0)) is None
+
+    def test_nearest_figure_wins(self):
+        figs = [Sscha(origin=Point5D(0, 0, -3, 0, 0)), Sscha()]
+        hit = RayCaster(figs).cast_one((0, 0, 5, 0, 0), (0, 0, -2, 0, 0))
+        assert hit.figure == 1
+
+    def test_batch_matches_single(self):
+        figs = [Sscha(origin=Point5D(2.0 * i, 0, 0, 0, 0)) for i in range(10)]
+        caster = RayCaster(figs)
+        origins = [(2.0 * i, 0.0, 5.0, 0.0, 0.0) for i in range(10)] + [(0, 9, 5, 0, 0)]
+        dirs = [(0, 0, -1, 0, 0)] * 11
+        hits = caster.cast(origins, dirs)
+        assert [h.figure for h in hits[:10]] == list(range(10))
+        assert hits[10] is None
+
+    def test_max_distance(self):
+        caster = RayCaster([Sscha()])
+        assert caster.cast_one((0, 0, 5, 0, 0), (0, 0, -1, 0, 0), max_distance=1.0) is None
+
+    def test_zero_direction_raises(self):
+        with pytest.raises(ValueError):
+            RayCaster([Sscha()]).cast_one((0, 0, 5, 0, 0), (0, 0, 0, 0, 0))
+
+    def test_mismatched_batch_raises(self):
+        with pytest.raises(ValueError):
+            RayCaster([Sscha()]).cast([(0, 0, 0, 0, 0)], [])
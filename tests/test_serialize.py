@@ -0,0 +1,140 @@
+"""Tests for body.serialize."""
+
+import json
+
+import pytest
+
+from body.geometry import Point5D
+from body.ik import reach
+from body.limbs import CylindricalLimb
+from body.sscha import Sscha
+from body.serialize import (
+    SSCHA_RECORD,
+    pack_sscha,
+    unpack_sscha,
+    sscha_to_json,
+    sscha_from_json,
+    pack_part,
+    unpack_part,
+    part_to_dict,
+    part_from_dict,
+    pack_population,
+    unpack_population,
+    iter_population_params,
+)
+from body.morton import figure_positions, morton_order
+
+
+def _figure():
+    return Sscha(
+        origin=Point5D(1.0, -2.0, 0.5, 0.0, 0.0),
+        scale=1.5,
+        plane_w=0.25,
+        plane_v=-0.5,
+        neck_radial=5,
+        arm_radial=7,
+        leg_radial=9,
+    )
+
+
+class TestSschaCodec:
+    def test_binary_round_trip(self):
+        s = _figure()
+        data = pack_sscha(s)
+        assert len(data) == SSCHA_RECORD.size
+        assert unpack_sscha(data).vertices_5d() == s.vertices_5d()
+
+    def test_json_round_trip(self):
+        s = _figure()
+        text = sscha_to_json(s)
+        assert json.loads(text)["arm_radial"] == 7
+        assert sscha_from_json(text).vertices_5d() == s.vertices_5d()
+
+    def test_custom_proportions_json_only(self):
+        s = Sscha(proportions={"arm_reach": 0.9})
+        assert json.loads(sscha_to_json(s))["proportions"] == {"arm_reach": 0.9}
+        assert sscha_from_json(sscha_to_json(s)).vertices_5d() == s.vertices_5d()
+        with pytest.raises(ValueError):
+            pack_sscha(s)
+
+    def test_posed_figure_json_only(self):
+        s = _figure()
+        reach(s, (0, 3, 0, 0, 0))
+        s.own_part("torso").center = Point5D(0.5, 0, 0, 0, 0)
+        d = json.loads(sscha_to_json(s))
+        assert sorted(d["parts"]) == ["arms.left", "hands.left", "torso"]
+        restored = sscha_from_json(sscha_to_json(s))
+        assert restored.vertices_5d() == s.vertices_5d()
+        assert restored.edited_parts() == s.edited_parts()
+        with pytest.raises(ValueError):
+            pack_sscha(s)
+        with pytest.raises(ValueError):
+            pack_population([_figure(), s])
+
+    def test_posed_pair_stores_both_sides(self):
+        s = Sscha()
+        s.own_part("legs").left.end = Point5D(0.3, -3, 0, 0, 0)
+        d = json.loads(sscha_to_json(s))
+        assert sorted(d["parts"]) == ["legs.left", "legs.right"]
+        assert sscha_from_json(sscha_to_json(s)).vertices_5d() == s.vertices_5d()
+
+
+class TestPartCodec:
+    @pytest.mark.parametrize(
+        "name", ["torso", "hips", "neck", "head", "face", "legs", "arms", "hands", "feet"]
+    )
+    def test_binary_and_dict_round_trip(self, name):
+        part = getattr(_figure(), name)
+        for restored in (unpack_part(pack_part(part)), part_from_dict(part_to_dict(part))):
+            assert type(restored) is type(part)
+            assert restored.vertices_5d() == part.vertices_5d()
+
+    def test_sphere_tube_round_trip(self):
+        limb = CylindricalLimb(
+            Point5D(0, 0, 0, 0, 0), Point5D(0, 1, 0, 1, 0), num_radial=5, cross_section="sphere"
+        )
+        for restored in (
+            unpack_part(pack_part(limb)),
+            part_from_dict(json.loads(json.dumps(part_to_dict(limb)))),
+        ):
+            assert restored.cross_section == "sphere"
+            assert restored.vertices_5d() == limb.vertices_5d()
+        data = bytearray(pack_part(limb))
+        data[-1] = 0xFF
+        with pytest.raises(ValueError):
+            unpack_part(bytes(data))
+
+    def test_unknown_part(self):
+        with pytest.raises(TypeError):
+            pack_part(object())
+        with pytest.raises(ValueError):
+            unpack_part(b"\xff")
+
+
+class TestPopulationCodec:
+    def test_round_trip(self):
+        figs = [Sscha(origin=Point5D(i, 0, 0, 0, 0), scale=1 + 0.1 * i) for i in range(5)]
+        data = pack_population(figs)
+        out = unpack_population(data)
+        assert [f.scale for f in out] == [f.scale for f in figs]
+        assert out[3].vertices_5d() == figs[3].vertices_5d()
+        assert len(list(iter_population_params(data))) == 5
+
+    def test_morton_layout(self):
+        figs = [
+            Sscha(origin=Point5D((5 * i) % 8, i % 3, 0, 0, 0), scale=1 + 0.1 * i) for i in range(12)
+        ]
+        out = unpack_population(pack_population(figs, layout="morton"))
+        perm = morton_order(figure_positions(figs))
+        assert [f.scale for f in out] == [figs[p].scale for p in perm]
+        with pytest.raises(ValueError):
+            pack_population(figs, layout="hilbert")
+
+    def test_bad_magic(self):
+        with pytest.raises(ValueError):
+            unpack_population(b"NOPE" + bytes(16))
+
+    def test_truncated(self):
+        data = pack_population([Sscha(), Sscha()])
+        with pytest.raises(ValueError):
+            unpack_population(data[:-1])
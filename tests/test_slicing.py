@@ -0,0 +1,66 @@
+"""Tests for body.slicing."""
+
+import math
+
+from body.primitives import Capsule5D, Patch5D
+from body.sscha import Sscha
+from body.slicing import SliceEngine, _patch_corners, _tube_interval
+
+
+class TestSliceEngine:
+    def test_center_slice_has_every_part(self):
+        cs = SliceEngine(Sscha()).slice_at(0.0, 0.0)
+        assert len(cs.boxes) == 7 and len(cs.tubes) == 5 and len(cs.patches) == 1
+        assert len(cs.patches[0].corners) == 4
+
+    def test_slice_drops_narrow_parts(self):
+        cs = SliceEngine(Sscha()).slice_at(0.15, 0.0)
+        assert sorted(name for _, name in cs.parts()) == ["hips", "torso"]
+
+    def test_tube_radius_shrinks_with_w(self):
+        cs = SliceEngine(Sscha()).slice_at(0.06, 0.0)
+        neck = next(t for t in cs.tubes if t.part == "neck")
+        assert neck.is_capsule
+        assert math.isclose(neck.radius_at(0.5), math.sqrt(0.12 ** 2 - 0.06 ** 2))
+
+    def test_slice_at_matches_sweep(self):
+        figs = [Sscha(plane_w=0.1 * i) for i in range(4)]
+        engine = SliceEngine(figs)
+        ws = [0.3, -0.1, 0.05, 0.22, 0.0, 0.5]
+        vs = [0.0, 0.0, 0.1, 0.0, 0.19, 0.0]
+        swept = engine.sweep(ws, vs)
+        for w, v, cs in zip(ws, vs, swept):
+            assert cs.w == w and cs.parts() == engine.slice_at(w, v).parts()
+
+    def test_contains_agrees_with_5d(self):
+        s = Sscha()
+        cs = SliceEngine(s).slice_at(0.05, 0.0)
+        assert cs.contains(0.0, 0.0, 0.0)
+        assert cs.contains(0.0, 0.9, 0.0)  # neck
+        assert not cs.contains(0.0, 0.9, 0.2)
+
+
+class TestTubeInterval:
+    def test_tilted_tube_in_w(self):
+        cap = Capsule5D((0, 0, 0, 0, 0), (0, 1, 0, 1, 0), 0.25)
+        s0, s1 = _tube_interval(cap, 0.5, 0.0)
+        assert math.isclose(s0, 0.25) and math.isclose(s1, 0.75)
+
+    def test_miss(self):
+        cap = Capsule5D((0, 0, 0, 0, 0), (0, 1, 0, 0, 0), 0.25)
+        assert _tube_interval(cap, 0.0, 0.3) is None
+
+
+class TestPatchCorners:
+    def test_rank_one_gives_segment(self):
+        p = Patch5D((0, 0, 0, 0, 0), (0, 1, 0, 0, 0), (1, 0, 0, 1, 0), 1.0, 1.0)
+        corners = _patch_corners(p, 0.5, 0.0, 1e-9)
+        assert sorted(corners) == [(0.5, -1.0, 0.0), (0.5, 1.0, 0.0)]
+
+    def test_rank_two_gives_point(self):
+        p = Patch5D((0, 0, 0, 0, 0), (0, 1, 0, 1, 0), (1, 0, 0, 0, 1), 1.0, 1.0)
+        assert _patch_corners(p, 0.5, 0.25, 1e-9) == ((0.25, 0.5, 0.0),)
+
+    def test_off_plane_is_empty(self):
+        p = Patch5D((0, 0, 0, 0, 0), (0, 1, 0, 0, 0), (1, 0, 0, 0, 0), 1.0, 1.0)
+        assert _patch_corners(p, 0.1, 0.0, 1e-9) == ()
@@ -0,0 +1,102 @@
+"""Tests for body.snapshot."""
+
+import dataclasses
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from body.geometry import Point5D, flatten_points
+from body.ik import reach
+from body.sscha import Sscha
+from body.instancing import canonical_mesh, clear_canonical_cache
+from body.snapshot import SschaSnapshot, snapshot, generate, iter_generate
+
+
+def _params(n):
+    return [
+        dict(origin=Point5D(0.1 * i, 0, 0, 0, 0), scale=0.5 + 0.01 * i, plane_w=0.001 * i, arm_radial=4 + i % 4)
+        for i in range(n)
+    ]
+
+
+class TestSnapshot:
+    def test_matches_figure(self):
+        fig = Sscha(scale=1.3, plane_v=0.2)
+        snap = snapshot(fig)
+        assert snap.vertices_5d() == fig.vertices_5d()
+        assert snap.vertex_array() == flatten_points(fig.vertices_5d())
+        assert [p.name for p in snap.parts] == [n for n, _ in fig.leaf_parts()]
+        assert snap.part("hands.left").kind == "Hand"
+
+    def test_immutable_and_hashable(self):
+        snap = snapshot(Sscha())
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            snap.scale = 2.0
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            snap.parts[0].vertices = ()
+        assert hash(snap) == hash(snapshot(Sscha()))
+
+    def test_thaw_round_trip(self):
+        fig = Sscha(scale=2.0, proportions={"arm_reach": 0.9})
+        snap = snapshot(fig)
+        assert snap.proportions == (("arm_reach", 0.9),)
+        assert snap.thaw().vertices_5d() == fig.vertices_5d()
+        assert SschaSnapshot.of(snap.thaw()) == snap
+
+    def test_thaw_posed_figure(self):
+        fig = Sscha().clone()
+        reach(fig, (0, 3, 0, 0, 0))
+        snap = snapshot(fig)
+        assert [name for name, _ in snap.edits] == ["arms.left", "hands.left"]
+        thawed = snap.thaw()
+        assert thawed.vertices_5d() == fig.vertices_5d()
+        assert thawed.edited_parts() == fig.edited_parts()
+        assert SschaSnapshot.of(thawed) == snap
+
+    def test_thaw_sphere_tube(self):
+        fig = Sscha().clone()
+        fig.own_part("arms.left").cross_section = "sphere"
+        snap = snapshot(fig)
+        assert [name for name, _ in snap.edits] == ["arms.left"]
+        thawed = snap.thaw()
+        assert thawed.arms.left.cross_section == "sphere"
+        assert thawed.vertices_5d() == fig.vertices_5d() != Sscha().vertices_5d()
+        assert SschaSnapshot.of(thawed) == snap
+
+    def test_snapshot_detached_from_figure(self):
+        fig = Sscha()
+        snap = snapshot(fig)
+        fig.torso.center = Point5D(9, 9, 9, 9, 9)
+        assert snap.part("torso").vertices == tuple(Sscha().torso.vertices_5d())
+
+
+class TestGenerate:
+    def test_order_matches_serial(self):
+        params = _params(40)
+        serial = [SschaSnapshot.of(Sscha(**p)) for p in params]
+        assert generate(params, max_workers=8) == serial
+        positional = [(p["origin"], p["scale"]) for p in params[:3]]
+        assert list(iter_generate(positional)) == [SschaSnapshot.of(Sscha(*p)) for p in positional]
+
+    def test_stress_no_races(self):
+        # Many threads generating and sharing the mesh cache must agree with a serial run.
+        params = _params(64)
+        expected = generate(params, max_workers=1)
+        clear_canonical_cache()
+        barrier = threading.Barrier(8)
+        meshes = []
+
+        def worker(_):
+            barrier.wait()
+            meshes.append(canonical_mesh(8, 5, 6))
+            return generate(params, max_workers=4)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(worker, range(8)))
+        assert all(r == expected for r in results)
+        assert len({id(m) for m in meshes}) == 1
+
+    def test_shared_executor(self):
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            assert generate(_params(5), executor=pool) == generate(_params(5), max_workers=1)
@@ -1,9 +1,11 @@
 """Tests for body.sscha."""
 
+import copy
+
 import pytest
 
 from body.geometry import Point5D, Vector5D, origin_5d
-from body.sscha import Sscha, UP, FORWARD, RIGHT
+from body.sscha import Sscha, UP, FORWARD, RIGHT, PROPORTIONS, ANCHORS, LAYOUT, anchor_points
 from body import Sscha as SschaExport
 
 
@@ -71,6 +73,36 @@ class TestSscha:
         assert s2.torso.half_extents[0] == 2.0 * s1.torso.half_extents[0]
         assert s2.neck.length() == 2.0 * s1.neck.length()
 
+    def test_part_resolutions(self):
+        s = Sscha(neck_radial=4, arm_radial=3, leg_radial=5)
+        assert s.neck.num_radial == 4
+        assert s.arms.left.num_radial == 3 and s.arms.right.num_radial == 3
+        assert s.legs.left.num_radial == 5
+
+    def test_proportion_overrides(self):
+        s = Sscha(scale=2.0, proportions={"arm_reach": 1.0})
+        assert s.proportions["arm_reach"] == 1.0
+        assert s.proportions["leg_drop"] == PROPORTIONS["leg_drop"]
+        assert abs(s.hands.left.center.x - (-3.0)) < 1e-12
+
+    def test_unknown_proportion_raises(self):
+        with pytest.raises(KeyError):
+            Sscha(proportions={"tail_length": 1.0})
+
+    def test_layout_matches_parts(self):
+        s = Sscha(scale=1.4, plane_w=0.3)
+        assert [name for name, *_ in LAYOUT] == [name for name, _ in s.leaf_parts()]
+        a = anchor_points(s.torso.center, 1.4, PROPORTIONS)
+        assert set(a) == set(ANCHORS)
+        assert (s.arms.left.origin, s.arms.left.end) == (a["shoulder.left"], a["hand.left"])
+        assert s.face.center == a["face"] and s.feet.right.center == a["foot.right"]
+
+    def test_leaf_parts(self):
+        s = Sscha()
+        leaves = dict(s.leaf_parts())
+        assert len(leaves) == 13
+        assert leaves["arms.left"] is s.arms.left and leaves["feet.right"] is s.feet.right
+
 
 class TestSschaAxes:
     def test_up_vector(self):
@@ -87,3 +119,72 @@ class TestSschaExport:
     def test_sscha_importable_from_body(self):
         s = SschaExport()
         assert s.vertices_5d() is not None
+
+
+class TestClone:
+    def test_shares_every_part(self):
+        s = Sscha(scale=1.3)
+        c = s.clone()
+        assert c is not s and c.vertices_5d() == s.vertices_5d()
+        for (name, a), (_, b) in zip(s.leaf_parts(), c.leaf_parts()):
+            assert a is b, name
+
+    def test_copy_on_write_leaf(self):
+        s = Sscha()
+        c = s.clone()
+        arm = c.own_part("arms.left")
+        arm.end = Point5D(0, 5, 0, 0, 0)
+        assert s.arms.left.end != arm.end
+        assert c.arms is not s.arms and c.arms.right is s.arms.right
+        assert c.torso is s.torso
+        assert c.edited_parts() == {"arms.left"} and s.edited_parts() == frozenset()
+
+    def test_original_copies_too(self):
+        s = Sscha()
+        c = s.clone()
+        s.own_part("torso").center = Point5D(9, 9, 9, 0, 0)
+        assert c.torso.center == Point5D(0, 0, 0, 0, 0)
+
+    def test_owned_face_plane_not_shared(self):
+        s = Sscha()
+        before = s.face.vertices_5d()
+        face = s.clone().own_part("face")
+        assert face.plane_5d() is not s.face.plane_5d()
+        face.plane_5d().origin = Point5D(0, 7, 0, 0, 0)
+        assert s.face.vertices_5d() == before != face.vertices_5d()
+
+    def test_owned_part_not_copied_twice(self):
+        c = Sscha().clone()
+        assert c.own_part("hands.right") is c.own_part("hands.right")
+        fresh = Sscha()
+        assert fresh.own_part("face") is fresh.face
+
+    def test_own_pair_owns_both_sides(self):
+        s = Sscha()
+        c = s.clone()
+        legs = c.own_part("legs")
+        assert legs.left is not s.legs.left and legs.right is not s.legs.right
+
+    def test_clone_of_clone(self):
+        a = Sscha()
+        b = a.clone()
+        b.own_part("head").center = Point5D(0, 3, 0, 0, 0)
+        c = b.clone()
+        assert c.head is b.head and c.edited_parts() == {"head"}
+        c.own_part("head").center = Point5D(0, 4, 0, 0, 0)
+        assert b.head.center.y == 3 and a.head.center.y == 1.5
+
+    def test_set_part(self):
+        s = Sscha()
+        c = s.clone()
+        hand = copy.copy(s.hands.left)
+        hand.center = Point5D(0, 4, 0, 0, 0)
+        c.set_part("hands.left", hand)
+        assert c.hands.left is hand and s.hands.left.center != hand.center
+        assert c.edited_parts() == {"hands.left"}
+
+    def test_unknown_part(self):
+        with pytest.raises(KeyError):
+            Sscha().own_part("tail")
+        with pytest.raises(KeyError):
+            Sscha().own_part("torso.left")
@@ -0,0 +1,198 @@
+"""Tests for body.streamstats."""
+
+import math
+import random
+import statistics
+
+import pytest
+
+from body.geometry import Point5D
+from body.sscha import Sscha
+from body.instancing import InstancedPopulation
+from body.serialize import iter_population_params, pack_population
+from body.streamstats import (
+    Histogram,
+    PARAMETER_FIELDS,
+    PopulationStats,
+    RunningStats,
+    parameter_stats,
+    population_stats,
+)
+
+
+@pytest.fixture
+def rows():
+    rng = random.Random(3)
+    return [rng.gauss(1e6, 0.5) for _ in range(5 * 400)]
+
+
+def _population(n=10):
+    pop = InstancedPopulation()
+    for i in range(n):
+        pop.add(Point5D(i, -i, 0.5 * i, 0, 0), 1.05 + 0.1 * i, plane_w=0.1 * (i % 3))
+    return pop
+
+
+class TestRunningStats:
+    def test_matches_statistics(self, rows):
+        stats = RunningStats().update(rows)
+        assert len(stats) == 400
+        for axis in range(5):
+            col = rows[axis::5]
+            assert stats.mean[axis] == pytest.approx(statistics.fmean(col), rel=1e-15)
+            assert stats.variance(1)[axis] == pytest.approx(statistics.variance(col), rel=1e-9)
+            assert stats.bounds()[0][axis] == min(col)
+            assert stats.bounds()[1][axis] == max(col)
+
+    def test_chunks_and_merge_match_single_pass(self, rows):
+        whole = RunningStats().update(rows)
+        chunked = RunningStats()
+        for start in range(0, len(rows), 35):
+            chunked.update(rows[start : start + 35])
+        left, right = RunningStats().update(rows[:600]), RunningStats().update(rows[600:])
+        one_by_one = RunningStats()
+        for start in range(0, len(rows), 5):
+            one_by_one.update(rows[start : start + 5])
+        columns = RunningStats().update_columns([rows[axis::5] for axis in range(5)])
+        for other in (chunked, left.merge(right), one_by_one, columns):
+            assert other.count == whole.count
+            assert other.bounds() == whole.bounds()
+            for a, b in zip(other.mean, whole.mean):
+                assert a == pytest.approx(b, rel=1e-15)
+            for a, b in zip(other.variance(), whole.variance()):
+                assert a == pytest.approx(b, rel=1e-9)
+
+    def test_empty(self):
+        stats = RunningStats(3)
+        assert stats.merge(RunningStats(3)).count == 0
+        assert stats.variance() == (0.0, 0.0, 0.0)
+        assert RunningStats(3).merge(RunningStats(3).update([1, 2, 3])).mean.tolist() == [1, 2, 3]
+
+    def test_scalar_batches(self):
+        rng = random.Random(2)
+        values = [rng.random() for _ in range(50)]
+        s = RunningStats(1).update(values[:13]).update(values[13:])
+        mean = sum(values) / 50
+        assert math.isclose(s.mean[0], mean)
+        assert math.isclose(s.variance(1)[0], sum((x - mean) ** 2 for x in values) / 49)
+
+    def test_errors(self):
+        with pytest.raises(ValueError):
+            RunningStats().update([1.0, 2.0])
+        with pytest.raises(ValueError):
+            RunningStats(2).update_columns([[1.0, 2.0], [3.0]])
+        with pytest.raises(ValueError):
+            RunningStats(2).update_columns([[1.0]])
+        with pytest.raises(ValueError):
+            RunningStats().merge(RunningStats(3))
+        with pytest.raises(ValueError):
+            RunningStats(0)
+
+    def test_bytes_round_trip(self, rows):
+        stats = RunningStats().update(rows)
+        out = RunningStats.from_bytes(stats.to_bytes())
+        assert (out.count, out.mean, out.m2, out.lo, out.hi) == (
+            stats.count,
+            stats.mean,
+            stats.m2,
+            stats.lo,
+            stats.hi,
+        )
+        with pytest.raises(ValueError):
+            RunningStats.from_bytes(stats.to_bytes()[:-1])
+
+
+class TestHistogram:
+    def test_counts(self):
+        hist = Histogram(0.0, 1.0, bins=4, dims=2)
+        hist.update([0.0, -1.0, 0.3, 1.0, 0.99, 0.5, math.nan, 0.26])
+        assert hist.column(0).tolist() == [1, 1, 0, 1]
+        assert hist.column(1).tolist() == [0, 1, 1, 0]
+        assert hist.underflow.tolist() == [0, 1]
+        assert hist.overflow.tolist() == [0, 1]
+        assert hist.total() == 3
+        assert hist.edges() == [0.0, 0.25, 0.5, 0.75, 1.0]
+
+    def test_merge(self):
+        rng = random.Random(5)
+        values = [rng.uniform(-0.5, 2.5) for _ in range(500)]
+        whole = Histogram(0.0, 2.0, 10).update(values)
+        parts = Histogram(0.0, 2.0, 10).update(values[:250])
+        parts.merge(Histogram(0.0, 2.0, 10).update(values[250:]))
+        assert parts.counts == whole.counts
+        assert (parts.underflow, parts.overflow) == (whole.underflow, whole.overflow)
+        with pytest.raises(ValueError):
+            whole.merge(Histogram(0.0, 2.0, 11))
+
+    def test_bytes_round_trip(self):
+        hist = Histogram(-1.0, 1.0, 8).update([0.1 * i for i in range(-15, 20)])
+        out = Histogram.from_bytes(hist.to_bytes())
+        assert (out.lo, out.hi, out.bins, out.counts) == (-1.0, 1.0, 8, hist.counts)
+        assert (out.underflow, out.overflow) == (hist.underflow, hist.overflow)
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            Histogram(1.0, 1.0)
+        with pytest.raises(ValueError):
+            Histogram(0.0, 1.0, bins=0)
+
+
+class TestPopulationStats:
+    def test_matches_materialized(self):
+        pop = _population()
+        stats = population_stats(pop, chunk=3)
+        flat = [c for i in range(len(pop)) for c in pop.vertices(i)]
+        assert stats.figures == 10
+        assert stats.vertices.count == len(flat) // 5
+        assert stats.vertices.bounds() == RunningStats().update(flat).bounds()
+        for a, b in zip(stats.vertices.mean, RunningStats().update(flat).mean):
+            assert a == pytest.approx(b, rel=1e-12, abs=1e-12)
+        torso = stats.extents["torso"]
+        assert torso.total() == 10
+        # Torso width is 1.0 * scale; scales 1.05 .. 1.95 land in bins of 0.1.
+        assert torso.column(0).tolist()[10:20] == [1] * 10
+
+    def test_sscha_source_matches_population(self):
+        pop = _population(4)
+        from_pop = population_stats(pop)
+        from_figs = population_stats(pop.figure(i) for i in range(len(pop)))
+        assert from_figs.topology == from_pop.topology
+        for a, b in zip(from_figs.vertices.bounds(), from_pop.vertices.bounds()):
+            assert a == pytest.approx(b, abs=1e-12)
+        # Both build the same vertices up to rounding, which can move extents across edges.
+        for name, hist in from_pop.extents.items():
+            assert from_figs.extents[name].total() == hist.total() == 4
+
+    def test_parallel_merge(self):
+        pop = _population(9)
+        whole = population_stats(pop, chunk=4)
+        n5 = len(pop.mesh.vertices)
+        workers = []
+        for part in range(3):
+            stats = PopulationStats(pop.mesh.topology)
+            for i in range(part * 3, part * 3 + 3):
+                stats.update(pop.vertices(i))
+            workers.append(PopulationStats.from_bytes(stats.to_bytes()))
+        merged = workers[0].merge(workers[1]).merge(workers[2])
+        assert merged.figures == whole.figures == 9
+        assert merged.vertices.bounds() == whole.vertices.bounds()
+        for a, b in zip(merged.centroids.variance(), whole.centroids.variance()):
+            assert a == pytest.approx(b, rel=1e-12)
+        assert merged.extents["arms.left"].counts == whole.extents["arms.left"].counts
+        with pytest.raises(ValueError):
+            merged.update(pop.vertices(0)[: n5 - 5])
+
+    def test_topology_mismatch(self):
+        a = PopulationStats(InstancedPopulation().mesh.topology)
+        b = PopulationStats(InstancedPopulation(arm_radial=4).mesh.topology)
+        with pytest.raises(ValueError):
+            a.merge(b)
+
+
+def test_parameter_stats():
+    figs = [Sscha(origin=Point5D(i, 0, 0, 0, 0), scale=1 + 0.5 * i) for i in range(6)]
+    stats = parameter_stats(iter_population_params(pack_population(figs)))
+    assert stats.dims == len(PARAMETER_FIELDS)
+    assert stats.count == 6
+    assert stats.mean[0] == 2.5
+    assert stats.bounds()[1][PARAMETER_FIELDS.index("scale")] == 3.5
@@ -0,0 +1,126 @@
+"""Tests for body.uncertainty."""
+
+import math
+
+import pytest
+
+from body.geometry import Point5D
+from body.sscha import Sscha, PROPORTIONS
+from body.uncertainty import (
+    Fixed,
+    Normal,
+    Uniform,
+    FigureDistribution,
+    LIMBS,
+    propagate,
+    iter_vertex_chunks,
+)
+
+
+class TestFigureDistribution:
+    def test_columns_match_sscha(self):
+        model = FigureDistribution(
+            scale=1.3,
+            proportions={"arm_reach": 0.9, "leg_drop": 1.2},
+            origin=Point5D(1.0, 2.0, 3.0, 0.0, 0.0),
+            plane_w=0.5,
+        )
+        k, p = model.sample_params(model.streams(0), 3)
+        cols = model.vertex_columns(k, p)
+        ref = Sscha(
+            Point5D(1.0, 2.0, 3.0, 0.0, 0.0),
+            1.3,
+            plane_w=0.5,
+            proportions={"arm_reach": 0.9, "leg_drop": 1.2},
+        ).vertices_5d()
+        assert len(cols) == 5 * len(ref)
+        for i, q in enumerate(ref):
+            assert tuple(cols[5 * i + a][2] for a in range(5)) == q.as_tuple()
+
+    @pytest.mark.parametrize(
+        "proportions",
+        [
+            {
+                "arm_reach": Normal(0.7, 0.1),
+                "hips_drop": Uniform(0.8, 1.0),
+                "face_width": Normal(0.35, 0.02),
+            },
+            # Zero-length neck: Sscha keeps only its two endpoints.
+            {"neck_top": Fixed(0.6), "leg_radius": Uniform(0.05, 0.15)},
+        ],
+    )
+    def test_perturbed_columns_match_sscha(self, proportions):
+        model = FigureDistribution(
+            scale=Normal(1.0, 0.1), proportions=proportions, plane_v=-0.2, neck_radial=5
+        )
+        k, p = model.sample_params(model.streams(1), 4)
+        topology, cols = model.vertex_layout(k, p)
+        for i in range(4):
+            fig = model.figure(k[i], {name: col[i] for name, col in p.items()})
+            ref = fig.vertices_5d()
+            assert len(cols) == 5 * len(ref)
+            assert [tuple(cols[5 * j + a][i] for a in range(5)) for j in range(len(ref))] == [
+                q.as_tuple() for q in ref
+            ]
+            assert [(n, c) for n, _, c in topology] == [
+                (n, len(part.vertices_5d())) for n, part in fig.leaf_parts()
+            ]
+        neck = 2 if "neck_top" in proportions else 2 + 2 * 5
+        assert dict((n, c) for n, _, c in topology)["neck"] == neck
+
+    def test_mixed_zero_length_tube(self):
+        model = FigureDistribution(proportions={"neck_top": Uniform(0.6, 1.2)})
+        k = [1.0, 1.0]
+        p = {name: [PROPORTIONS[name]] * 2 for name in PROPORTIONS}
+        p["neck_top"] = [0.6, 1.2]
+        with pytest.raises(ValueError):
+            model.vertex_columns(k, p)
+
+    def test_unknown_proportion(self):
+        with pytest.raises(KeyError):
+            FigureDistribution(proportions={"wings": Fixed(1.0)})
+
+
+class TestPropagate:
+    def test_point_values_have_zero_variance(self):
+        result = propagate(FigureDistribution(scale=2.0), 10, seed=0, chunk=3)
+        ref = Sscha(scale=2.0).vertices_5d()
+        assert result.count == 10
+        for p, q in zip(result.mean_points(), ref):
+            assert all(math.isclose(a, b, abs_tol=1e-12) for a, b in zip(p, q))
+        assert max(result.vertex_variance) < 1e-20
+        assert math.isclose(result.limb_lengths.mean[LIMBS.index("neck")], 2.0 * 0.6)
+
+    def test_scale_uncertainty_propagates(self):
+        model = FigureDistribution(scale=Uniform(0.5, 1.5))
+        result = propagate(model, 600, seed=3, chunk=256, covariance=True)
+        neck = LIMBS.index("neck")
+        lengths = result.limb_lengths
+        assert lengths.count == 600
+        assert abs(lengths.mean[neck] - 0.6) < 0.03
+        assert 0.3 <= lengths.lo[neck] and lengths.hi[neck] <= 0.9
+        # Torso corner 0 is (-0.5k, -0.6k, ...): x and y are perfectly correlated.
+        cov = result.vertex_covariance
+        assert cov[1] > 0 and math.isclose(cov[1] ** 2, cov[0] * cov[6], rel_tol=1e-9)
+
+    def test_chunking_does_not_change_statistics(self):
+        model = FigureDistribution(
+            scale=Normal(1.0, 0.1), proportions={"arm_drop": Uniform(0.1, 0.3)}
+        )
+        a = propagate(model, 200, seed=5, chunk=7)
+        b = propagate(model, 200, seed=5, chunk=200)
+        pairs = zip(a.vertex_variance, b.vertex_variance)
+        assert all(math.isclose(x, y, rel_tol=1e-9, abs_tol=1e-12) for x, y in pairs)
+        assert a.lower == b.lower and a.upper == b.upper
+        assert a.extents.bounds() == b.extents.bounds()
+
+    def test_stream_chunks(self):
+        model = FigureDistribution(scale=Normal(1.0, 0.05))
+        chunks = list(iter_vertex_chunks(model, 10, seed=1, chunk=4))
+        width = 5 * len(Sscha().vertices_5d())
+        assert [len(c) // width for c in chunks] == [4, 4, 2]
+
+    def test_invalid_n(self):
+        with pytest.raises(ValueError):
+            propagate(FigureDistribution(), 0)
+
@@ -0,0 +1,75 @@
+"""Tests for body.voxelize."""
+
+import importlib
+
+import pytest
+
+from body.geometry import Point5D
+from body.primitives import Box5D, figure_primitives
+from body.sscha import Sscha
+from body.voxelize import voxelize
+
+
+class TestVoxelize:
+    def test_voxels_match_primitives(self):
+        s = Sscha()
+        grid = voxelize(s, 0.0, 0.0, 24)
+        prims = [p for name, p in figure_primitives(s) if name != "face"]
+        nx, ny, nz = grid.shape
+        for iz in range(0, nz, 3):
+            for iy in range(0, ny, 2):
+                for ix in range(nx):
+                    x, y, z = grid.voxel_center(ix, iy, iz)
+                    inside = any(p.contains((x, y, z, 0.0, 0.0)) for p in prims)
+                    assert bool(grid[ix, iy, iz]) == inside
+
+    def test_chunk_size_does_not_change_result(self):
+        s = Sscha()
+        a = voxelize(s, 0.0, 0.0, 20, chunk=1)
+        b = voxelize(s, 0.0, 0.0, 20, chunk=64)
+        assert bytes(a.data) == bytes(b.data)
+
+    def test_slice_outside_w_extent_is_empty(self):
+        grid = voxelize(Sscha(), 5.0, 0.0, 8, lower=(-2, -3, -1), upper=(2, 2, 1))
+        assert grid.count() == 0
+
+    def test_slice_keeps_only_wide_parts(self):
+        # w = 0.18 lies inside the torso (0.2) but outside the head (0.1) and hands (0.03).
+        grid = voxelize(Sscha(), 0.18, 0.0, 32, mode="part")
+        present = {grid.labels[k - 1] for k in set(grid.data.tolist()) if k}
+        assert "torso" in present
+        assert "head" not in present and "hands.left" not in present
+
+    def test_part_labels_widen_past_255(self, monkeypatch):
+        assert voxelize(Sscha(), 0.0, 0.0, 8, mode="part").data.format == "B"
+
+        # 300 one-voxel parts along x: labels no longer fit in a byte.
+        def many_parts(figures):
+            for i in range(300):
+                yield 0, f"part{i}", Box5D((i + 0.25, 0.25, 0.25, -1, -1), (i + 0.75, 0.75, 0.75, 1, 1))
+
+        module = importlib.import_module("body.voxelize")
+        monkeypatch.setattr(module, "iter_population_primitives", many_parts)
+        grid = voxelize(Sscha(), 0.0, 0.0, (300, 1, 1), (0, 0, 0), (300, 1, 1), mode="part")
+        assert grid.data.format == "H" and len(grid.labels) == 300
+        assert grid.data.tolist() == list(range(1, 301))
+
+    def test_figure_labels(self):
+        figs = [Sscha(), Sscha(origin=Point5D(3.0, 0, 0, 0, 0))]
+        grid = voxelize(figs, 0.0, 0.0, 32, mode="figure")
+        assert set(grid.data.tolist()) == {0, 1, 2}
+
+    def test_memory_mapped_output(self, tmp_path):
+        path = str(tmp_path / "grid.bin")
+        grid = voxelize(Sscha(), 0.0, 0.0, 16, out=path)
+        occupied = grid.count()
+        grid.flush()
+        grid.close()
+        with open(path, "rb") as f:
+            raw = f.read()
+        assert len(raw) == 16 ** 3
+        assert len(raw) - raw.count(0) == occupied > 0
+
+    def test_invalid_mode(self):
+        with pytest.raises(ValueError):
+            voxelize(Sscha(), 0.0, 0.0, 8, mode="rgb")
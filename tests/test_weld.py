@@ -0,0 +1,53 @@
+"""Tests for body.weld."""
+
+import random
+
+import pytest
+
+from body.geometry import Point5D, flatten_points
+from body.sscha import Sscha
+from body.weld import weld_array, weld_points
+
+
+class TestWeld:
+    def test_exact_duplicates(self):
+        a, b = Point5D(0, 0, 0, 0, 0), Point5D(1, 0, 0, 0, 0)
+        unique, remap = weld_points([a, b, a, b, a], tol=0)
+        assert unique == [a, b]
+        assert remap == [0, 1, 0, 1, 0]
+
+    def test_within_tolerance_across_cell_boundary(self):
+        # 0.99e-3 and 1.01e-3 straddle a grid cell boundary at tol = 0.5e-3.
+        pts = [Point5D(0.99e-3, 0, 0, 0, 0), Point5D(1.01e-3, 0, 0, 0, 0)]
+        unique, remap = weld_points(pts, tol=0.5e-3)
+        assert len(unique) == 1 and remap == [0, 0]
+
+    def test_outside_tolerance_kept(self):
+        pts = [Point5D(0, 0, 0, 0, 0), Point5D(0, 0, 0, 0, 2e-3)]
+        unique, _ = weld_points(pts, tol=1e-3)
+        assert len(unique) == 2
+
+    def test_matches_brute_force(self):
+        rng = random.Random(7)
+        pts = [Point5D(*(round(rng.uniform(0, 1), 1) for _ in range(5))) for _ in range(300)]
+        unique, remap = weld_points(pts, tol=1e-9)
+        assert len(unique) == len(set(pts))
+        assert all(unique[remap[i]] == p for i, p in enumerate(pts))
+
+    def test_population_buffer(self):
+        buf = flatten_points(Sscha().vertices_5d() * 3)
+        unique, remap = weld_array(buf)
+        assert len(unique) * 3 == len(buf)
+        assert len(remap) * 5 == len(buf)
+
+    def test_sscha_welded_vertices(self):
+        s = Sscha()
+        unique, remap = s.welded_vertices_5d(tol=1e-6)
+        verts = s.vertices_5d()
+        assert len(remap) == len(verts) and len(unique) <= len(verts)
+
+    def test_bad_input(self):
+        with pytest.raises(ValueError):
+            weld_array([0.0, 1.0])
+        with pytest.raises(ValueError):
+            weld_array([0.0] * 5, tol=-1.0)